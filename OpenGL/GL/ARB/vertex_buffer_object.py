@@ -104,6 +104,7 @@ glGetBufferPointervARB=wrapper.wrapper(glGetBufferPointervARB).setOutput(
 ### END AUTOGENERATED SECTION
 from OpenGL.lazywrapper import lazy as _lazy
 from OpenGL.arrays import ArrayDatatype
+from OpenGL.arrays.arraydatatype import describeArray as _describeArray
 from OpenGL._bytes import long,integer_types
 
 @_lazy( glBufferDataARB )
@@ -125,9 +126,9 @@ def glBufferDataARB( baseOperation, target, size, data=None, usage=None ):
         usage = data 
         data = size 
         size = None 
-    data = ArrayDatatype.asArray( data )
+    data = _describeArray( data )
     if size is None:
-        size = ArrayDatatype.arrayByteCount( data )
+        size = data.byteCount
     return baseOperation( target, size, data, usage )
 
 @_lazy( glBufferSubDataARB )
@@ -161,7 +162,7 @@ def glBufferSubDataARB( baseOperation, target, offset, size=None, data=None ):
             )
         data = size 
         size = None 
-    data = ArrayDatatype.asArray( data )
+    data = _describeArray( data )
     if size is None:
-        size = ArrayDatatype.arrayByteCount( data )
+        size = data.byteCount
     return baseOperation( target, offset, size, data )
@@ -717,4 +717,22 @@ glProgramUniformMatrix4x2dvEXT=wrapper.wrapper(glProgramUniformMatrix4x2dvEXT).s
 glProgramUniformMatrix4x3dvEXT=wrapper.wrapper(glProgramUniformMatrix4x3dvEXT).setInputArraySize(
     'value', None
 )
-### END AUTOGENERATED SECTION
\ No newline at end of file
+### END AUTOGENERATED SECTION
+from OpenGL import images as _images
+from OpenGL.lazywrapper import lazy as _lazy
+from OpenGL.raw.GL.VERSION.GL_1_1 import GL_CLIENT_PIXEL_STORE_BIT as _GL_CLIENT_PIXEL_STORE_BIT
+
+@_lazy( glClientAttribDefaultEXT )
+def glClientAttribDefaultEXT( baseFunction, mask ):
+    """Reset client attributes, forgetting images' record of the pixel-store state"""
+    result = baseFunction( mask )
+    if mask & _GL_CLIENT_PIXEL_STORE_BIT:
+        _images.invalidatePixelStore()
+    return result
+@_lazy( glPushClientAttribDefaultEXT )
+def glPushClientAttribDefaultEXT( baseFunction, mask ):
+    """Push and reset client attributes, forgetting images' record of the pixel-store state"""
+    result = baseFunction( mask )
+    if mask & _GL_CLIENT_PIXEL_STORE_BIT:
+        _images.invalidatePixelStore()
+    return result
@@ -62,6 +62,7 @@ glGetBufferPointerv=wrapper.wrapper(glGetBufferPointerv).setOutput(
 ### END AUTOGENERATED SECTION
 from OpenGL.lazywrapper import lazy as _lazy
 from OpenGL.arrays import ArrayDatatype
+from OpenGL.arrays.arraydatatype import describeArray as _describeArray
 from OpenGL._bytes import integer_types
 
 @_lazy( glBufferData )
@@ -83,9 +84,9 @@ def glBufferData( baseOperation, target, size, data=None, usage=None ):
         usage = data
         data = size
         size = None
-    data = ArrayDatatype.asArray( data )
+    data = _describeArray( data )
     if size is None:
-        size = ArrayDatatype.arrayByteCount( data )
+        size = data.byteCount
     return baseOperation( target, size, data, usage )
 
 @_lazy( glBufferSubData )
@@ -119,9 +120,9 @@ def glBufferSubData( baseOperation, target, offset, size=None, data=None ):
             )
         data = size
         size = None
-    data = ArrayDatatype.asArray( data )
+    data = _describeArray( data )
     if size is None:
-        size = ArrayDatatype.arrayByteCount( data )
+        size = data.byteCount
     return baseOperation( target, offset, size, data )
 
 @_lazy( glGetBufferPointerv )
@@ -9,23 +9,29 @@ from OpenGL.GL.exceptional import *
 
 from OpenGL.GL.glget import *
 
-from OpenGL.GL.VERSION.GL_1_2 import *
-from OpenGL.GL.VERSION.GL_1_3 import *
-from OpenGL.GL.VERSION.GL_1_4 import *
-from OpenGL.GL.VERSION.GL_1_5 import *
-from OpenGL.GL.VERSION.GL_2_0 import *
-from OpenGL.GL.VERSION.GL_2_1 import *
-from OpenGL.GL.VERSION.GL_3_0 import *
-from OpenGL.GL.VERSION.GL_3_1 import *
-from OpenGL.GL.VERSION.GL_3_2 import *
-from OpenGL.GL.VERSION.GL_3_3 import *
-from OpenGL.GL.VERSION.GL_4_0 import *
-from OpenGL.GL.VERSION.GL_4_1 import *
-from OpenGL.GL.VERSION.GL_4_2 import *
-from OpenGL.GL.VERSION.GL_4_3 import *
-from OpenGL.GL.VERSION.GL_4_4 import *
-from OpenGL.GL.VERSION.GL_4_5 import *
-from OpenGL.GL.VERSION.GL_4_6 import *
+from OpenGL import _configflags as _configflags
+if _configflags.LAZY_GL_NAMESPACE:
+    from OpenGL.GL import _lazyload
+    _lazyload.install( globals() )
+    del _lazyload
+else:
+    from OpenGL.GL.VERSION.GL_1_2 import *
+    from OpenGL.GL.VERSION.GL_1_3 import *
+    from OpenGL.GL.VERSION.GL_1_4 import *
+    from OpenGL.GL.VERSION.GL_1_5 import *
+    from OpenGL.GL.VERSION.GL_2_0 import *
+    from OpenGL.GL.VERSION.GL_2_1 import *
+    from OpenGL.GL.VERSION.GL_3_0 import *
+    from OpenGL.GL.VERSION.GL_3_1 import *
+    from OpenGL.GL.VERSION.GL_3_2 import *
+    from OpenGL.GL.VERSION.GL_3_3 import *
+    from OpenGL.GL.VERSION.GL_4_0 import *
+    from OpenGL.GL.VERSION.GL_4_1 import *
+    from OpenGL.GL.VERSION.GL_4_2 import *
+    from OpenGL.GL.VERSION.GL_4_3 import *
+    from OpenGL.GL.VERSION.GL_4_4 import *
+    from OpenGL.GL.VERSION.GL_4_5 import *
+    from OpenGL.GL.VERSION.GL_4_6 import *
 
 from OpenGL.error import *
 GLerror = GLError
@@ -0,0 +1,117 @@
+"""Lazy loading of the later-version OpenGL.GL namespaces
+
+Used by OpenGL.GL when OpenGL.LAZY_GL_NAMESPACE is set: the legacy
+(GL 1.1) namespace is imported eagerly, the GL_1_2 ... GL_4_6 modules
+are only imported when one of their names is first looked up on the
+OpenGL.GL module.  The name -> module mapping comes from the generated
+OpenGL.GL._lazyindex module, which can be regenerated with:
+
+    python -m OpenGL.GL._lazyload
+
+Note that `from OpenGL.GL import *` will only bind the eagerly-loaded
+names in lazy mode, use attribute access (GL.glGenBuffers) or an
+explicit import for later-version entry points.
+"""
+import importlib
+
+EAGER_MODULES = (
+    'OpenGL.GL.VERSION.GL_1_1',
+    'OpenGL.GL.pointers',
+    'OpenGL.GL.images',
+    'OpenGL.GL.exceptional',
+    'OpenGL.GL.glget',
+)
+LAZY_MODULES = tuple([
+    'OpenGL.GL.VERSION.GL_%s'%(version,)
+    for version in (
+        '1_2','1_3','1_4','1_5',
+        '2_0','2_1',
+        '3_0','3_1','3_2','3_3',
+        '4_0','4_1','4_2','4_3','4_4','4_5','4_6',
+    )
+])
+
+def exportedNames( module ):
+    """Names which `from module import *` would bind"""
+    names = getattr( module, '__all__', None )
+    if names is None:
+        names = [ name for name in vars( module ) if not name.startswith( '_' ) ]
+    return names
+
+def buildIndex( ):
+    """Produce {moduleName: [names]} for names only provided lazily
+
+    Later modules override earlier ones (as for the star-imports in
+    OpenGL.GL), names provided by the eager modules are excluded.
+    """
+    eager = set()
+    for name in EAGER_MODULES:
+        eager.update( exportedNames( importlib.import_module( name )))
+    sources = {}
+    for name in LAZY_MODULES:
+        for exported in exportedNames( importlib.import_module( name )):
+            if exported not in eager:
+                sources[exported] = name
+    index = {}
+    for exported,name in sorted( sources.items()):
+        index.setdefault( name, []).append( exported )
+    return index
+
+def writeIndex( filename ):
+    """Write the result of buildIndex to filename as a Python module"""
+    import textwrap
+    index = buildIndex()
+    lines = [
+        '"""Generated by OpenGL.GL._lazyload, do not edit"""',
+        'INDEX = {',
+    ]
+    for name in LAZY_MODULES:
+        lines.append( '    %r: ('%( name, ))
+        for line in textwrap.wrap( ' '.join( index.get( name, ())), 64 ):
+            lines.append( '        %r'%( line + ' ', ))
+        lines.append( '    ),' )
+    lines.append( '}' )
+    with open( filename, 'w' ) as handle:
+        handle.write( '\n'.join( lines ) + '\n' )
+
+class LazyNamespace( object ):
+    """Resolves lazily-provided names for a module namespace"""
+    def __init__( self, namespace, index ):
+        self.namespace = namespace
+        self.sources = {}
+        for module,names in index.items():
+            for name in names.split():
+                self.sources[name] = module
+    def load( self, module ):
+        """Import module and bind all of its lazily-provided names"""
+        module = importlib.import_module( module )
+        for name,source in list( self.sources.items()):
+            if source == module.__name__:
+                self.namespace[name] = getattr( module, name )
+                del self.sources[name]
+        return module
+    def __getattr__( self, name ):
+        """Module-level __getattr__ hook (PEP 562)"""
+        try:
+            module = self.sources[name]
+        except KeyError:
+            raise AttributeError( """module %r has no attribute %r"""%(
+                self.namespace.get( '__name__' ), name,
+            ))
+        self.load( module )
+        return self.namespace[name]
+    def __dir__( self ):
+        """Module-level __dir__ hook (PEP 562)"""
+        return sorted( set( self.namespace ) | set( self.sources ))
+
+def install( namespace ):
+    """Install lazy-loading __getattr__/__dir__ hooks into namespace"""
+    from OpenGL.GL._lazyindex import INDEX
+    lazy = LazyNamespace( namespace, INDEX )
+    namespace['__getattr__'] = lazy.__getattr__
+    namespace['__dir__'] = lazy.__dir__
+    return lazy
+
+if __name__ == "__main__":
+    import os
+    writeIndex( os.path.join( os.path.dirname( __file__ ), '_lazyindex.py' ))
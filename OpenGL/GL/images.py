@@ -14,6 +14,7 @@
 """
 from OpenGL.raw.GL.VERSION import GL_1_1,GL_1_2, GL_3_0
 from OpenGL import images, arrays, wrapper
+from OpenGL.lazywrapper import lazy as _lazy
 from OpenGL.arrays import arraydatatype
 from OpenGL._bytes import bytes,integer_types
 from OpenGL.raw.GL import _types
@@ -131,7 +132,34 @@ images.RANK_PACKINGS.update( {
 } )
 
 
+@_lazy( GL_1_1.glPixelStorei )
+def glPixelStorei( baseFunction, pname, param ):
+    """Set pixel-store parameter, updating images' record of the state"""
+    result = baseFunction( pname, param )
+    images.recordPixelStore( pname, param )
+    return result
+@_lazy( GL_1_1.glPixelStoref )
+def glPixelStoref( baseFunction, pname, param ):
+    """Set pixel-store parameter, updating images' record of the state"""
+    result = baseFunction( pname, param )
+    images.recordPixelStore( pname, None )
+    return result
+@_lazy( GL_1_1.glPopClientAttrib )
+def glPopClientAttrib( baseFunction ):
+    """Restore client attributes, forgetting images' record of the pixel-store state
+
+    The popped state may include the pixel-store state
+    (GL_CLIENT_PIXEL_STORE_BIT), which the record knows nothing about.
+    """
+    result = baseFunction()
+    images.invalidatePixelStore()
+    return result
+
 __all__ = (
+    'glPixelStorei',
+    'glPixelStoref',
+    'glPopClientAttrib',
+
     'glReadPixels',
     'glReadPixelsb',
     'glReadPixelsd',
@@ -138,47 +138,47 @@ except NameError as err:
     pass
 
 glVertexPointer = wrapper.wrapper( _simple.glVertexPointer ).setPyConverter(
-    'pointer', arrayhelpers.AsArrayOfType( 'pointer', 'type' ),
+    'pointer', arrayhelpers.DescribeArrayOfType( 'pointer', 'type' ),
 ).setStoreValues(
     arrayhelpers.storePointerType( 'pointer', _simple.GL_VERTEX_ARRAY_POINTER )
 ).setReturnValues(
-    wrapper.returnPyArgument( 'pointer' )
+    arrayhelpers.returnDescribedArray( 'pointer' )
 )
 glTexCoordPointer = wrapper.wrapper( _simple.glTexCoordPointer ).setPyConverter(
-    'pointer', arrayhelpers.AsArrayOfType( 'pointer', 'type' ),
+    'pointer', arrayhelpers.DescribeArrayOfType( 'pointer', 'type' ),
 ).setStoreValues(
     arrayhelpers.storePointerType( 'pointer', _simple.GL_TEXTURE_COORD_ARRAY_POINTER )
 ).setReturnValues(
-    wrapper.returnPyArgument( 'pointer' )
+    arrayhelpers.returnDescribedArray( 'pointer' )
 )
 glNormalPointer = wrapper.wrapper( _simple.glNormalPointer ).setPyConverter(
-    'pointer', arrayhelpers.AsArrayOfType( 'pointer', 'type' ),
+    'pointer', arrayhelpers.DescribeArrayOfType( 'pointer', 'type' ),
 ).setStoreValues(
     arrayhelpers.storePointerType( 'pointer', _simple.GL_NORMAL_ARRAY_POINTER )
 ).setReturnValues(
-    wrapper.returnPyArgument( 'pointer' )
+    arrayhelpers.returnDescribedArray( 'pointer' )
 )
 glIndexPointer = wrapper.wrapper( _simple.glIndexPointer ).setPyConverter(
-    'pointer', arrayhelpers.AsArrayOfType( 'pointer', 'type' ),
+    'pointer', arrayhelpers.DescribeArrayOfType( 'pointer', 'type' ),
 ).setStoreValues(
     arrayhelpers.storePointerType( 'pointer', _simple.GL_INDEX_ARRAY_POINTER )
 ).setReturnValues(
-    wrapper.returnPyArgument( 'pointer' )
+    arrayhelpers.returnDescribedArray( 'pointer' )
 )
 glEdgeFlagPointer = wrapper.wrapper( _simple.glEdgeFlagPointer ).setPyConverter(
     # XXX type is wrong!
-    'pointer', arrayhelpers.AsArrayTyped( 'pointer', arraydatatype.GLushortArray ),
+    'pointer', arrayhelpers.DescribeArrayTyped( 'pointer', arraydatatype.GLushortArray ),
 ).setStoreValues(
     arrayhelpers.storePointerType( 'pointer', _simple.GL_EDGE_FLAG_ARRAY_POINTER )
 ).setReturnValues(
-    wrapper.returnPyArgument( 'pointer' )
+    arrayhelpers.returnDescribedArray( 'pointer' )
 )
 glColorPointer = wrapper.wrapper( _simple.glColorPointer ).setPyConverter(
-    'pointer', arrayhelpers.AsArrayOfType( 'pointer', 'type' ),
+    'pointer', arrayhelpers.DescribeArrayOfType( 'pointer', 'type' ),
 ).setStoreValues(
     arrayhelpers.storePointerType( 'pointer', _simple.GL_COLOR_ARRAY_POINTER )
 ).setReturnValues(
-    wrapper.returnPyArgument( 'pointer' )
+    arrayhelpers.returnDescribedArray( 'pointer' )
 )
 glInterleavedArrays = wrapper.wrapper( _simple.glInterleavedArrays ).setStoreValues(
     arrayhelpers.storePointerType( 'pointer', GL_INTERLEAVED_ARRAY_POINTER )
@@ -188,9 +188,9 @@ glInterleavedArrays = wrapper.wrapper( _simple.glInterleavedArrays ).setStoreVal
 
 
 glDrawElements = wrapper.wrapper( _simple.glDrawElements ).setPyConverter(
-    'indices', arrayhelpers.AsArrayOfType( 'indices', 'type' ),
+    'indices', arrayhelpers.DescribeArrayOfType( 'indices', 'type' ),
 ).setReturnValues(
-    wrapper.returnPyArgument( 'indices' )
+    arrayhelpers.returnDescribedArray( 'indices' )
 )
 
 def glDrawElementsTyped( type, suffix ):
@@ -0,0 +1,210 @@
+"""Asynchronous pixel readback through a ring of pixel-pack buffers
+
+glReadPixels normally blocks until the GPU has finished rendering the
+frame being read, then copies the pixels into a freshly allocated array.
+For frame capture that stalls the render thread every frame.
+
+PixelReadback instead reads each frame into one of N pixel-pack buffers
+(PBOs), which returns immediately, and maps the buffer that was filled
+N-1 frames earlier, by which time the transfer has normally completed
+(a fence-sync is checked before mapping).  Results are returned as numpy
+views of the mapped buffer (no copy, no allocation) or copied into a
+caller-supplied array.
+
+Usage:
+
+    reader = PixelReadback( width, height, GL_RGB, GL_UNSIGNED_BYTE )
+    while rendering:
+        render()
+        frame = reader.read( 0, 0 )
+        if frame is not None:
+            encoder.write( frame ) # pixels from reader.latency frames ago
+    for frame in reader.flush():
+        encoder.write( frame )
+    reader.delete()
+
+Mapped views are only valid until the next call to read(), flush() or
+release(), copy them (or pass out=) if they need to live longer.
+
+Requires GL 3.2 (pixel buffer objects, glMapBufferRange, fence-syncs).
+"""
+import ctypes
+from OpenGL import images, error
+from OpenGL.raw.GL.VERSION import GL_1_1
+from OpenGL.GL.VERSION import GL_1_5, GL_2_1, GL_3_0, GL_3_2
+from OpenGL._bytes import long
+
+__all__ = (
+    'PixelReadback',
+)
+
+class PixelReadback( object ):
+    """Pipelined glReadPixels into a ring of pixel-pack buffers
+
+    Attributes:
+
+        width, height, format, type -- parameters of the images read
+        shape, dtype, nbytes -- description of each returned image, the
+            same as glReadPixels would return for the parameters
+        latency -- number of read() calls between reading a frame and
+            it being returned
+        stalls -- number of times a buffer was not ready when mapped
+            (the CPU had to wait for the GPU)
+    """
+    WAIT_TIMEOUT = 1000000 # nanoseconds per glClientWaitSync call
+    def __init__( self, width, height, format, type, buffers=3 ):
+        """Initialise the reader (buffers are created on first read)
+
+        width, height -- dimensions of the area to be read
+        format, type -- pixel format and data-type as for glReadPixels
+        buffers -- number of pixel-pack buffers in the ring, more
+            buffers give the GPU longer to complete each transfer
+        """
+        if buffers < 2:
+            raise ValueError( 'PixelReadback needs at least two buffers' )
+        self.width, self.height = int( width ), int( height )
+        self.format, self.type = format, type
+        template = images.createTargetArray( format, (self.width,self.height), type )
+        self.shape, self.dtype, self.nbytes = template.shape, template.dtype, template.nbytes
+        self.latency = buffers - 1
+        self.buffers = []
+        self.count = buffers
+        self.fences = [None] * buffers
+        self.current = 0
+        self.pending = []
+        self.mapped = None
+        self.stalls = 0
+    def create_buffers( self ):
+        """Create the pixel-pack buffers"""
+        assert not self.buffers, """Already created the buffers"""
+        self.buffers = [
+            long( buffer ) for buffer in GL_1_5.glGenBuffers( self.count )
+        ]
+        for buffer in self.buffers:
+            GL_1_5.glBindBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER, buffer )
+            GL_1_5.glBufferData(
+                GL_2_1.GL_PIXEL_PACK_BUFFER, self.nbytes, None, GL_1_5.GL_STREAM_READ
+            )
+        GL_1_5.glBindBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER, 0 )
+        return self.buffers
+    def read( self, x=0, y=0, out=None ):
+        """Start reading the given area, return the oldest completed read
+
+        x, y -- lower-left corner of the area to read (the size is fixed
+            by the reader's width and height)
+        out -- optional array of self.nbytes bytes (e.g. a numpy array of
+            self.shape and self.dtype) into which to copy the result,
+            otherwise a view of the mapped buffer is returned
+
+        returns None until the ring has filled (the first self.latency
+        calls), afterwards the pixels read self.latency calls earlier
+        """
+        self.release()
+        if not self.buffers:
+            self.create_buffers()
+        index = self.current
+        images.setupDefaultTransferMode()
+        images.rankPacking( 3 )
+        GL_1_5.glBindBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER, self.buffers[index] )
+        try:
+            GL_1_1.glReadPixels(
+                int( x ), int( y ), self.width, self.height,
+                self.format, self.type, ctypes.c_void_p( 0 ),
+            )
+        finally:
+            GL_1_5.glBindBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER, 0 )
+        self.fences[index] = GL_3_2.glFenceSync( GL_3_2.GL_SYNC_GPU_COMMANDS_COMPLETE, 0 )
+        self.pending.append( index )
+        self.current = (index + 1) % self.count
+        if len( self.pending ) == self.count:
+            return self._retrieve( out )
+        return None
+    def _wait( self, index ):
+        """Wait for the transfer into buffer index to complete"""
+        fence = self.fences[index]
+        if fence is None:
+            return
+        flags = GL_3_2.GL_SYNC_FLUSH_COMMANDS_BIT
+        timeout = 0
+        while True:
+            result = GL_3_2.glClientWaitSync( fence, flags, timeout )
+            if result in (GL_3_2.GL_ALREADY_SIGNALED, GL_3_2.GL_CONDITION_SATISFIED):
+                break
+            if result == GL_3_2.GL_WAIT_FAILED:
+                raise error.GLError(
+                    err=0, description='glClientWaitSync failed on PixelReadback fence',
+                )
+            if not timeout:
+                self.stalls += 1
+            timeout = self.WAIT_TIMEOUT
+            flags = 0
+        GL_3_2.glDeleteSync( fence )
+        self.fences[index] = None
+    def _retrieve( self, out=None ):
+        """Map (or copy out) the oldest pending buffer"""
+        from numpy import frombuffer
+        destination = None
+        if out is not None:
+            destination = _pointer( out, self.nbytes )
+        index = self.pending.pop( 0 )
+        self._wait( index )
+        GL_1_5.glBindBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER, self.buffers[index] )
+        pointer = GL_3_0.glMapBufferRange(
+            GL_2_1.GL_PIXEL_PACK_BUFFER, 0, self.nbytes, GL_3_0.GL_MAP_READ_BIT
+        )
+        if not pointer:
+            GL_1_5.glBindBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER, 0 )
+            raise error.GLError(
+                err=0, description='Unable to map PixelReadback buffer',
+            )
+        view = frombuffer(
+            (ctypes.c_ubyte * self.nbytes).from_address( pointer ), self.dtype
+        ).reshape( self.shape )
+        if out is not None:
+            ctypes.memmove( destination, pointer, self.nbytes )
+            del view
+            GL_1_5.glUnmapBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER )
+            GL_1_5.glBindBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER, 0 )
+            return out
+        GL_1_5.glBindBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER, 0 )
+        self.mapped = index
+        return view
+    def release( self ):
+        """Unmap the buffer returned by the last read (if still mapped)"""
+        if self.mapped is not None:
+            GL_1_5.glBindBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER, self.buffers[self.mapped] )
+            GL_1_5.glUnmapBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER )
+            GL_1_5.glBindBuffer( GL_2_1.GL_PIXEL_PACK_BUFFER, 0 )
+            self.mapped = None
+    def flush( self, out=None ):
+        """Yield the results of all reads not yet returned, oldest first
+
+        Each result is released when the next one is produced, as
+        for read().
+        """
+        while self.pending:
+            self.release()
+            yield self._retrieve( out )
+        self.release()
+    def delete( self ):
+        """Delete the buffers and outstanding fences"""
+        self.release()
+        for index,fence in enumerate( self.fences ):
+            if fence is not None:
+                GL_3_2.glDeleteSync( fence )
+                self.fences[index] = None
+        self.pending = []
+        if self.buffers:
+            GL_1_5.glDeleteBuffers( len( self.buffers ), self.buffers )
+            self.buffers = []
+
+def _pointer( out, nbytes ):
+    """Get the data-pointer of a caller-supplied (writable, contiguous) array"""
+    try:
+        return ctypes.addressof( (ctypes.c_ubyte * nbytes).from_buffer( out ))
+    except (TypeError, ValueError) as err:
+        raise ValueError(
+            """Destination must be a writable, contiguous array of at least %s bytes: %s"""%(
+                nbytes, err,
+            )
+        )
@@ -7,14 +7,24 @@ shader rendering.
 
 There are also two utility methods compileProgram and compileShader
 which make it easy to create demos which are shader-using.
+
+ShaderCache stores linked program binaries on disk so that later runs
+(with the same driver) can skip compiling and linking, see
+compileProgram's cache argument.
+
+compilePrograms submits many programs at once and returns a
+ProgramFuture for each, so that (with KHR/ARB_parallel_shader_compile)
+the driver compiles them concurrently while the caller keeps rendering.
 """
-import logging
+import logging, os, struct, hashlib, json, tempfile
 log = logging.getLogger( __name__ )
 from OpenGL import GL
 from OpenGL.GL.ARB import (
     shader_objects, fragment_shader, vertex_shader, vertex_program,
     geometry_shader4, separate_shader_objects, get_program_binary,
 )
+from OpenGL.GL.ARB import parallel_shader_compile as _parallel_arb
+from OpenGL.GL.KHR import parallel_shader_compile as _parallel_khr
 from OpenGL.extensions import alternate
 from OpenGL._bytes import bytes,unicode,as_8_bit
 
@@ -27,6 +37,10 @@ __all__ = [
     'glGetShaderiv',
     'compileProgram',
     'compileShader',
+    'ShaderCache',
+    'shaderCache',
+    'compilePrograms',
+    'ProgramFuture',
     'GL_VALIDATE_STATUS',
     'GL_LINK_STATUS',
     'ShaderCompilationError', 
@@ -85,6 +99,11 @@ GL_COMPILE_STATUS = GL.GL_COMPILE_STATUS
 GL_LINK_STATUS = GL.GL_LINK_STATUS
 GL_FALSE = GL.GL_FALSE
 GL_TRUE = GL.GL_TRUE
+GL_COMPLETION_STATUS = _parallel_khr.GL_COMPLETION_STATUS_KHR
+glMaxShaderCompilerThreads = alternate(
+    _parallel_khr.glMaxShaderCompilerThreadsKHR,
+    _parallel_arb.glMaxShaderCompilerThreadsARB,
+)
 
 class ShaderProgram( int ):
     """Integer sub-class with context-manager operation"""
@@ -138,10 +157,12 @@ class ShaderProgram( int ):
         returns (format,binaryData) for the shader program
         """
         from OpenGL.raw.GL._types import GLint,GLenum 
-        from OpenGL.arrays import GLbyteArray
+        from OpenGL.arrays import GLubyteArray
         size = GLint()
         glGetProgramiv( self, get_program_binary.GL_PROGRAM_BINARY_LENGTH, size )
-        result = GLbyteArray.zeros( (size.value,))
+        # must match the wrapper's output type, anything else is copied
+        # and the copy (rather than result) is filled
+        result = GLubyteArray.zeros( (size.value,))
         size2 = GLint()
         format = GLenum()
         get_program_binary.glGetProgramBinary( self, size.value, size2, format, result )
@@ -174,6 +195,14 @@ def compileProgram(*shaders, **named):
         function is *not* really intended for advanced usage,
         if you're finding yourself specifying this flag you 
         likely should be using your own shader management code.
+    cache (keyword only) -- a ShaderCache (or True for the default
+        cache, see shaderCache), the shaders must then be passed as
+        (source, shaderType) pairs and the linked program is loaded
+        from the cache if a usable binary was stored by an earlier
+        run, otherwise compiled, linked and stored.
+
+    Shaders may also be given as (source, shaderType) pairs without
+    a cache, they are then compiled with compileShader.
 
     This convenience function is *not* standard OpenGL,
     but it does wind up being fairly useful for demos
@@ -198,6 +227,15 @@ def compileProgram(*shaders, **named):
         ShaderCompilationError, ShaderValidationError, ShaderLinkError,
     } when a link/validation failure occurs
     """
+    cache = named.pop( 'cache', None )
+    if cache:
+        if cache is True:
+            cache = shaderCache()
+        return cache.compileProgram( *shaders, **named )
+    shaders = [
+        compileShader( *shader ) if isinstance( shader, tuple ) else shader
+        for shader in shaders
+    ]
     program = glCreateProgram()
     if named.get('separable'):
         glProgramParameteri( program, separate_shader_objects.GL_PROGRAM_SEPARABLE, GL_TRUE )
@@ -242,6 +280,317 @@ def compileShader( source, shaderType ):
         )
     return shader
 
+class ShaderCache( object ):
+    """On-disk cache of linked program binaries (glGetProgramBinary)
+
+    Entries are keyed on a hash of the shader sources and types, the
+    program flags and the driver identity (vendor, renderer, version and
+    library, see OpenGL.probecache.driverKey), so a driver update never
+    loads a stale binary.  A binary the driver rejects anyway is
+    discarded and the program recompiled and stored again.
+
+    The cache directory defaults to $XDG_CACHE_HOME/pyopengl/programs
+    and can be set with the PYOPENGL_SHADER_CACHE_DIR environment
+    variable.
+
+    Attributes:
+
+        directory -- directory in which binaries are stored
+        hits -- programs loaded from stored binaries
+        misses -- programs compiled (no usable binary stored)
+        rejected -- stored binaries the driver refused to load
+    """
+    MAGIC = b'PYGLPRG1'
+    HEADER = struct.Struct( '<8sII' )
+    def __init__( self, directory=None ):
+        from OpenGL import probecache
+        self.directory = directory or probecache.cacheDirectory(
+            'programs', 'PYOPENGL_SHADER_CACHE_DIR',
+        )
+        self.hits = self.misses = self.rejected = 0
+    def key( self, shaders, separable=False ):
+        """Produce the cache key for (source, shaderType) pairs in the current context"""
+        from OpenGL import probecache
+        digest = hashlib.sha256()
+        digest.update( json.dumps( probecache.driverKey(), sort_keys=True ).encode( 'utf-8' ))
+        digest.update( b'separable' if separable else b'' )
+        for source,shaderType in shaders:
+            if isinstance( source, (bytes,unicode)):
+                source = [ source ]
+            digest.update( struct.pack( '<II', int( shaderType ), len( source )))
+            for fragment in source:
+                fragment = as_8_bit( fragment )
+                digest.update( struct.pack( '<Q', len( fragment )))
+                digest.update( fragment )
+        return digest.hexdigest()
+    def filename( self, key ):
+        """File in which the binary for key is stored"""
+        return os.path.join( self.directory, '%s.bin'%( key, ))
+    def get( self, key ):
+        """Retrieve (format, binary) stored for key or None"""
+        try:
+            with open( self.filename( key ), 'rb' ) as handle:
+                data = handle.read()
+        except (IOError, OSError):
+            return None
+        if len( data ) < self.HEADER.size:
+            return None
+        magic, format, length = self.HEADER.unpack_from( data )
+        binary = data[self.HEADER.size:]
+        if magic != self.MAGIC or length != len( binary ):
+            log.info( 'Discarding corrupt program binary %s', self.filename( key ))
+            return None
+        return format, binary
+    def set( self, key, format, binary ):
+        """Store (format, binary) for key (atomically), return success"""
+        binary = bytes( bytearray( binary ))
+        if not binary:
+            return False
+        try:
+            if not os.path.isdir( self.directory ):
+                os.makedirs( self.directory )
+            handle, temporary = tempfile.mkstemp( dir=self.directory, suffix='.tmp' )
+            with os.fdopen( handle, 'wb' ) as output:
+                output.write( self.HEADER.pack( self.MAGIC, format, len( binary )))
+                output.write( binary )
+            os.replace( temporary, self.filename( key ))
+        except (IOError, OSError) as err:
+            log.warning( 'Unable to write program binary %s: %s', self.filename( key ), err )
+            return False
+        return True
+    def discard( self, key ):
+        """Remove the binary stored for key"""
+        try:
+            os.remove( self.filename( key ))
+        except (IOError, OSError):
+            return False
+        return True
+    def load( self, key, separable=False ):
+        """Create a program from the binary stored for key
+
+        returns linked ShaderProgram or None if there is no stored binary
+        or the driver rejected it (the binary is then discarded)
+        """
+        stored = self.get( key )
+        if stored is None:
+            return None
+        format, binary = stored
+        program = ShaderProgram( glCreateProgram() )
+        if separable:
+            glProgramParameteri( program, separate_shader_objects.GL_PROGRAM_SEPARABLE, GL_TRUE )
+        try:
+            program.load( format, binary, validate=False )
+        except (ShaderLinkError, GL.GLError) as err:
+            log.info( 'Program binary %s rejected: %s', self.filename( key ), err )
+            GL.glDeleteProgram( program )
+            self.discard( key )
+            self.rejected += 1
+            return None
+        return program
+    def compileProgram( self, *shaders, **named ):
+        """Load or compile a program from (source, shaderType) pairs
+
+        Takes the same keyword arguments as compileProgram, see there.
+        """
+        separable = bool( named.get( 'separable' ))
+        key = self.key( shaders, separable )
+        program = self.load( key, separable )
+        if program is not None:
+            self.hits += 1
+            if named.get( 'validate', True ):
+                program.check_validate()
+            return program
+        self.misses += 1
+        named['retrievable'] = True
+        program = compileProgram( *[
+            compileShader( source, shaderType )
+            for (source,shaderType) in shaders
+        ], **named )
+        format, binary = program.retrieve()
+        self.set( key, format, binary )
+        return program
+    def stats( self ):
+        """Report hits, misses and rejected binaries"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'rejected': self.rejected,
+        }
+
+DEFAULT_CACHE = None
+def shaderCache( ):
+    """Retrieve the default (process-wide) ShaderCache"""
+    global DEFAULT_CACHE
+    if DEFAULT_CACHE is None:
+        DEFAULT_CACHE = ShaderCache()
+    return DEFAULT_CACHE
+
+def parallelCompileAvailable( ):
+    """Does the current context support non-blocking completion queries"""
+    return bool(
+        _parallel_khr.glInitParallelShaderCompileKHR() or
+        _parallel_arb.glInitParallelShaderCompileARB()
+    )
+
+class ProgramFuture( object ):
+    """Futures-like handle for a program submitted to compilePrograms
+
+    Status queries (which wait for the driver to finish compiling) are
+    deferred until result() is called.
+
+    Attributes:
+
+        program -- the ShaderProgram being linked
+        parallel -- whether done() can poll without blocking
+    """
+    def __init__(
+        self, program, shaders=(), validate=True, parallel=False,
+        cache=None, key=None,
+    ):
+        self.program = program
+        self.shaders = list( shaders ) # [(shader, source, shaderType)]
+        self.validate = validate
+        self.parallel = parallel
+        self.cache, self.key = cache, key
+        self.finished = False
+        self._result = self._error = None
+    def done( self ):
+        """Has compilation and linking finished (without blocking)
+
+        Always True if the driver lacks parallel_shader_compile, as the
+        status could then only be found by waiting for it.
+        """
+        if self.finished or not self.parallel or not self.shaders:
+            return True
+        from OpenGL.raw.GL._types import GLint
+        status = GLint()
+        glGetProgramiv( self.program, GL_COMPLETION_STATUS, status )
+        return bool( status.value )
+    def result( self ):
+        """Wait for the program, return the linked ShaderProgram
+
+        raises ShaderCompilationError, ShaderLinkError or
+        ShaderValidationError (the program and shaders are then deleted),
+        the same error is raised by later calls
+        """
+        if not self.finished:
+            self.finished = True
+            try:
+                self._result = self._finish()
+            except (ShaderCompilationError, ShaderLinkError, ShaderValidationError) as err:
+                self._error = err
+        if self._error is not None:
+            raise self._error
+        return self._result
+    def exception( self ):
+        """Wait for the program, return the error result() raises (or None)"""
+        try:
+            self.result()
+        except (ShaderCompilationError, ShaderLinkError, ShaderValidationError) as err:
+            return err
+        return None
+    def _finish( self ):
+        """Check compile, link and validation status of the program"""
+        program = self.program
+        try:
+            for shader,source,shaderType in self.shaders:
+                result = glGetShaderiv( shader, GL_COMPILE_STATUS )
+                if not(result):
+                    raise ShaderCompilationError(
+                        """Shader compile failure (%s): %s"""%(
+                            result,
+                            glGetShaderInfoLog( shader ),
+                        ),
+                        source,
+                        shaderType,
+                    )
+            program.check_linked()
+            if self.validate:
+                program.check_validate()
+        except Exception:
+            GL.glDeleteProgram( program )
+            for shader,source,shaderType in self.shaders:
+                glDeleteShader( shader )
+            raise
+        for shader,source,shaderType in self.shaders:
+            glDeleteShader( shader )
+        if self.cache is not None:
+            format, binary = program.retrieve()
+            self.cache.set( self.key, format, binary )
+        return program
+
+def compilePrograms( *programs, **named ):
+    """Submit many programs for compilation without waiting for any
+
+    programs -- each a sequence of (source, shaderType) pairs
+    threads (keyword only) -- number of driver compiler threads to
+        request with glMaxShaderCompilerThreads (0xFFFFFFFF for the
+        driver's maximum), default leaves the driver's setting
+    separable, validate, cache (keyword only) -- as for compileProgram,
+        programs loaded from the cache are returned already done
+
+    All shaders are compiled, then all programs linked, before any
+    status is queried, so drivers supporting parallel_shader_compile
+    overlap the work; poll ProgramFuture.done() to keep rendering
+    (e.g. a loading screen) meanwhile:
+
+        futures = compilePrograms(
+            [(vertex, GL_VERTEX_SHADER), (fragment, GL_FRAGMENT_SHADER)],
+            [(vertex2, GL_VERTEX_SHADER), (fragment2, GL_FRAGMENT_SHADER)],
+        )
+        while not all([ future.done() for future in futures ]):
+            draw_loading_screen()
+        programs = [ future.result() for future in futures ]
+
+    returns [ProgramFuture, ...] in the order of programs
+    """
+    parallel = parallelCompileAvailable()
+    threads = named.get( 'threads' )
+    if parallel and threads is not None:
+        glMaxShaderCompilerThreads( threads )
+    separable = bool( named.get( 'separable' ))
+    validate = named.get( 'validate', True )
+    cache = named.get( 'cache' )
+    if cache is True:
+        cache = shaderCache()
+    futures = []
+    pending = []
+    for shaders in programs:
+        key = None
+        if cache:
+            key = cache.key( shaders, separable )
+            program = cache.load( key, separable )
+            if program is not None:
+                cache.hits += 1
+                futures.append( ProgramFuture( program, validate=validate ))
+                continue
+            cache.misses += 1
+        compiled = []
+        for source,shaderType in shaders:
+            if isinstance( source, (bytes,unicode)):
+                source = [ source ]
+            source = [ as_8_bit(s) for s in source ]
+            shader = glCreateShader( shaderType )
+            glShaderSource( shader, source )
+            glCompileShader( shader )
+            compiled.append( (shader, source, shaderType) )
+        program = ShaderProgram( glCreateProgram() )
+        if separable:
+            glProgramParameteri( program, separate_shader_objects.GL_PROGRAM_SEPARABLE, GL_TRUE )
+        if cache:
+            glProgramParameteri( program, get_program_binary.GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE )
+        for shader,source,shaderType in compiled:
+            glAttachShader( program, shader )
+        future = ProgramFuture(
+            program, compiled, validate=validate, parallel=parallel,
+            cache=cache or None, key=key,
+        )
+        futures.append( future )
+        pending.append( future )
+    for future in pending:
+        glLinkProgram( future.program )
+    return futures
+
 class ShaderCompilationError(RuntimeError):
     """Raised when a shader compilation fails"""
 class ShaderValidationError(RuntimeError):
@@ -1,9 +1,11 @@
 from OpenGL.arrays import vbo
-from OpenGL.GL.VERSION import GL_1_5, GL_3_0, GL_3_1
 
 class Implementation( vbo.Implementation ):
     """OpenGL-based implementation of VBO interfaces"""
     def __init__( self ):
+        # imported here so registering the implementation does not pull
+        # in the later GL versions when OpenGL.GL is loaded lazily
+        from OpenGL.GL.VERSION import GL_1_5, GL_3_0, GL_3_1
         for name in self.EXPORTED_NAMES:
             found = False
             for source in (GL_1_5,GL_3_0, GL_3_1):
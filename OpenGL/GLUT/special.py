@@ -139,7 +139,7 @@ class GLUTCallback( object ):
         else:
             finalFunction = function
         if hasattr( finalFunction,'__call__' ):
-            cCallback = self.callbackType( finalFunction )
+            cCallback = self.callbackType( _contextSwitching( finalFunction ))
         else:
             cCallback = function
         # keep the function alive as long as the cCallback is...
@@ -147,6 +147,13 @@ class GLUTCallback( object ):
         contextdata.setValue( self.CONTEXT_DATA_KEY, cCallback )
         self.wrappedOperation( cCallback, *args )
         return cCallback
+def _contextSwitching( function ):
+    """Wrap a GLUT callback, GLUT may have switched the current window/context"""
+    def contextSwitchingCall( *args ):
+        contextdata.contextChanged()
+        return function( *args )
+    contextSwitchingCall.function = function
+    return contextSwitchingCall
 class GLUTTimerCallback( GLUTCallback ):
     """GLUT timer callbacks (completely nonstandard wrt other GLUT callbacks)"""
     def __call__( self, milliseconds, function, value ):
@@ -160,6 +167,7 @@ class GLUTTimerCallback( GLUTCallback ):
             callbacks = []
             contextdata.setValue( self.CONTEXT_DATA_KEY, callbacks )
         def deregister( value ):
+            contextdata.contextChanged()
             try:
                 function( value )
             finally:
@@ -35,6 +35,22 @@ import occurs the flags should no longer be changed.
 
         Default: True
 
+    DEFERRED_ERROR_CHECKING -- If True, the GL error checker does
+        not call glGetError after every call, instead it records the
+        call in a small ring buffer and only queries glGetError at
+        sync points: glEnd, glFinish, glFlush, every
+        _ErrorChecker.DEFERRED_SYNC_INTERVAL calls, on an optional
+        random sample of calls, or when the application calls
+        OpenGL.raw.GL._errors._error_checker.sync() (e.g. after
+        swapping buffers).  A raised GLError carries the window of
+        recent calls as recentCalls.  See _ErrorChecker.deferChecks
+        for run-time configuration.
+
+        Only triggers if ERROR_CHECKING is True, uses the pure-Python
+        error checker even if OpenGL_accelerate is available.
+
+        Default: False
+
     ERROR_LOGGING -- If True, then wrap array-handler
         functions with  error-logging operations so that all exceptions
         will be reported to log objects in OpenGL.logs, note that
@@ -145,6 +161,22 @@ import occurs the flags should no longer be changed.
 
         Default: True
 
+    PROBE_CACHE -- if True, the GL version, extension set and
+        extension entry-point resolution results for a driver are
+        cached on disk (see OpenGL.probecache) so that later processes
+        using the same driver skip re-probing.  The directory can be
+        set with PYOPENGL_PROBE_CACHE_DIR.
+
+        Default: False
+
+    LAZY_GL_NAMESPACE -- if True, OpenGL.GL only imports the legacy
+        (GL 1.1) namespace at import time, the GL_1_2 ... GL_4_6
+        modules are imported the first time one of their names is
+        looked up on the OpenGL.GL module.  Note that this means
+        `from OpenGL.GL import *` only binds the GL 1.1 names.
+
+        Default: False
+
     FORWARD_COMPATIBLE_ONLY -- only include OpenGL 3.1 compatible
         entry points.  Note that this will generally break most
         PyOpenGL code that hasn't been explicitly made "legacy free"
@@ -164,6 +196,39 @@ import occurs the flags should no longer be changed.
         operations.
 
         Default: True
+
+    SCALAR_FAST_PATH -- if True, immediate-mode entry points which
+        take only scalar arguments and return nothing (glVertex2f,
+        glColor3f, glNormal3f, glTexCoord2f and friends) are installed
+        as bare ctypes functions without a per-call error check.  Such
+        calls are normally made between glBegin/glEnd where glGetError
+        is not allowed anyway; any error they raise is reported by the
+        check on the enclosing glEnd (or the next checked call).
+
+        Default: True
+
+    PIXEL_STORE_CACHE -- if True, the image-handling code (see
+        OpenGL.images) keeps a per-context record of the pixel-store
+        (glPixelStorei) state it has set, and only issues the calls
+        whose values actually change.  Calls made through
+        OpenGL.GL.glPixelStorei/glPixelStoref/glPopClientAttrib update
+        the record, calls through OpenGL.raw.GL (or other libraries)
+        bypass it; after setting pixel-store state that way, call
+        OpenGL.images.syncPixelStore() or invalidatePixelStore().  A
+        stale record can leave e.g. GL_PACK_ALIGNMENT at a value which
+        makes glReadPixels write past the end of the array allocated
+        for it, so only enable this if all pixel-store changes go
+        through OpenGL.GL.
+
+        Default: False
+
+    COMPILE_WRAPPERS -- if True, and OpenGL_accelerate is not in use,
+        finalised Wrapper objects generate a specialised Python function
+        for their call path, with each converter step inlined as
+        straight-line code, rather than using the generic nested
+        wrapperCall closures.  Set to False to debug the closures.
+
+        Default: True
     
     MODULE_ANNOTATIONS -- if True, attempt to annotate alternates() and 
         constants to track in which module they are defined (only useful 
@@ -195,13 +260,19 @@ def environ_key(name, default):
 
 ERROR_CHECKING = environ_key("ERROR_CHECKING", True)
 ERROR_LOGGING = environ_key("ERROR_LOGGING", False)
+DEFERRED_ERROR_CHECKING = environ_key("DEFERRED_ERROR_CHECKING", False)
 ERROR_ON_COPY = environ_key("ERROR_ON_COPY", False)
 ARRAY_SIZE_CHECKING = environ_key("ARRAY_SIZE_CHECKING", True)
 STORE_POINTERS = environ_key("STORE_POINTERS", True)
 WARN_ON_FORMAT_UNAVAILABLE = False
 FORWARD_COMPATIBLE_ONLY = False
+LAZY_GL_NAMESPACE = environ_key("LAZY_GL_NAMESPACE", False)
+PROBE_CACHE = environ_key("PROBE_CACHE", False)
 SIZE_1_ARRAY_UNPACK = True
 USE_ACCELERATE = environ_key("USE_ACCELERATE", True)
+COMPILE_WRAPPERS = environ_key("COMPILE_WRAPPERS", True)
+SCALAR_FAST_PATH = environ_key("SCALAR_FAST_PATH", True)
+PIXEL_STORE_CACHE = environ_key("PIXEL_STORE_CACHE", False)
 CONTEXT_CHECKING = environ_key("CONTEXT_CHECKING", False)
 
 FULL_LOGGING = environ_key("FULL_LOGGING", False)
@@ -358,9 +429,17 @@ FormatHandler(
         "OpenGL.arrays._buffers.Py_buffer",
         _bi + ".memoryview",
         _bi + ".bytearray",
+        "array.array",
+        "mmap.mmap",
     ],
     isOutput=True,
 )
+FormatHandler(
+    "descriptor",
+    "OpenGL.arrays.arraydatatype.DescriptorHandler",
+    ["OpenGL.arrays.arraydatatype.ArrayDescriptor"],
+    isOutput=False,
+)
 FormatHandler(
     "vbo",
     "OpenGL.arrays.vbo.VBOHandler",
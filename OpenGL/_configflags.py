@@ -2,13 +2,19 @@
 from OpenGL import (
     ERROR_CHECKING,
     ERROR_LOGGING,
+    DEFERRED_ERROR_CHECKING,
     ERROR_ON_COPY,
     ARRAY_SIZE_CHECKING,
     STORE_POINTERS,
     WARN_ON_FORMAT_UNAVAILABLE,
     FORWARD_COMPATIBLE_ONLY,
+    LAZY_GL_NAMESPACE,
+    PROBE_CACHE,
     SIZE_1_ARRAY_UNPACK,
     USE_ACCELERATE,
+    COMPILE_WRAPPERS,
+    SCALAR_FAST_PATH,
+    PIXEL_STORE_CACHE,
     CONTEXT_CHECKING,
 
     FULL_LOGGING,
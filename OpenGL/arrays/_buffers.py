@@ -103,3 +103,52 @@ ReleaseBuffer = ctypes.pythonapi.PyBuffer_Release
 ReleaseBuffer.argtypes = [ BUFFER_POINTER ]
 ReleaseBuffer.restype = None
 
+
+# PEP 3118 integer codes by (signed, itemsize)
+_INTEGER_CODES = {
+    'b': True, 'h': True, 'i': True, 'l': True, 'q': True, 'n': True,
+    'B': False, 'H': False, 'I': False, 'L': False, 'Q': False, 'N': False,
+}
+_INTEGER_TYPES = {
+    (True, 1): GL_BYTE,
+    (True, 2): GL_SHORT,
+    (True, 4): GL_INT,
+    (False, 1): GL_UNSIGNED_BYTE,
+    (False, 2): GL_UNSIGNED_SHORT,
+    (False, 4): GL_UNSIGNED_INT,
+    (False, 8): GL_UNSIGNED_INT64,
+}
+_NATIVE_ORDER = '<' if sys.byteorder == 'little' else '>'
+
+def formatToGLType( format, itemsize ):
+    """Map a PEP 3118 struct format to the GL type constant for its elements
+
+    format -- buffer format string (str or bytes, None means unsigned bytes)
+    itemsize -- size in bytes of a single element
+
+    Integer codes are mapped by their actual size (so e.g. 'l' is GL_INT
+    only where a C long is 4 bytes), raises TypeError for formats with
+    no GL equivalent, including non-native byte order.
+    """
+    if format is None:
+        return GL_UNSIGNED_BYTE
+    if isinstance( format, bytes ):
+        format = format.decode( 'latin-1' )
+    code = format
+    if code[:1] in ('@','=',_NATIVE_ORDER):
+        code = code[1:]
+    if len( code ) == 1:
+        signed = _INTEGER_CODES.get( code )
+        if signed is not None:
+            result = _INTEGER_TYPES.get( (signed, itemsize) )
+            if result is not None:
+                return result
+        elif code in ('c','?','x') and itemsize == 1:
+            return GL_UNSIGNED_BYTE
+        elif code == 'e' and itemsize == 2:
+            return GL_HALF_FLOAT
+        elif code == 'f' and itemsize == 4:
+            return GL_FLOAT
+        elif code == 'd' and itemsize == 8:
+            return GL_DOUBLE
+    raise TypeError( 'No GL type for buffer format %r (itemsize %s)'%( format, itemsize ))
@@ -1,5 +1,6 @@
 """Array data-type implementations (abstraction points for GL array types"""
 import ctypes
+import array as _array, mmap as _mmap
 import OpenGL
 
 assert OpenGL
@@ -55,7 +56,6 @@ if ADT is None:
                             if hasattr(handler, "registerEquivalent"):
                                 handler.registerEquivalent(typ, base)
                             return handler
-                print(self.keys())
                 raise TypeError(
                     """No array-type handler for type %s.%s (value: %s) registered"""
                     % (typ.__module__, typ.__name__, repr(value)[:50])
@@ -132,6 +132,8 @@ if ADT is None:
 
         def from_param(cls, value, typeConstant=None):
             """Given a value in a known data-pointer type, convert to a ctypes pointer"""
+            if value.__class__ is ArrayDescriptor:
+                return value._as_parameter_
             return cls.getHandler(value).from_param(value, cls.typeConstant)
 
         from_param = classmethod(logs.logOnFail(from_param, _log))
@@ -168,6 +170,8 @@ if ADT is None:
 
         def asArray(cls, value, typeCode=None):
             """Given a value, convert to preferred array representation"""
+            if value.__class__ is ArrayDescriptor:
+                return value
             return cls.getHandler(value).asArray(value, typeCode or cls.typeConstant)
 
         asArray = classmethod(logs.logOnFail(asArray, _log))
@@ -218,6 +222,15 @@ if ADT is None:
 
         arrayByteCount = classmethod(logs.logOnFail(arrayByteCount, _log))
 
+        def describe(cls, value, typeCode=None):
+            """Resolve value to an ArrayDescriptor with a single handler lookup
+
+            See describeArray, converts to our typeConstant by default
+            """
+            return describeArray(value, typeCode or cls.typeConstant)
+
+        describe = classmethod(logs.logOnFail(describe, _log))
+
     # the final array data-type classes...
     class GLclampdArray(ArrayDatatype, ctypes.POINTER(_types.GLclampd)):
         """Array datatype for GLclampd types"""
@@ -370,3 +383,283 @@ GL_CONSTANT_TO_ARRAY_TYPE = {
     _types.GL_FIXED: GLfixedArray,
     # GL_1_1.GL_UNSIGNED_INT : GLenumArray,
 }
+
+
+_UNSET = object()
+
+
+class ArrayDescriptor(object):
+    """Handler-resolution results for a single array argument
+
+    Produced by describeArray, which looks the format handler up once and
+    resolves everything an array-taking entry point normally asks the
+    ArrayDatatype classmethods for one at a time:
+
+        array -- the value converted to its final (passable) form
+        handler -- the format handler for array
+        pointer -- integer data pointer (None for a NULL pointer)
+        byteCount -- number of bytes in the array
+        glType -- GL type constant for the elements (taken from the data
+            itself where it records one, e.g. a buffer format or ctypes
+            element type, otherwise the requested typeCode)
+        size -- number of elements (units of glType)
+        contiguous -- whether the data is a single dense block
+
+    Values not already known are resolved on first access (some handlers,
+    such as that for opaque ctypes pointers, cannot provide them all).
+
+    A descriptor can itself be passed as a (void or typed) array argument
+    without further handler lookups.
+    """
+
+    __slots__ = (
+        "array",
+        "typeCode",
+        "_parameter",
+        "_handler",
+        "_pointer",
+        "_byteCount",
+        "_glType",
+        "_size",
+        "_contiguous",
+    )
+
+    def __init__(
+        self,
+        array,
+        handler=None,
+        pointer=_UNSET,
+        byteCount=_UNSET,
+        typeCode=None,
+        parameter=None,
+        glType=_UNSET,
+    ):
+        """Initialise the descriptor
+
+        parameter -- if array (or a proxy for it) can be passed to ctypes
+            as a void pointer directly, the object to pass
+        glType -- GL type of the elements, if already known
+        """
+        self.array = array
+        self.typeCode = typeCode
+        self._parameter = parameter
+        self._handler = handler
+        self._pointer = pointer
+        self._byteCount = byteCount
+        self._glType = glType
+        self._size = self._contiguous = _UNSET
+
+    @property
+    def handler(self):
+        """Format handler for our array"""
+        if self._handler is None:
+            self._handler = ArrayDatatype.getRegistry()(self.array)
+        return self._handler
+
+    @property
+    def pointer(self):
+        """Integer data pointer for our array"""
+        if self._pointer is _UNSET:
+            self._pointer = self.handler.dataPointer(self.array)
+        return self._pointer
+
+    @property
+    def byteCount(self):
+        """Number of bytes in our array"""
+        if self._byteCount is _UNSET:
+            self._byteCount = self.handler.arrayByteCount(self.array)
+        return self._byteCount
+
+    @property
+    def glType(self):
+        """GL type constant for the elements of our array"""
+        if self._glType is _UNSET:
+            try:
+                self._glType = self.handler.arrayToGLType(self.array)
+            except TypeError:
+                # untyped data (bytes) or a format with no GL equivalent
+                if self.typeCode is None:
+                    raise
+                self._glType = self.typeCode
+        return self._glType
+
+    @property
+    def size(self):
+        """Number of elements (units of glType) in our array"""
+        if self._size is _UNSET:
+            self._size = self.handler.arraySize(self.array, self.typeCode)
+        return self._size
+
+    @property
+    def contiguous(self):
+        """Whether our array is a single dense block of memory"""
+        if self._contiguous is _UNSET:
+            flags = getattr(self.array, "flags", None)
+            if flags is not None and hasattr(flags, "c_contiguous"):
+                self._contiguous = bool(flags.c_contiguous)
+            else:
+                self._contiguous = bool(getattr(self.array, "c_contiguous", True))
+        return self._contiguous
+
+    @property
+    def _as_parameter_(self):
+        """Allow passing the descriptor to c_void_p arguments"""
+        if self._parameter is None:
+            self._parameter = ctypes.c_void_p(self.pointer)
+        return self._parameter
+
+    def __repr__(self):
+        return "%s( %s, typeCode=%r )" % (
+            self.__class__.__name__,
+            type(self.array).__name__,
+            self.typeCode,
+        )
+
+
+_NUMPY_TYPES = None
+
+
+def _numpyTypes():
+    """Lazily retrieve the numpy GL type -> dtype character mapping"""
+    global _NUMPY_TYPES
+    if _NUMPY_TYPES is None:
+        from OpenGL.arrays.numpymodule import GL_TYPE_TO_ARRAY_MAPPING
+
+        _NUMPY_TYPES = GL_TYPE_TO_ARRAY_MAPPING
+    return _NUMPY_TYPES
+
+
+def _describeNumpy(value, typeCode):
+    """Contiguous numpy arrays of the required type need no conversion"""
+    if not value.flags.c_contiguous:
+        return None
+    if typeCode is not None and _numpyTypes().get(typeCode) != value.dtype.char:
+        return None
+    try:
+        pointer = ctypes.addressof(ctypes.c_char.from_buffer(value))
+    except (TypeError, ValueError):
+        # read-only or empty arrays
+        pointer = value.__array_interface__["data"][0]
+    return ArrayDescriptor(
+        value,
+        pointer=pointer,
+        byteCount=value.nbytes,
+        typeCode=typeCode,
+        glType=_UNSET if typeCode is None else typeCode,
+    )
+
+
+def _describeBytes(value, typeCode):
+    """bytes carry no element type, glType is the requested typeCode"""
+    return ArrayDescriptor(
+        value, byteCount=len(value), typeCode=typeCode, parameter=value
+    )
+
+
+def _describeBuffer(value, typeCode):
+    """Contiguous buffer-protocol objects are referenced directly"""
+    if value.__class__ is memoryview and not value.c_contiguous:
+        return None
+    from OpenGL.arrays import _buffers
+
+    buffer = _buffers.Py_buffer.from_object(value)
+    try:
+        glType = _buffers.formatToGLType(buffer.format, buffer.itemsize)
+    except TypeError:
+        glType = typeCode
+    return ArrayDescriptor(
+        buffer,
+        pointer=buffer.buf,
+        byteCount=buffer.len,
+        typeCode=typeCode,
+        glType=glType,
+    )
+
+
+def _describeCtypesArray(value, typeCode):
+    """ctypes arrays report the GL type of their element type"""
+    return ArrayDescriptor(
+        value, byteCount=ctypes.sizeof(value), typeCode=typeCode, parameter=value
+    )
+
+
+# map from value type to fast-path describing function (or None)
+_FAST_PATHS = {}
+_BUFFER_TYPES = (memoryview, bytearray, _array.array, _mmap.mmap)
+
+
+def _fastPath(typ):
+    """Find the fast-path describing function for the given type (if any)"""
+    if typ is bytes:
+        return _describeBytes
+    if typ in _BUFFER_TYPES:
+        return _describeBuffer
+    if issubclass(typ, ctypes.Array):
+        return _describeCtypesArray
+    if typ.__module__ == "numpy" and typ.__name__ == "ndarray":
+        return _describeNumpy
+    return None
+
+
+def describeArray(value, typeCode=None):
+    """Resolve value to an ArrayDescriptor with a single handler lookup
+
+    value -- any value accepted as an array argument
+    typeCode -- GL type constant to which the value should be converted
+        (None to accept the value's own type)
+
+    numpy arrays, bytes, buffer-protocol objects (memoryview, bytearray,
+    array.array, mmap) and ctypes arrays which can be passed without
+    conversion are described directly, other values are looked up
+    in the handler registry once (and again only if conversion produces a
+    different type, e.g. a list converted to a ctypes array).
+    """
+    typ = value.__class__
+    try:
+        fast = _FAST_PATHS[typ]
+    except KeyError:
+        fast = _FAST_PATHS[typ] = _fastPath(typ)
+    if fast is not None:
+        descriptor = fast(value, typeCode)
+        if descriptor is not None:
+            return descriptor
+    registry = ArrayDatatype.getRegistry()
+    handler = registry(value)
+    array = handler.asArray(value, typeCode)
+    if array is not value and array.__class__ is not typ:
+        handler = registry(array)
+    return ArrayDescriptor(array, handler, handler.dataPointer(array), typeCode=typeCode)
+
+
+class DescriptorHandler(formathandler.FormatHandler):
+    """Format handler allowing ArrayDescriptors as array arguments"""
+
+    HANDLED_TYPES = (ArrayDescriptor,)
+    isOutput = False
+
+    def from_param(self, value, typeCode=None):
+        return value._as_parameter_
+
+    def dataPointer(self, value):
+        return value.pointer
+
+    def voidDataPointer(self, value):
+        return ctypes.c_void_p(value.pointer)
+
+    def asArray(self, value, typeCode=None):
+        return value
+
+    def arrayToGLType(self, value):
+        return value.glType
+
+    def arraySize(self, value, typeCode=None):
+        return value.size
+
+    def arrayByteCount(self, value, typeCode=None):
+        return value.byteCount
+
+    def unitSize(self, value, typeCode=None):
+        return value.handler.unitSize(value.array, typeCode)
+
+    def dimensions(self, value, typeCode=None):
+        return value.handler.dimensions(value.array)
@@ -104,15 +104,13 @@ else:
             
             Produces a raw function, not a PyConverter instance
             """
-            asArray = typ.asArray
+            describe = arraydatatype.describeArray
             dataType = typ.typeConstant
-            arraySize = typ.arraySize
             expectedBytes = ctypes.sizeof( typ.baseType ) * size
             def asArraySize( incoming, function, args ):
-                handler = typ.getHandler( incoming )
-                result = handler.asArray( incoming, dataType )
+                descriptor = describe( incoming, dataType )
                 # check that the number of bytes expected is present...
-                byteSize = handler.arrayByteCount( result )
+                byteSize = descriptor.byteCount
                 if byteSize != expectedBytes:
                     raise ValueError(
                         """Expected %r byte array, got %r byte array"""%(
@@ -121,7 +119,7 @@ else:
                         ),
                         incoming,
                     )
-                return result
+                return descriptor.array
             return asArraySize
 
 
@@ -135,6 +133,59 @@ else:
         """If there's no copying allowed, we can use default passing"""
         return None
 
+class DescribeArrayOfType( converters.PyConverter ):
+    """Given arrayName and typeName describe arrayName as array of type typeName
+
+    As AsArrayOfType, but produces an ArrayDescriptor, so that the
+    handler is looked up once for the conversion, the pointer and
+    the ctypes parameter (use returnDescribedArray and storePointerType
+    to hand back/store the array itself).
+    """
+    argNames = ( 'arrayName','typeName' )
+    indexLookups = ( 
+        ('arrayIndex', 'arrayName','pyArgIndex'),
+        ('typeIndex', 'typeName','pyArgIndex'),
+    )
+    def __init__( self, arrayName='pointer', typeName='type' ):
+        self.arrayName = arrayName
+        self.typeName = typeName 
+    def __call__( self, arg, wrappedOperation, args):
+        """Get the arg as a descriptor of an array of the appropriate type"""
+        type = args[ self.typeIndex ]
+        arrayType = arraydatatype.GL_CONSTANT_TO_ARRAY_TYPE[ type ]
+        return arrayType.describe( arg )
+class DescribeArrayTyped( converters.PyConverter ):
+    """Given arrayName and arrayType, describe arrayName as array of type
+
+    As AsArrayTyped, but produces an ArrayDescriptor
+    """
+    argNames = ( 'arrayName','arrayType' )
+    indexLookups = ( 
+        ('arrayIndex', 'arrayName','pyArgIndex'),
+    )
+    def __init__( self, arrayName='pointer', arrayType=None ):
+        self.arrayName = arrayName
+        self.arrayType = arrayType
+    def __call__( self, arg, wrappedOperation, args):
+        """Get the arg as a descriptor of an array of the appropriate type"""
+        return self.arrayType.describe( arg )
+class returnDescribedArray( converters.ReturnValues ):
+    """Return the (converted) array for the named pyArgs value
+
+    Unwraps the ArrayDescriptor produced by DescribeArrayOfType or
+    DescribeArrayTyped, so callers get the same array as with the
+    AsArray* converters.
+    """
+    argNames = ('name',)
+    indexLookups = [ ('index','name', 'pyArgIndex' ), ]
+    def __init__( self, name ):
+        self.name = name
+    def __call__( self, result, baseOperation, pyArgs, cArgs ):
+        value = pyArgs[self.index]
+        if value.__class__ is arraydatatype.ArrayDescriptor:
+            return value.array
+        return value
+
 class storePointerType( object ):
     """Store named pointer value in context indexed by constant
     
@@ -145,7 +196,7 @@ class storePointerType( object ):
     to ignore this storage operation.
     
     Stores the pyArgs (i.e. result of pyConverters) for the named
-    pointer argument...
+    pointer argument (the array itself for an ArrayDescriptor)...
     """
     def __init__( self, pointerName, constant ):
         self.pointerName = pointerName
@@ -153,7 +204,10 @@ class storePointerType( object ):
     def finalise( self, wrapper ):
         self.pointerIndex = wrapper.pyArgIndex( self.pointerName )
     def __call__( self, result, baseOperation, pyArgs, cArgs ):
-        contextdata.setValue( self.constant, pyArgs[self.pointerIndex] )
+        value = pyArgs[self.pointerIndex]
+        if value.__class__ is arraydatatype.ArrayDescriptor:
+            value = value.array
+        contextdata.setValue( self.constant, value )
 
 
 def setInputArraySizeType( baseOperation, size, type, argName=0 ):
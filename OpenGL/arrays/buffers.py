@@ -1,5 +1,11 @@
 #! /usr/bin/env python
-"""Test for a buffer-protocol-based access mechanism
+"""Buffer-protocol-based access mechanism
+
+Handles any object exporting the (PEP 3118) buffer protocol, e.g.
+memoryview, bytearray, array.array and mmap.mmap.  The data-pointer,
+shape and strides are read directly from the exported buffer, so
+C-contiguous buffers are passed to the GL without being copied, even
+read-only ones such as memory-mapped vertex or texture files.
 
 Will *only* work for Python 2.6+, and pretty much just works for strings
 under 2.6 (in terms of the common object types).
@@ -9,7 +15,7 @@ from OpenGL.arrays import _buffers
 from OpenGL.raw.GL import _types
 #from OpenGL.raw.GL.VERSION import GL_1_1
 from OpenGL.arrays import formathandler
-from OpenGL import _configflags
+from OpenGL import _configflags, error
 from OpenGL import acceleratesupport
 _log = logging.getLogger( __name__ )
 try:
@@ -69,30 +75,63 @@ if not BufferHandler:
         @classmethod
         def arrayToGLType( cls, value ):
             """Given a value, guess OpenGL type of the corresponding pointer"""
-            format = value.format 
-            if format in ARRAY_TO_GL_TYPE_MAPPING:
-                return ARRAY_TO_GL_TYPE_MAPPING[format]
-            raise TypeError( 'Unknown format: %r'%(format,))
+            value = cls.asArray( value )
+            return _buffers.formatToGLType( value.format, value.itemsize )
         @classmethod
         def arraySize( cls, value, typeCode = None ):
             """Given a data-value, calculate ravelled size for the array"""
+            value = cls.asArray( value )
             return value.len // value.itemsize
         @classmethod
         def arrayByteCount( cls, value, typeCode = None ):
             """Given a data-value, calculate number of bytes required to represent"""
-            return value.len
+            return cls.asArray( value ).len
         @classmethod 
         def unitSize( cls, value, default=None ):
-            return value.dims[-1]
+            return cls.asArray( value ).dims[-1]
         @classmethod
         def asArray( cls, value, typeCode=None ):
-            """Convert given value to an array value of given typeCode"""
-            buf = _buffers.Py_buffer.from_object( value )
-            return buf
+            """Convert given value to a Py_buffer referencing its memory
+
+            C-contiguous buffers are never copied, other buffers (e.g.
+            strided memoryview slices) are copied to a contiguous buffer,
+            or raise CopyError if ERROR_ON_COPY is set.
+            """
+            if isinstance( value, _buffers.Py_buffer ):
+                return value
+            try:
+                return _buffers.Py_buffer.from_object( value )
+            except (BufferError, ValueError):
+                view = memoryview( value )
+                if view.c_contiguous:
+                    raise
+            if cls.ERROR_ON_COPY:
+                raise error.CopyError(
+                    """Non-contiguous %s passed, would need to copy with ERROR_ON_COPY set"""%(
+                        value.__class__.__name__,
+                    )
+                )
+            return _buffers.Py_buffer.from_object( contiguousCopy( view ) )
         @classmethod
         def dimensions( cls, value, typeCode=None ):
             """Determine dimensions of the passed array value (if possible)"""
-            return value.dims
+            return cls.asArray( value ).dims
+        @classmethod
+        def strides( cls, value ):
+            """Determine byte-strides of the passed array value (if possible)"""
+            return cls.asArray( value ).dim_strides
+
+def contiguousCopy( view ):
+    """Copy a (non-contiguous) memoryview to a new C-contiguous buffer
+
+    Keeps the element format and shape where memoryview.cast supports
+    them, otherwise produces a flat bytearray.
+    """
+    data = bytearray( view.tobytes() )
+    try:
+        return memoryview( data ).cast( 'B' ).cast( view.format, view.shape )
+    except (TypeError, ValueError):
+        return data
 
 ARRAY_TO_GL_TYPE_MAPPING = _buffers.ARRAY_TO_GL_TYPE_MAPPING
 BYTE_SIZES = _buffers.BYTE_SIZES
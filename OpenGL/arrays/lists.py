@@ -16,7 +16,7 @@ from OpenGL._configflags import ERROR_ON_COPY
 from OpenGL.arrays import formathandler
 from OpenGL._bytes import bytes,unicode,as_8_bit
 HANDLED_TYPES = (list,tuple)
-import operator
+import operator, array, itertools
 
 def err_on_copy( func ):
     """Decorator which raises informative error if we try to copy while ERROR_ON_COPY"""
@@ -129,32 +129,85 @@ class ListHandler( formathandler.FormatHandler ):
             length = getattr( base, '_length_', None)
             if length is not None:
                 yield length
+    @classmethod
+    def shapeOf( cls, value ):
+        """Infer the shape of nested lists/tuples in a single pass
+
+        Walks the nesting one level at a time, rather than one element
+        at a time, so the work is done by C-level map/chain calls.
+
+        returns (shape, leaves) where leaves is the flattened list of
+        (scalar) elements, raises TypeError for non-uniform nesting
+        """
+        shape = []
+        level = [ value ]
+        while True:
+            types = set( map( type, level ))
+            nested = [ typ for typ in types if issubclass( typ, HANDLED_TYPES ) ]
+            if not nested:
+                return shape, level
+            if len( nested ) != len( types ):
+                raise TypeError(
+                    """Non-uniform array encountered: sequences mixed with %s at depth %s"""%(
+                        ', '.join( sorted([
+                            typ.__name__ for typ in types if typ not in nested
+                        ])),
+                        len( shape ),
+                    ), value,
+                )
+            lengths = set( map( len, level ))
+            if len( lengths ) != 1:
+                raise TypeError(
+                    """Non-uniform array encountered: lengths %s at depth %s"""%(
+                        sorted( lengths ), len( shape ),
+                    ), value,
+                )
+            length = lengths.pop()
+            if not length:
+                raise TypeError(
+                    """Empty sequence encountered at depth %s"""%( len( shape ), ),
+                    value,
+                )
+            shape.append( length )
+            level = list( itertools.chain.from_iterable( level ))
     @err_on_copy
     @classmethod
     def asArray( cls, value, typeCode=None ):
         """Convert given value to a ctypes array value of given typeCode
-        
-        This does a *lot* of work just to get the data into the correct
-        format.  It's not going to be anywhere near as fast as a numpy
-        or similar approach!
+
+        The shape is inferred in one pass (see shapeOf) and the flattened
+        elements are packed into a single array.array buffer which is
+        copied into the final (nested) ctypes array.  Values which the
+        buffer rejects as out-of-range fall back to element-by-element
+        ctypes conversion (which truncates, as ctypes always has).
         """
         if typeCode is None:
             raise NotImplementedError( """Haven't implemented type-inference for lists yet""" )
-        arrayType = GL_TYPE_TO_ARRAY_MAPPING[ typeCode ]
-        if isinstance( value, (list,tuple)):
-            subItems = [
-                cls.asArray( item, typeCode )
-                for item in value
-            ]
-            if subItems:
-                for dim in cls.dimensions( subItems[0] )[::-1]:
-                    arrayType *= dim
-                arrayType *= len( subItems )
-                result = arrayType()
-                result[:] = subItems
-                return result
-        else:
+        baseType = arrayType = GL_TYPE_TO_ARRAY_MAPPING[ typeCode ]
+        if not isinstance( value, HANDLED_TYPES ):
             return arrayType( value )
+        if not value:
+            return None
+        shape, leaves = cls.shapeOf( value )
+        for dim in shape[::-1]:
+            arrayType *= dim
+        if len( shape ) == 1 and len( leaves ) <= SMALL_ARRAY:
+            # ctypes' own initialiser wins for short flat lists (e.g. glVertex3fv)
+            return arrayType( *leaves )
+        result = arrayType()
+        size = ctypes.sizeof( result )
+        code = getattr( baseType, '_type_', None )
+        if code in BUFFER_TYPE_CODES:
+            try:
+                buffer = array.array( code, leaves )
+            except OverflowError:
+                pass
+            else:
+                if buffer.itemsize == ctypes.sizeof( baseType ):
+                    ctypes.memmove( result, buffer.buffer_info()[0], size )
+                    return result
+        ctypes.memmove( result, (baseType * len( leaves ))( *leaves ), size )
+        return result
     @err_on_copy
     @classmethod
     def unitSize( cls, value, typeCode=None ):
@@ -183,6 +236,10 @@ ARRAY_TO_GL_TYPE_MAPPING = {
     _types.GLbyte: GL_1_1.GL_BYTE,
     _types.GLubyte: GL_1_1.GL_UNSIGNED_BYTE,
 }
+# flat lists up to this length are converted by the ctypes initialiser
+SMALL_ARRAY = 16
+# ctypes type codes which array.array can store directly
+BUFFER_TYPE_CODES = frozenset( 'bBhHiIlLqQfd' )
 GL_TYPE_TO_ARRAY_MAPPING = {
     GL_1_1.GL_DOUBLE: _types.GLdouble,
     GL_1_1.GL_FLOAT: _types.GLfloat,
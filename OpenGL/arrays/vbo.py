@@ -40,7 +40,7 @@ _log = logging.getLogger( 'OpenGL.arrays.vbo' )
 from OpenGL._bytes import long, integer_types
 
 import weakref
-__all__ = ('VBO','VBOHandler','mapVBO')
+__all__ = ('VBO','VBOHandler','mapVBO','StreamingVBO')
 
 class Implementation( object ):
     """Abstraction point for the various implementations that can be used
@@ -463,3 +463,280 @@ def mapVBO( vbo, access=0x88BA ): # GL_READ_WRITE
     array = frombuffer( vp_array, 'B' )
     _cleaners[vbo] = weakref.ref( array, _cleaner( vbo ))
     return array
+
+class StreamingVBO( object ):
+    """Ring buffer for geometry re-generated every frame
+
+    Rather than re-uploading (and re-allocating) a VBO with glBufferData
+    each frame, a StreamingVBO allocates a fixed-size buffer split into
+    `segments` equal parts (a single part in 'orphan' mode) and hands out
+    numpy views into the part written this frame.  With a persistent
+    mapping fence-syncs guard each part, so the CPU only waits if it
+    laps a part the GPU is still reading from.
+
+    Three modes are used depending on what the context supports:
+
+        'persistent' -- glBufferStorage with a persistent, coherent
+            mapping (GL 4.4 / ARB_buffer_storage), mapped once
+        'orphan' -- glMapBufferRange each frame with
+            GL_MAP_INVALIDATE_BUFFER_BIT, letting the driver hand us fresh
+            storage (GL 3.0), the buffer is unmapped by end()
+        'copy' -- numpy staging array uploaded with glBufferSubData by
+            end() (GL 1.5)
+
+    Usage:
+
+        stream = vbo.StreamingVBO( 1024*1024 )
+        ...
+        stream.begin()
+        vertices, offset = stream.allocate( (count,3), 'f' )
+        vertices[:] = positions
+        stream.end()
+        with stream:
+            glVertexPointer( 3, GL_FLOAT, 0, offset )
+            glDrawArrays( GL_TRIANGLES, 0, count )
+
+    Views returned by allocate are only valid until end() (they point
+    into mapped GL memory), copy data into them, do not keep them.
+    """
+    ALIGNMENT = 16
+    MODES = ('persistent','orphan','copy')
+    WAIT_TIMEOUT = 1000000 # nanoseconds per glClientWaitSync call
+    def __init__(
+        self, size, segments=3,
+        target='GL_ARRAY_BUFFER', mode=None,
+    ):
+        """Initialize the stream (GL objects are created on first begin)
+
+        size -- bytes available per frame (per segment)
+        segments -- number of frames which may be in flight at once,
+            3 (triple buffering) is normally enough to never wait
+            (ignored in 'orphan' mode, where the driver provides fresh
+            storage each frame)
+        target -- VBO target to which to bind
+        mode -- force one of MODES, by default the best available
+        """
+        if mode is not None and mode not in self.MODES:
+            raise ValueError( 'Unknown StreamingVBO mode %r'%( mode, ))
+        self.segmentSize = self._align( size )
+        self.segmentCount = segments
+        self.size = self.segmentSize * segments
+        self.target = target
+        self.mode = mode
+        self.buffers = []
+        self.fences = [None] * segments
+        self.segment = segments - 1
+        self.used = 0
+        self.active = False
+        self.mapped = None
+        self.stalls = 0
+    _I_ = None
+    implementation = property( get_implementation, )
+    def _align( self, offset ):
+        return -(-offset // self.ALIGNMENT) * self.ALIGNMENT
+    def _chooseMode( self ):
+        from OpenGL.GL.VERSION import GL_3_0, GL_3_2, GL_4_4
+        if not (GL_3_2.glFenceSync and GL_3_0.glMapBufferRange):
+            return 'copy'
+        if GL_4_4.glBufferStorage:
+            return 'persistent'
+        return 'orphan'
+    def create_buffers( self ):
+        """Create and (for persistent mode) map the buffer"""
+        assert not self.buffers, """Already created the buffer"""
+        implementation = self.implementation
+        if isinstance( self.target, (bytes,unicode)):
+            self.target = getattr( implementation, implementation.basename( self.target ))
+        if self.mode is None:
+            self.mode = self._chooseMode()
+        if self.mode == 'orphan':
+            # each frame orphans the whole buffer, only one segment is in use
+            self.size = self.segmentSize
+        self.buffers = [ long( implementation.glGenBuffers( 1 )) ]
+        implementation._DELETERS_[ id(self) ] = weakref.ref(
+            self, implementation.deleter( self.buffers, id(self) )
+        )
+        implementation.glBindBuffer( self.target, self.buffers[0] )
+        if self.mode == 'persistent':
+            from OpenGL.GL.VERSION import GL_3_0, GL_4_4
+            flags = (
+                GL_3_0.GL_MAP_WRITE_BIT |
+                GL_4_4.GL_MAP_PERSISTENT_BIT |
+                GL_4_4.GL_MAP_COHERENT_BIT
+            )
+            GL_4_4.glBufferStorage( self.target, self.size, None, flags )
+            self.mapped = self._view(
+                GL_3_0.glMapBufferRange( self.target, 0, self.size, flags ),
+                self.size,
+            )
+        else:
+            implementation.glBufferData(
+                self.target, self.size, None, implementation.GL_STREAM_DRAW
+            )
+            if self.mode == 'copy':
+                from numpy import zeros
+                self.mapped = zeros( (self.size,), 'B' )
+        return self.buffers
+    def _view( self, pointer, size ):
+        """Produce a numpy byte-array view of mapped memory"""
+        from numpy import frombuffer
+        if not pointer:
+            raise error.GLError(
+                err=0, description='Unable to map StreamingVBO buffer',
+            )
+        return frombuffer( (ctypes.c_ubyte * size).from_address( pointer ), 'B' )
+    def _wait( self, segment ):
+        """Wait until the GPU has finished reading from segment"""
+        fence = self.fences[segment]
+        if fence is None:
+            return
+        from OpenGL.GL.VERSION import GL_3_2
+        flags = GL_3_2.GL_SYNC_FLUSH_COMMANDS_BIT
+        while True:
+            result = GL_3_2.glClientWaitSync( fence, flags, self.WAIT_TIMEOUT )
+            if result in (GL_3_2.GL_ALREADY_SIGNALED, GL_3_2.GL_CONDITION_SATISFIED):
+                break
+            if result == GL_3_2.GL_WAIT_FAILED:
+                raise error.GLError(
+                    err=0, description='glClientWaitSync failed on StreamingVBO fence',
+                )
+            self.stalls += 1
+            flags = 0
+        GL_3_2.glDeleteSync( fence )
+        self.fences[segment] = None
+    def _fence( self ):
+        """Fence the current segment (after the draws which read it)"""
+        if self.mode == 'persistent' and self.used and self.fences[self.segment] is None:
+            from OpenGL.GL.VERSION import GL_3_2
+            self.fences[self.segment] = GL_3_2.glFenceSync(
+                GL_3_2.GL_SYNC_GPU_COMMANDS_COMPLETE, 0
+            )
+    @property
+    def offset( self ):
+        """Byte offset of the current segment within the buffer"""
+        if self.mode == 'orphan':
+            return 0
+        return self.segment * self.segmentSize
+    def begin( self ):
+        """Start writing the next frame's data
+
+        Fences the previous frame's segment (its draws have been issued
+        by now), then waits for the next segment to be free.
+        """
+        assert not self.active, """begin() called twice without end()"""
+        if not self.buffers:
+            self.create_buffers()
+        else:
+            self._fence()
+        implementation = self.implementation
+        if self.mode == 'orphan':
+            # orphaning hands us fresh storage, no need to cycle or wait
+            from OpenGL.GL.VERSION import GL_3_0
+            implementation.glBindBuffer( self.target, self.buffers[0] )
+            self.mapped = self._view(
+                GL_3_0.glMapBufferRange(
+                    self.target, 0, self.segmentSize,
+                    GL_3_0.GL_MAP_WRITE_BIT | GL_3_0.GL_MAP_INVALIDATE_BUFFER_BIT,
+                ),
+                self.segmentSize,
+            )
+        else:
+            self.segment = (self.segment + 1) % self.segmentCount
+            self._wait( self.segment )
+        self.used = 0
+        self.active = True
+    def allocate( self, shape, dtype='f' ):
+        """Allocate an array in the current frame's segment
+
+        shape -- integer count or tuple shape of the array
+        dtype -- numpy data-type of the array elements
+
+        returns (numpy view into the buffer, VBOOffset for the array
+        within the buffer) where the offset can be passed to gl*Pointer
+        and glVertexAttribPointer calls while the stream is bound
+        """
+        from numpy import dtype as _dtype
+        assert self.active, """allocate() called outside begin()/end()"""
+        if isinstance( shape, integer_types ):
+            shape = (shape,)
+        dtype = _dtype( dtype )
+        count = dtype.itemsize
+        for dim in shape:
+            count *= dim
+        start = self._align( self.used )
+        if start + count > self.segmentSize:
+            raise ValueError(
+                """StreamingVBO segment overflow: %s bytes requested, %s of %s available"""%(
+                    count, self.segmentSize - start, self.segmentSize,
+                )
+            )
+        self.used = start + count
+        base = 0 if self.mode == 'orphan' else self.offset
+        view = self.mapped[ base + start: base + start + count ].view( dtype ).reshape( shape )
+        return view, VBOOffset( self, self.offset + start )
+    def write( self, data ):
+        """Copy data (anything numpy.asarray accepts) into the current frame
+
+        returns VBOOffset for the data within the buffer
+        """
+        from numpy import asarray
+        data = asarray( data )
+        view, offset = self.allocate( data.shape, data.dtype )
+        view[...] = data
+        return offset
+    def end( self ):
+        """Finish writing the current frame's data
+
+        Must be called before drawing from the stream in 'orphan' and
+        'copy' modes (unmaps or uploads the data).
+        """
+        assert self.active, """end() called without begin()"""
+        self.active = False
+        implementation = self.implementation
+        if self.mode == 'orphan':
+            implementation.glBindBuffer( self.target, self.buffers[0] )
+            implementation.glUnmapBuffer( self.target )
+            self.mapped = None
+        elif self.mode == 'copy' and self.used:
+            implementation.glBindBuffer( self.target, self.buffers[0] )
+            implementation.glBufferSubData(
+                self.target, self.offset, self.used,
+                self.mapped[ self.offset: self.offset + self.used ],
+            )
+    def bind( self ):
+        """Bind the stream's buffer for use in vertex calls"""
+        if not self.buffers:
+            self.create_buffers()
+        self.implementation.glBindBuffer( self.target, self.buffers[0] )
+    def unbind( self ):
+        """Unbind the buffer (make normal array operations active)"""
+        self.implementation.glBindBuffer( self.target, 0 )
+    __enter__ = bind
+    def __exit__( self, exc_type=None, exc_val=None, exc_tb=None ):
+        """Context manager exit"""
+        self.unbind()
+        return False
+    def __int__( self ):
+        """Get our VBO id"""
+        if not self.buffers:
+            self.create_buffers()
+        return self.buffers[0]
+    def delete( self ):
+        """Delete the buffer and outstanding fences explicitly"""
+        from OpenGL.GL.VERSION import GL_3_2
+        for index,fence in enumerate( self.fences ):
+            if fence is not None:
+                GL_3_2.glDeleteSync( fence )
+                self.fences[index] = None
+        if self.buffers and self.mode in ('persistent','orphan') and (
+            self.mode == 'persistent' or self.active
+        ):
+            self.implementation.glBindBuffer( self.target, self.buffers[0] )
+            self.implementation.glUnmapBuffer( self.target )
+        self.mapped = None
+        self.active = False
+        while self.buffers:
+            try:
+                self.implementation.glDeleteBuffers( 1, _types.GLuint( self.buffers.pop(0) ))
+            except (AttributeError,error.NullFunctionError) as err:
+                pass
@@ -14,23 +14,28 @@ class Constant( object ):
     def __new__( cls, name, value=None ):
         """Initialise the constant with the given name and value"""
         if not isinstance( value, Constant ):
-            if isinstance( value, float ) and cls is not FloatConstant:
-                return FloatConstant( name, value )
-            elif isinstance( value, int ) and cls is not IntConstant:
-                return IntConstant( name, value )
-            elif isinstance( value, long ) and cls is not LongConstant:
-                return LongConstant( name, value )
-            elif isinstance( value, (bytes,unicode) ) and cls is not StringConstant:
-                return StringConstant( name, as_8_bit(value) )
+            # pick the concrete class here rather than re-dispatching 
+            # through a second __new__ call for each of the many
+            # thousands of constants created at import time
+            if isinstance( value, float ):
+                cls = FloatConstant
+            elif isinstance( value, int ):
+                cls = IntConstant
+            elif isinstance( value, long ):
+                cls = LongConstant
+            elif isinstance( value, (bytes,unicode) ):
+                cls = StringConstant
+                value = as_8_bit(value)
         if isinstance( value, integer_types ):
             if value > maxsize: # TODO: I'm guessing this should really by sizeof GLint, not 
                 value = - (value & maxsize)
         base = super(Constant,cls).__new__( cls, value )
         base.name = name
         if _configflags.MODULE_ANNOTATIONS:
+            # the caller is the module defining the constant
             frame = sys._getframe().f_back
-            if frame and frame.f_back and '__name__' in frame.f_back.f_globals:
-                base.__module__ = frame.f_back.f_globals['__name__']
+            if frame and '__name__' in frame.f_globals:
+                base.__module__ = frame.f_globals['__name__']
         return base
     def __repr__( self ):
         """Return the name, rather than the bald value"""
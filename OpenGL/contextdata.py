@@ -17,9 +17,16 @@ setting:
     OpenGL.STORE_POINTERS = False 
         
 before importing OpenGL functionality.
+
+The current context ID is cached per-thread once PyOpenGL has seen
+that thread make a context current (via GLX/EGL/OSMesa/WGL/CGL or
+GLUT entry points), so storing pointers is a dictionary operation
+rather than a driver query.  Contexts destroyed through those entry
+points have their stored values released automatically, see stats()
+for the values currently held.
 """
 from OpenGL import platform
-import weakref
+import weakref, threading, ctypes, sys
 storedPointers = {
     # map from contextID: { constant: value }
 }
@@ -28,18 +35,77 @@ storedWeakPointers = {
 }
 STORAGES = [ storedPointers, storedWeakPointers ]
 
+# A thread which has seen a context switch made through PyOpenGL (see
+# contextChanged) caches its current context ID until the next switch
+# instead of asking the driver on every store/lookup.
+_current = threading.local()
+# map from native context handle (as passed to make-current) to context ID
+_handles = {}
+_counters = {
+    'cachedLookups': 0,
+    'driverLookups': 0,
+    'releasedContexts': 0,
+}
+
+def contextKey( context ):
+    """Normalise a platform context handle to a hashable integer ID"""
+    if context is None:
+        return 0
+    if isinstance( context, int ):
+        return context
+    return ctypes.cast( context, ctypes.c_void_p ).value or 0
+
 def getContext( context = None ):
     """Get the context (if passed, just return)
-    
+
     context -- the context ID, if None, the current context
     """
     if context is None:
-        context = platform.GetCurrentContext()
+        context = getattr( _current, 'context', None )
+        if context is not None:
+            _counters['cachedLookups'] += 1
+            return context
+        context = contextKey( platform.GetCurrentContext() )
+        _counters['driverLookups'] += 1
         if context == 0:
             from OpenGL import error
             raise error.Error(
                 """Attempt to retrieve context when no valid context"""
             )
+        if getattr( _current, 'tracking', False ):
+            _current.context = context
+        return context
+    return contextKey( context )
+
+def contextChanged( handle=None ):
+    """Record that a (possibly) different context is now current
+
+    Called by PyOpenGL's make-current entry points and before GLUT
+    callbacks.  Call it yourself if a thread which uses those also
+    switches contexts through a library which bypasses PyOpenGL.
+
+    handle -- the native context handle made current, if known, so
+        that contextDestroyed( handle ) can find the stored values
+    """
+    _current.tracking = True
+    _current.context = None
+    if handle:
+        context = contextKey( platform.GetCurrentContext() )
+        if context:
+            _handles[ contextKey( handle ) ] = context
+            _current.context = context
+
+def contextDestroyed( handle ):
+    """Record that the native context handle has been destroyed
+
+    Releases all values stored for the context.
+    """
+    handle = contextKey( handle )
+    context = _handles.pop( handle, handle )
+    if getattr( _current, 'context', None ) == context:
+        _current.context = None
+    if context and cleanupContext( context ):
+        _counters['releasedContexts'] += 1
     return context
 def setValue( constant, value, context=None, weak=False ):
     """Set a stored value for the given context
@@ -121,11 +187,45 @@ def cleanupContext( context=None ):
     Context object with the (now invalid) context ID as parameter.
     """
     if context is None:
-        context = platform.GetCurrentContext()
+        context = getContext()
+    found = False
     for storage in STORAGES:
+        if storage.pop( context, None ) is not None:
+            found = True
+    return found
+
+def _valueSize( value ):
+    """Estimate bytes held by a stored value"""
+    nbytes = getattr( value, 'nbytes', None )
+    if nbytes is None:
         try:
-            del storedPointers[ context ]
-        except KeyError as err:
-            return False
-        else:
-            return True
+            nbytes = ctypes.sizeof( value )
+        except TypeError:
+            nbytes = sys.getsizeof( value )
+    return nbytes
+
+def stats( ):
+    """Report on the values held for all contexts
+
+    returns a dictionary with the number of contexts and stored values,
+    an estimate of the bytes held by (strongly) stored values, and counts
+    of current-context lookups served from the per-thread cache vs the
+    driver, and of contexts released by contextDestroyed
+    """
+    contexts = set()
+    entries = weakEntries = held = 0
+    for context,values in list( storedPointers.items()):
+        contexts.add( context )
+        entries += len( values )
+        held += sum([ _valueSize( value ) for value in list( values.values()) ])
+    for context,values in list( storedWeakPointers.items()):
+        contexts.add( context )
+        weakEntries += len( values )
+    result = dict( _counters )
+    result.update({
+        'contexts': len( contexts ),
+        'entries': entries,
+        'weakEntries': weakEntries,
+        'bytes': held,
+    })
+    return result
@@ -7,7 +7,7 @@ ErrorChecker is an _ErrorChecker instance that allows you
 to register a new error-checking function for use 
 throughout the system.
 """
-import logging
+import logging, collections, random
 _log = logging.getLogger( 'OpenGL.error' )
 from OpenGL import platform, _configflags
 from ctypes import ArgumentError
@@ -57,6 +57,10 @@ class GLError( Error ):
         cArguments -- ctypes-level arguments to the operation,
             often raw integers for pointers and the like
         description -- OpenGL description of the error (textual)
+        recentCalls -- with deferred error checking, the
+            (baseOperation, cArguments) pairs of the calls made since
+            the last sync point, oldest first, any of which may have
+            raised the error
     """
     def __init__( 
         self, 
@@ -67,6 +71,7 @@ class GLError( Error ):
         pyArgs=None, 
         cArgs=None,
         description=None,
+        recentCalls=None,
     ):
         """Initialise the GLError, storing metadata for later display"""
         (
@@ -78,6 +83,7 @@ class GLError( Error ):
             baseOperation, pyArgs, cArgs,
             description
         )
+        self.recentCalls = recentCalls
     DISPLAY_ORDER = (
         'err', 
         'description',
@@ -86,6 +92,7 @@ class GLError( Error ):
         'cArgs',
         'cArguments',
         'result', 
+        'recentCalls',
     )
     def __str__( self ):
         """Create a fully formatted representation of the error"""
@@ -151,6 +158,15 @@ class GLError( Error ):
             return '%s = %s'%( property, value.__name__ )
         else:
             return '%s = %r'%( property, value )
+    def format_recentCalls( self, property, value ):
+        """Format the deferred-checking call window for display"""
+        return '%s = [\n\t\t%s\n\t]'%( property, ",\n\t\t".join([
+            '%s%s'%(
+                getattr( operation, '__name__', operation ),
+                self.shortRepr( tuple( arguments or () ), False ),
+            )
+            for (operation,arguments) in value
+        ]))
 
 class GLUError( Error ):
     """GLU error implementation class"""
@@ -163,7 +179,7 @@ class EGLError( GLError ):
 if _configflags.ERROR_CHECKING:
     from OpenGL import acceleratesupport
     _ErrorChecker = None
-    if acceleratesupport.ACCELERATE_AVAILABLE:
+    if acceleratesupport.ACCELERATE_AVAILABLE and not _configflags.DEFERRED_ERROR_CHECKING:
         try:
             from OpenGL_accelerate.errorchecker import _ErrorChecker
         except ImportError as err:
@@ -176,8 +192,25 @@ if _configflags.ERROR_CHECKING:
                 _registeredChecker -- the checking function enabled when 
                     not doing onBegin/onEnd processing
                 _currentChecker -- currently active checking function
+                _deferred -- None for immediate checking, otherwise
+                    the ring buffer of calls since the last sync point
+                _random -- private random.Random choosing the sampled
+                    sync points (None without sampling)
+
+            Class attributes (defaults for deferChecks):
+                DEFERRED_SYNC_INTERVAL -- sync after this many calls
+                DEFERRED_SAMPLE_RATE -- probability of an extra sync
+                    after any individual call
+                DEFERRED_WINDOW -- number of recent calls retained
+                DEFERRED_SYNC_ON -- names of operations after which
+                    we always sync
             """
             _getErrors = None
+            _deferred = None
+            DEFERRED_SYNC_INTERVAL = 256
+            DEFERRED_SAMPLE_RATE = 0.0
+            DEFERRED_WINDOW = 32
+            DEFERRED_SYNC_ON = ('glEnd','glFinish','glFlush','glEndList')
             def __init__( self, platform, baseOperation=None, noErrorResult=0, errorClass=GLError ):
                 """Initialize from a platform module/reference"""
                 self._isValid = platform.CurrentContextIsValid
@@ -192,6 +225,64 @@ if _configflags.ERROR_CHECKING:
                 else:
                     self._registeredChecker = self.nullGetError
                 self._currentChecker = self._registeredChecker
+                if _configflags.DEFERRED_ERROR_CHECKING:
+                    self.deferChecks()
+            def deferChecks( 
+                self, 
+                interval=None, 
+                sample=None, 
+                window=None, 
+                syncOn=None,
+            ):
+                """Switch to deferred checking, querying glGetError only at sync points
+
+                interval -- sync after this many calls (0 to disable)
+                sample -- probability (0.0-1.0) of syncing after any call
+                window -- number of recent calls reported with an error
+                syncOn -- operation names which always trigger a sync
+
+                Unspecified values use the DEFERRED_* class attributes.
+                """
+                self._syncInterval = self.DEFERRED_SYNC_INTERVAL if interval is None else interval
+                self._sampleRate = self.DEFERRED_SAMPLE_RATE if sample is None else sample
+                # our own generator, so that sampling does not consume
+                # (or depend on) the application's seeded random stream
+                self._random = random.Random() if self._sampleRate else None
+                self._syncOn = frozenset( self.DEFERRED_SYNC_ON if syncOn is None else syncOn )
+                self._callCount = 0
+                self._deferred = collections.deque(
+                    maxlen = self.DEFERRED_WINDOW if window is None else window
+                )
+            def immediateChecks( self ):
+                """Return to checking for errors after every call"""
+                if self._deferred is not None:
+                    self._deferred = None
+                    self.sync()
+            def sync( self, result=None, baseOperation=None, cArguments=None ):
+                """Check for errors queued since the last sync point
+
+                Does nothing during glBegin/glEnd processing.  Raises the
+                error with the recent call window if one is pending.
+                """
+                if self._currentChecker == self.nullGetError:
+                    return result
+                recent = self._deferred
+                err = self._currentChecker()
+                if recent is not None:
+                    self._callCount = 0
+                    calls = list( recent )
+                    recent.clear()
+                else:
+                    calls = None
+                if err != self._noErrorResult:
+                    raise self._errorClass(
+                        err,
+                        result,
+                        cArguments = cArguments,
+                        baseOperation = baseOperation,
+                        recentCalls = calls,
+                    )
+                return result
             def __bool__( self ):
                 """We are "true" if we actually do anything"""
                 if self._registeredChecker is self.nullGetError:
@@ -225,6 +316,17 @@ if _configflags.ERROR_CHECKING:
                     sequence.  If you are calling glBegin/glEnd in C you 
                     should call onBegin and onEnd appropriately.
                 """
+                recent = self._deferred
+                if recent is not None:
+                    recent.append( (baseOperation, cArguments) )
+                    self._callCount += 1
+                    if not (
+                        getattr( baseOperation, '__name__', None ) in self._syncOn or
+                        (self._syncInterval and self._callCount >= self._syncInterval) or
+                        (self._sampleRate and self._random.random() < self._sampleRate)
+                    ):
+                        return result
+                    return self.sync( result, baseOperation, cArguments )
                 err = self._currentChecker()
                 if err != self._noErrorResult:
                     raise self._errorClass(
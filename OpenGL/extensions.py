@@ -140,21 +140,33 @@ class _GLQuerier( ExtensionQuerier ):
         from OpenGL import platform
         if not platform.PLATFORM.CurrentContextIsValid():
             return False
+        from OpenGL import probecache
+        cache = probecache.currentCache()
+        if cache is not None and cache.version:
+            self.version_string = cache.version_string
+            return list( cache.version )
         from OpenGL.raw.GL.VERSION.GL_1_1 import glGetString 
         from OpenGL.raw.GL.VERSION.GL_1_1 import GL_VERSION
         new = glGetString( GL_VERSION )
         
         self.version_string = new
         if new:
-            return [
+            version = [
                 int(x) for x in new.split(as_8_bit(' '),1)[0].split( as_8_bit('.') )
             ]
+            if cache is not None:
+                cache.setVersion( new, version )
+            return version
         else:
             return False # not yet loaded/supported
     def pullExtensions( self ):
         from OpenGL import platform
         if not platform.PLATFORM.CurrentContextIsValid():
             return False
+        from OpenGL import probecache
+        cache = probecache.currentCache()
+        if cache is not None and cache.extensions:
+            return list( cache.extensions )
         from OpenGL.raw.GL._types import GLint
         from OpenGL.raw.GL.VERSION.GL_1_1 import glGetString, glGetError
         from OpenGL.raw.GL.VERSION.GL_1_1 import GL_EXTENSIONS
@@ -192,6 +204,8 @@ class _GLQuerier( ExtensionQuerier ):
                         extensions.append( as_8_bit(v_ext) )
             else:
                 break
+        if cache is not None:
+            cache.setExtensions( extensions )
         return extensions
 GLQuerier = _GLQuerier()
 class _GLUQuerier( ExtensionQuerier ):
@@ -0,0 +1,527 @@
+"""Headless (off-screen) rendering harness and binary image writers
+
+Renders an arbitrary display callback into a framebuffer object on an
+off-screen context, without a window system, and reads back the frames
+as numpy arrays.  Intended for batch rendering, rendering throughput
+benchmarks and golden-image tests on CI machines without a display (or
+a GPU, Mesa's llvmpipe/OSMesa software renderers work fine).
+
+The platform must be selected before OpenGL is first imported:
+
+    PYOPENGL_PLATFORM=egl -- EGL pbuffer or surfaceless context, the
+        default display (use EGL_PLATFORM=surfaceless with Mesa when
+        there is no X/Wayland server), or a GBM render device
+    PYOPENGL_PLATFORM=osmesa -- Mesa's off-screen software renderer
+
+Usage:
+
+    from OpenGL import headless
+    with headless.HeadlessRenderer( 800, 600 ) as renderer:
+        frame = renderer.render( display )
+        headless.write_image( frame, 'frame.png' )
+        for index,frame in enumerate( renderer.frames( display, 100 )):
+            headless.write_image( frame, 'frame-%04d.ppm'%( index, ))
+
+Frames are returned in GL order (bottom row first) with shape
+(height,width,components), the writers flip them to top-down order
+unless passed flip=False.
+
+Display callbacks written for GLUT normally end with glutSwapBuffers,
+which would fail without a GLUT window, see noSwapBuffers.
+"""
+import ctypes, logging, os, struct, zlib, contextlib, time
+from OpenGL import platform, images, error
+from OpenGL.raw.GL.VERSION import GL_1_1
+from OpenGL.GL.VERSION import GL_3_0
+_log = logging.getLogger( 'OpenGL.headless' )
+
+__all__ = (
+    'HeadlessRenderer',
+    'createContext',
+    'noSwapBuffers',
+    'write_image',
+    'write_ppm',
+    'write_png',
+    'write_raw',
+    'write_npy',
+    'read_image',
+    'difference',
+)
+
+class EGLContext( object ):
+    """Off-screen EGL context (pbuffer, or surfaceless if unavailable)"""
+    def __init__( self, width, height, device=None ):
+        """Create and make current an EGL context
+
+        device -- optional GBM device (see OpenGL.EGL.gbmdevice.open_device)
+            path or index to render on, default is the default display
+        """
+        from OpenGL import EGL
+        self.EGL = EGL
+        self.device = None
+        if device is not None:
+            from OpenGL.EGL import gbmdevice
+            self.device = gbmdevice.open_device( device )
+            native = ctypes.cast( self.device, EGL.EGLNativeDisplayType )
+        else:
+            native = EGL.EGL_DEFAULT_DISPLAY
+        self.display = EGL.eglGetDisplay( native )
+        major,minor = EGL.EGLint(),EGL.EGLint()
+        if not EGL.eglInitialize( self.display, major, minor ):
+            raise RuntimeError( 'Unable to initialise EGL display' )
+        EGL.eglBindAPI( EGL.EGL_OPENGL_API )
+        self.config = self.chooseConfig( EGL.EGL_PBUFFER_BIT ) or self.chooseConfig( 0 )
+        if self.config is None:
+            raise RuntimeError( 'No EGL configuration supports desktop OpenGL' )
+        self.surface = EGL.EGL_NO_SURFACE
+        pbuffer = (EGL.EGLint * 5)(
+            EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE,
+        )
+        try:
+            surface = EGL.eglCreatePbufferSurface( self.display, self.config, pbuffer )
+        except error.GLError:
+            surface = None
+        if surface:
+            self.surface = surface
+        else:
+            _log.info( 'No pbuffer support, using a surfaceless context' )
+        self.context = EGL.eglCreateContext(
+            self.display, self.config, EGL.EGL_NO_CONTEXT, None,
+        )
+        if not self.context:
+            raise RuntimeError( 'Unable to create EGL context' )
+        if not EGL.eglMakeCurrent( self.display, self.surface, self.surface, self.context ):
+            raise RuntimeError( 'Unable to make EGL context current' )
+    def chooseConfig( self, surfaceType ):
+        """Choose an RGB(A)8 desktop-GL configuration with surfaceType"""
+        EGL = self.EGL
+        attributes = (EGL.EGLint * 13)(
+            EGL.EGL_SURFACE_TYPE, surfaceType,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_RED_SIZE, 8,
+            EGL.EGL_GREEN_SIZE, 8,
+            EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_NONE,
+        )
+        config,count = EGL.EGLConfig(),EGL.EGLint()
+        if not EGL.eglChooseConfig( self.display, attributes, config, 1, count ) or not count.value:
+            return None
+        return config
+    def destroy( self ):
+        """Release the context, surface, display and device"""
+        EGL = self.EGL
+        if self.context:
+            EGL.eglMakeCurrent(
+                self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT,
+            )
+            EGL.eglDestroyContext( self.display, self.context )
+            self.context = None
+        if self.surface:
+            EGL.eglDestroySurface( self.display, self.surface )
+            self.surface = None
+        EGL.eglTerminate( self.display )
+        if self.device is not None:
+            from OpenGL.EGL import gbmdevice
+            gbmdevice.close_device( self.device )
+            self.device = None
+
+class OSMesaContext( object ):
+    """Off-screen OSMesa context rendering into a client-side buffer"""
+    def __init__( self, width, height, device=None ):
+        """Create and make current an OSMesa context"""
+        from OpenGL import osmesa, arrays
+        if device is not None:
+            raise ValueError( 'OSMesa renders in software, it has no devices' )
+        self.osmesa = osmesa
+        self.context = osmesa.OSMesaCreateContextExt( osmesa.OSMESA_RGBA, 24, 8, 0, None )
+        if not self.context:
+            raise RuntimeError( 'Unable to create OSMesa context' )
+        self.buffer = arrays.GLubyteArray.zeros( (height, width, 4) )
+        if not osmesa.OSMesaMakeCurrent(
+            self.context, self.buffer, GL_1_1.GL_UNSIGNED_BYTE, width, height,
+        ):
+            raise RuntimeError( 'Unable to make OSMesa context current' )
+    def destroy( self ):
+        """Release the context"""
+        if self.context:
+            self.osmesa.OSMesaDestroyContext( self.context )
+            self.context = None
+
+def createContext( width, height, device=None ):
+    """Create an off-screen context for the platform in use and make it current
+
+    returns EGLContext or OSMesaContext, raises RuntimeError if the
+    platform (PYOPENGL_PLATFORM) cannot render off-screen
+    """
+    name = platform.PLATFORM.__class__.__name__
+    if name == 'EGLPlatform':
+        return EGLContext( width, height, device )
+    if name == 'OSMesaPlatform':
+        return OSMesaContext( width, height, device )
+    raise RuntimeError(
+        """Headless rendering needs PYOPENGL_PLATFORM=egl or osmesa, platform is %s"""%(
+            name,
+        )
+    )
+
+def _swapFlush( *args ):
+    """Replacement for glutSwapBuffers while rendering off-screen"""
+    GL_1_1.glFlush()
+
+@contextlib.contextmanager
+def noSwapBuffers( *namespaces ):
+    """Replace glutSwapBuffers in the given modules (or dicts) while active
+
+    Display callbacks written for GLUT usually call glutSwapBuffers
+    (bound by `from OpenGL.GLUT import *`), which fails without a GLUT
+    window.  The name is bound to a glFlush call in each namespace for
+    the duration, e.g.:
+
+        with headless.noSwapBuffers( game ):
+            frame = renderer.render( game.display )
+    """
+    replaced = []
+    for namespace in namespaces:
+        if not isinstance( namespace, dict ):
+            namespace = vars( namespace )
+        if 'glutSwapBuffers' in namespace:
+            replaced.append( (namespace, namespace['glutSwapBuffers']) )
+            namespace['glutSwapBuffers'] = _swapFlush
+    try:
+        yield
+    finally:
+        for namespace,original in replaced:
+            namespace['glutSwapBuffers'] = original
+
+class HeadlessRenderer( object ):
+    """Renders display callbacks into a framebuffer object off-screen
+
+    Attributes:
+
+        width, height -- dimensions of the frames rendered
+        format -- GL pixel format of the frames read (GL_RGB or GL_RGBA)
+        shape -- shape of each frame array (height,width,components)
+        context -- the EGLContext/OSMesaContext created (None if the
+            renderer was given an already-current context)
+        framebuffer -- the framebuffer object rendered into
+        frameCount, renderTime -- frames rendered and seconds spent
+            rendering and reading them back (see throughput)
+    """
+    def __init__(
+        self, width, height, format=GL_1_1.GL_RGB,
+        device=None, context=True,
+    ):
+        """Create the off-screen context and framebuffer
+
+        format -- GL_RGB or GL_RGBA, pixel format of frames read back
+        device -- GBM device for EGL (see EGLContext)
+        context -- if False, use the already-current context rather than
+            creating one (e.g. to share a context with other code)
+        """
+        if format not in (GL_1_1.GL_RGB, GL_1_1.GL_RGBA):
+            raise ValueError( 'Frames are read as GL_RGB or GL_RGBA' )
+        self.width, self.height = int( width ), int( height )
+        self.format = format
+        components = 3 if format == GL_1_1.GL_RGB else 4
+        self.shape = (self.height, self.width, components)
+        self.context = createContext( self.width, self.height, device ) if context else None
+        self.frameCount = 0
+        self.renderTime = 0.0
+        self.framebuffer = None
+        self.renderbuffers = []
+        try:
+            self.createFramebuffer()
+        except Exception:
+            self.destroy()
+            raise
+    def createFramebuffer( self ):
+        """Create the framebuffer with RGBA8 colour and depth/stencil buffers"""
+        self.framebuffer = int( GL_3_0.glGenFramebuffers( 1 ))
+        GL_3_0.glBindFramebuffer( GL_3_0.GL_FRAMEBUFFER, self.framebuffer )
+        for storage,attachment in (
+            (GL_1_1.GL_RGBA8, GL_3_0.GL_COLOR_ATTACHMENT0),
+            (GL_3_0.GL_DEPTH24_STENCIL8, GL_3_0.GL_DEPTH_STENCIL_ATTACHMENT),
+        ):
+            renderbuffer = int( GL_3_0.glGenRenderbuffers( 1 ))
+            self.renderbuffers.append( renderbuffer )
+            GL_3_0.glBindRenderbuffer( GL_3_0.GL_RENDERBUFFER, renderbuffer )
+            GL_3_0.glRenderbufferStorage(
+                GL_3_0.GL_RENDERBUFFER, storage, self.width, self.height,
+            )
+            GL_3_0.glFramebufferRenderbuffer(
+                GL_3_0.GL_FRAMEBUFFER, attachment, GL_3_0.GL_RENDERBUFFER, renderbuffer,
+            )
+        GL_3_0.glBindRenderbuffer( GL_3_0.GL_RENDERBUFFER, 0 )
+        status = GL_3_0.glCheckFramebufferStatus( GL_3_0.GL_FRAMEBUFFER )
+        if status != GL_3_0.GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError( 'Framebuffer incomplete: %s'%( status, ))
+        return self.framebuffer
+    def bind( self ):
+        """Direct rendering (and reads) to the framebuffer"""
+        GL_3_0.glBindFramebuffer( GL_3_0.GL_FRAMEBUFFER, self.framebuffer )
+        GL_1_1.glViewport( 0, 0, self.width, self.height )
+    def draw( self, display, *args ):
+        """Call display(*args) with the framebuffer bound"""
+        self.bind()
+        display( *args )
+    def read( self, out=None ):
+        """Read the current frame from the framebuffer
+
+        out -- optional contiguous uint8 array of self.shape to reuse
+            instead of allocating a new array per frame
+        """
+        if out is None:
+            import numpy
+            out = numpy.empty( self.shape, 'B' )
+        elif getattr( out, 'shape', None ) != self.shape:
+            raise ValueError( 'Expected a %s array, got %s'%(
+                self.shape, getattr( out, 'shape', None ),
+            ))
+        pointer = ctypes.addressof( (ctypes.c_ubyte * out.nbytes).from_buffer( out ))
+        GL_3_0.glBindFramebuffer( GL_3_0.GL_READ_FRAMEBUFFER, self.framebuffer )
+        images.setupDefaultTransferMode()
+        images.rankPacking( 3 )
+        GL_1_1.glReadPixels(
+            0, 0, self.width, self.height,
+            self.format, GL_1_1.GL_UNSIGNED_BYTE, ctypes.c_void_p( pointer ),
+        )
+        return out
+    def render( self, display, args=(), out=None ):
+        """Render a single frame with display(*args), return it as an array
+
+        out -- optional array to read into, see read()
+        """
+        start = time.perf_counter()
+        self.draw( display, *args )
+        result = self.read( out )
+        self.renderTime += time.perf_counter() - start
+        self.frameCount += 1
+        return result
+    def frames( self, display, count, out=None, pipelined=False ):
+        """Render count frames with display( index ), yielding each frame
+
+        out -- optional array into which each frame is read (the same
+            array is yielded each time)
+        pipelined -- if True read frames asynchronously through a
+            PixelReadback ring (see OpenGL.GL.readback), rendering
+            continues while earlier frames transfer.  Yielded frames are
+            then views of mapped buffers, only valid until the next frame
+            is requested (unless out is passed)
+        """
+        if not pipelined:
+            for index in range( count ):
+                yield self.render( display, (index,), out )
+            return
+        from OpenGL.GL.readback import PixelReadback
+        reader = PixelReadback( self.width, self.height, self.format, GL_1_1.GL_UNSIGNED_BYTE )
+        try:
+            start = time.perf_counter()
+            for index in range( count ):
+                self.draw( display, index )
+                GL_3_0.glBindFramebuffer( GL_3_0.GL_READ_FRAMEBUFFER, self.framebuffer )
+                frame = reader.read( 0, 0, out )
+                if frame is not None:
+                    yield self._count( frame, start )
+                    start = time.perf_counter()
+            for frame in reader.flush( out ):
+                yield self._count( frame, start )
+                start = time.perf_counter()
+        finally:
+            reader.delete()
+    def _count( self, frame, start ):
+        """Account for a frame produced by frames()
+
+        PixelReadback shapes frames as glReadPixels does,
+        (width,height,components), the same bytes are returned with
+        self.shape as for render()
+        """
+        self.renderTime += time.perf_counter() - start
+        self.frameCount += 1
+        return frame.reshape( self.shape )
+    def throughput( self ):
+        """Frames per second rendered (and read back) so far"""
+        if not self.renderTime:
+            return 0.0
+        return self.frameCount / self.renderTime
+    def destroy( self ):
+        """Delete the framebuffer and release the context"""
+        if self.framebuffer is not None:
+            GL_3_0.glBindFramebuffer( GL_3_0.GL_FRAMEBUFFER, 0 )
+            GL_3_0.glDeleteFramebuffers( 1, [self.framebuffer] )
+            self.framebuffer = None
+        if self.renderbuffers:
+            GL_3_0.glDeleteRenderbuffers( len( self.renderbuffers ), self.renderbuffers )
+            self.renderbuffers = []
+        if self.context is not None:
+            self.context.destroy()
+            self.context = None
+    def __enter__( self ):
+        return self
+    def __exit__( self, *args ):
+        self.destroy()
+
+def _imageRows( array, flip ):
+    """Produce (height, width, components, maxval, contiguous data) for writing
+
+    16-bit data is converted to the big-endian order PPM/PNG require.
+    """
+    import numpy
+    array = numpy.asarray( array )
+    if array.ndim == 2:
+        array = array[:,:,None]
+    if array.ndim != 3 or array.shape[2] not in (1,2,3,4):
+        raise ValueError( 'Expected a (height,width[,components]) image, got %s'%( array.shape, ))
+    if array.dtype == numpy.uint8:
+        maxval = 255
+    elif array.dtype == numpy.uint16:
+        maxval = 65535
+        array = array.astype( '>u2' )
+    else:
+        raise ValueError( 'Expected uint8 or uint16 image data, got %s'%( array.dtype, ))
+    if flip:
+        array = array[::-1]
+    height, width, components = array.shape
+    return height, width, components, maxval, numpy.ascontiguousarray( array )
+
+def write_ppm( array, filename, flip=True ):
+    """Write array as binary PPM (RGB) or PGM (greyscale) to filename
+
+    array -- (height,width,3) or (height,width[,1]) uint8/uint16 array
+    flip -- if True, array is in GL (bottom-up) row order
+    """
+    height, width, components, maxval, data = _imageRows( array, flip )
+    if components not in (1,3):
+        raise ValueError( 'PPM/PGM images need 1 or 3 components, not %s'%( components, ))
+    with open( filename, 'wb' ) as handle:
+        handle.write( ('%s\n%i %i\n%i\n'%(
+            'P6' if components == 3 else 'P5', width, height, maxval,
+        )).encode( 'ascii' ))
+        handle.write( data.view( 'B' ))
+    return filename
+
+def _pngChunk( kind, data ):
+    """Produce a PNG chunk (length, kind, data, crc)"""
+    return b''.join([
+        struct.pack( '>I', len( data )),
+        kind,
+        data,
+        struct.pack( '>I', zlib.crc32( kind + data ) & 0xffffffff ),
+    ])
+
+PNG_COLOUR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+def write_png( array, filename, flip=True, compression=6 ):
+    """Write array as a (non-interlaced, unfiltered) PNG to filename
+
+    array -- (height,width[,components]) uint8/uint16 array of 1 to 4
+        components (grey, grey+alpha, RGB, RGBA)
+    flip -- if True, array is in GL (bottom-up) row order
+    compression -- zlib compression level, lower is faster
+    """
+    import numpy
+    height, width, components, maxval, data = _imageRows( array, flip )
+    rows = data.view( 'B' ).reshape( (height, -1) )
+    # each scanline is prefixed with its filter type (0, none)
+    filtered = numpy.zeros( (height, rows.shape[1] + 1), 'B' )
+    filtered[:,1:] = rows
+    header = struct.pack(
+        '>IIBBBBB', width, height, 8 if maxval == 255 else 16,
+        PNG_COLOUR_TYPES[components], 0, 0, 0,
+    )
+    with open( filename, 'wb' ) as handle:
+        handle.write( b'\x89PNG\r\n\x1a\n' )
+        handle.write( _pngChunk( b'IHDR', header ))
+        handle.write( _pngChunk( b'IDAT', zlib.compress( filtered.tobytes(), compression )))
+        handle.write( _pngChunk( b'IEND', b'' ))
+    return filename
+
+def write_raw( array, filename, flip=False ):
+    """Write array's bytes (no header) to filename"""
+    import numpy
+    array = numpy.asarray( array )
+    if flip:
+        array = array[::-1]
+    with open( filename, 'wb' ) as handle:
+        handle.write( numpy.ascontiguousarray( array ).view( 'B' ))
+    return filename
+
+def write_npy( array, filename, flip=False ):
+    """Write array (with shape and dtype) in numpy's .npy format"""
+    import numpy
+    array = numpy.asarray( array )
+    if flip:
+        array = array[::-1]
+    numpy.save( filename, array )
+    return filename
+
+WRITERS = {
+    '.ppm': write_ppm,
+    '.pgm': write_ppm,
+    '.png': write_png,
+    '.raw': write_raw,
+    '.npy': write_npy,
+}
+
+def write_image( array, filename, **named ):
+    """Write array to filename in the format chosen by its extension
+
+    See WRITERS for the supported extensions, named arguments are passed
+    to the writer.
+    """
+    extension = os.path.splitext( filename )[1].lower()
+    try:
+        writer = WRITERS[extension]
+    except KeyError:
+        raise ValueError( 'No image writer for %r files, use one of %s'%(
+            extension, ', '.join( sorted( WRITERS )),
+        ))
+    return writer( array, filename, **named )
+
+def read_image( filename, flip=True ):
+    """Read a binary PPM/PGM or .npy image (e.g. a golden image)
+
+    flip -- if True, return PPM/PGM rows in GL (bottom-up) order, as
+        returned by HeadlessRenderer
+    """
+    import numpy
+    if os.path.splitext( filename )[1].lower() == '.npy':
+        return numpy.load( filename )
+    with open( filename, 'rb' ) as handle:
+        data = handle.read()
+    fields = []
+    offset = 0
+    while len( fields ) < 4:
+        while data[offset:offset+1].isspace():
+            offset += 1
+        if data[offset:offset+1] == b'#':
+            offset = data.index( b'\n', offset )
+            continue
+        end = offset
+        while not data[end:end+1].isspace():
+            end += 1
+        fields.append( data[offset:end] )
+        offset = end
+    kind, width, height, maxval = fields[0], int( fields[1] ), int( fields[2] ), int( fields[3] )
+    if kind not in (b'P5',b'P6'):
+        raise ValueError( 'Only binary PPM/PGM images are supported, not %r'%( kind, ))
+    components = 3 if kind == b'P6' else 1
+    dtype = 'B' if maxval < 256 else '>u2'
+    array = numpy.frombuffer(
+        data, dtype, width * height * components, offset + 1,
+    ).reshape( (height, width, components) )
+    if flip:
+        array = array[::-1]
+    return array
+
+def difference( frame, reference ):
+    """Largest absolute per-component difference between two images
+
+    Use to compare a rendered frame against a golden image with some
+    tolerance for rasterisation differences between drivers.
+    """
+    import numpy
+    frame, reference = numpy.asarray( frame ), numpy.asarray( reference )
+    if frame.shape != reference.shape:
+        frame = frame.reshape( reference.shape )
+    return int( numpy.abs( frame.astype( 'i4' ) - reference.astype( 'i4' )).max())
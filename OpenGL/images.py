@@ -33,6 +33,13 @@ Attributes of Note:
     RANK_PACKINGS -- commands required to set up default array-transfer 
         operations for an array of the specified rank.
 
+    PIXEL_STORE_PARAMETERS -- pixel-store (glPixelStorei) parameters 
+        whose per-context state is recorded when PIXEL_STORE_CACHE is set,
+        see pixelStore, syncPixelStore and invalidatePixelStore.  The 
+        OpenGL.GL glPixelStore* and glPopClientAttrib entry points keep 
+        the record current, the raw entry points (OpenGL.raw.GL, e.g. 
+        OpenGL.raw.GL.VERSION.GL_1_1.glPixelStorei) bypass it.
+
 New image formats and types will need to be registered here to be supported,
 this means that extension modules which add image types/formats need to alter 
 the tables described above!
@@ -41,11 +48,36 @@ the tables described above!
 
 """
 from OpenGL.raw.GL.VERSION import GL_1_1 as _simple
+from OpenGL.raw.GL.VERSION import GL_1_2 as _simple_1_2
+from OpenGL.raw.GL import _types
 from OpenGL import arrays
 from OpenGL import error
+from OpenGL import contextdata
 from OpenGL import _configflags
 import ctypes
 
+PIXEL_STORE_PARAMETERS = (
+    _simple.GL_PACK_SWAP_BYTES,
+    _simple.GL_PACK_LSB_FIRST,
+    _simple.GL_PACK_ROW_LENGTH,
+    _simple.GL_PACK_SKIP_ROWS,
+    _simple.GL_PACK_SKIP_PIXELS,
+    _simple.GL_PACK_ALIGNMENT,
+    _simple_1_2.GL_PACK_SKIP_IMAGES,
+    _simple_1_2.GL_PACK_IMAGE_HEIGHT,
+    _simple.GL_UNPACK_SWAP_BYTES,
+    _simple.GL_UNPACK_LSB_FIRST,
+    _simple.GL_UNPACK_ROW_LENGTH,
+    _simple.GL_UNPACK_SKIP_ROWS,
+    _simple.GL_UNPACK_SKIP_PIXELS,
+    _simple.GL_UNPACK_ALIGNMENT,
+    _simple_1_2.GL_UNPACK_SKIP_IMAGES,
+    _simple_1_2.GL_UNPACK_IMAGE_HEIGHT,
+)
+PIXEL_STORE_KEY = 'pixelstore'
+# recorded for parameters the GL rejects (e.g. byte-swapping on GLES)
+_UNSUPPORTED = object()
+
 def SetupPixelRead( format, dims, type):
     """Setup transfer mode for a read into a numpy array return the array
     
@@ -67,12 +99,10 @@ def setupDefaultTransferMode( ):
     seldom matters in image data).  These assumptions are normally correct 
     when dealing with Python libraries which expose byte-arrays.
     """
-    try:
-        _simple.glPixelStorei(_simple.GL_PACK_SWAP_BYTES, 0)
-        _simple.glPixelStorei(_simple.GL_PACK_LSB_FIRST, 0)
-    except error.GLError:
-        # GLES doesn't support pixel storage swapping...
-        pass
+    # GLES doesn't support pixel storage swapping, pixelStore ignores
+    # (and remembers) the error...
+    pixelStore(_simple.GL_PACK_SWAP_BYTES, 0)
+    pixelStore(_simple.GL_PACK_LSB_FIRST, 0)
         
 def rankPacking( rank ):
     """Set the pixel-transfer modes for a given image "rank" (# of dims)
@@ -80,11 +110,110 @@ def rankPacking( rank ):
     Uses RANK_PACKINGS table to issue calls to glPixelStorei
     """
     for func,which,arg in RANK_PACKINGS[rank]:
+        if func is _simple.glPixelStorei:
+            pixelStore(which,arg)
+            continue
         try:
             func(which,arg)
         except error.GLError:
             pass
 
+def _pixelStoreState( create=True ):
+    """Retrieve the pixel-store record for the current context"""
+    state = contextdata.getValue( PIXEL_STORE_KEY )
+    if state is None and create:
+        state = {}
+        contextdata.setValue( PIXEL_STORE_KEY, state )
+    return state
+
+def pixelStore( pname, value ):
+    """Set integer pixel-store parameter pname to value
+
+    With PIXEL_STORE_CACHE the values set are recorded per-context and
+    glPixelStorei is only called when the value differs from the one
+    recorded.  Parameters the GL rejects with a GLError are recorded as
+    unsupported and not retried for the context.
+
+    The record is only correct if the pixel-store state is changed
+    through OpenGL.GL (glPixelStorei, glPixelStoref, glPopClientAttrib),
+    changes made through OpenGL.raw.GL or other libraries must be
+    followed by syncPixelStore() or invalidatePixelStore().
+
+    returns True if glPixelStorei was called
+    """
+    if not _configflags.PIXEL_STORE_CACHE:
+        try:
+            _simple.glPixelStorei( pname, value )
+        except error.GLError:
+            return False
+        return True
+    state = _pixelStoreState()
+    current = state.get( pname )
+    if current is _UNSUPPORTED or current == value:
+        return False
+    try:
+        _simple.glPixelStorei( pname, value )
+    except error.GLError:
+        state[pname] = _UNSUPPORTED
+        return False
+    state[pname] = value
+    return True
+
+def recordPixelStore( pname, value ):
+    """Record that pixel-store parameter pname was set outside pixelStore
+
+    value -- the integer value set, or None if it is unknown (the next
+        pixelStore call for pname will then always be issued)
+    """
+    if not _configflags.PIXEL_STORE_CACHE:
+        return
+    try:
+        state = _pixelStoreState( value is not None )
+    except error.Error:
+        # no current context, nothing was set
+        return
+    if state is None:
+        return
+    if value is None:
+        state.pop( pname, None )
+    else:
+        state[pname] = value
+
+def invalidatePixelStore( context=None ):
+    """Forget the recorded pixel-store state for context (default current)
+
+    Use after code outside PyOpenGL has changed the pixel-store state.
+    returns False if nothing was recorded (or there is no context)
+    """
+    try:
+        return contextdata.delValue( PIXEL_STORE_KEY, context )
+    except error.Error:
+        # no current context, nothing recorded
+        return False
+
+def syncPixelStore( ):
+    """Re-read the current context's pixel-store state from the GL
+
+    Queries each of PIXEL_STORE_PARAMETERS with glGetIntegerv and
+    replaces the recorded state, returns {pname: value} for the
+    parameters the GL supports.
+    """
+    state = {}
+    value = _types.GLint()
+    for pname in PIXEL_STORE_PARAMETERS:
+        try:
+            _simple.glGetIntegerv( pname, value )
+        except error.GLError:
+            state[pname] = _UNSUPPORTED
+        else:
+            state[pname] = value.value
+    if _configflags.PIXEL_STORE_CACHE:
+        contextdata.setValue( PIXEL_STORE_KEY, state )
+    return dict([
+        (pname,value) for (pname,value) in state.items()
+        if value is not _UNSUPPORTED
+    ])
+
 def createTargetArray( format, dims, type ):
     """Create storage array for given parameters
     
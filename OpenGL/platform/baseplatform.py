@@ -3,7 +3,7 @@
 import ctypes
 from OpenGL.platform import ctypesloader
 from OpenGL._bytes import as_8_bit
-import sys, logging
+import sys, logging, re
 from OpenGL import _configflags
 from OpenGL import logs, MODULE_ANNOTATIONS
 log = logging.getLogger(__name__)
@@ -40,6 +40,29 @@ class _CheckContext( object ):
             raise error.NoContext( self.func.__name__, args, named )
         return self.func( *args, **named )
 
+class _TrackContext( _CheckContext ):
+    """Notifies contextdata after context make-current/destroy calls"""
+    def __init__( self, func, notify, index ):
+        self.func = func
+        self.notify = notify
+        self.index = index
+    def __setattr__( self, key, value ):
+        if key not in ('func','notify','index'):
+            return setattr( self.func, key, value )
+        else:
+            self.__dict__[key] = value 
+    def __getattr__( self, key ):
+        if key != 'func':
+            return getattr(self.func, key )
+        raise AttributeError( key )
+    def __call__( self, *args, **named ):
+        result = self.func( *args, **named )
+        if self.index is None:
+            self.notify()
+        elif self.index < len(args):
+            self.notify( args[self.index] )
+        return result
+
 def _find_module( exclude = (__name__,)):
     frame = sys._getframe()
     while frame and '__name__' in frame.f_globals:
@@ -73,6 +96,18 @@ class BasePlatform( object ):
         EXTENSIONS_USE_BASE_FUNCTIONS -- if True, uses regular
             dll attribute-based lookup to retrieve extension 
             function pointers.
+
+        CONTEXT_SWITCH_FUNCTIONS, CONTEXT_DESTROY_FUNCTIONS -- 
+            entry points after which OpenGL.contextdata is notified
+            that the current context changed or a context was 
+            destroyed, mapped to the index of the context argument 
+            (None where there is no such argument)
+
+        SCALAR_FAST_PATH_NAMES -- regular expression matching the
+            names of the GL entry points which are legal between 
+            glBegin/glEnd and so are eligible for the scalar fast path
+            (no errcheck) when they take only scalar arguments, see
+            OpenGL.SCALAR_FAST_PATH
     """
     
     EXPORTED_NAMES = [
@@ -90,6 +125,35 @@ class BasePlatform( object ):
     DEFAULT_FUNCTION_TYPE = None
     GLUT_GUARD_CALLBACKS = False
     EXTENSIONS_USE_BASE_FUNCTIONS = False
+    CONTEXT_SWITCH_FUNCTIONS = {
+        'glXMakeCurrent': 2,
+        'glXMakeContextCurrent': 3,
+        'glXMakeCurrentReadSGI': 3,
+        'eglMakeCurrent': 3,
+        'OSMesaMakeCurrent': 0,
+        'wglMakeCurrent': 1,
+        'CGLSetCurrentContext': 0,
+        'glutCreateWindow': None,
+        '__glutCreateWindowWithExit': None,
+        'glutCreateSubWindow': None,
+        'glutSetWindow': None,
+    }
+    CONTEXT_DESTROY_FUNCTIONS = {
+        'glXDestroyContext': 1,
+        'eglDestroyContext': 1,
+        'OSMesaDestroyContext': 0,
+        'wglDeleteContext': 0,
+        'CGLDestroyContext': 0,
+    }
+    # exact names only, e.g. glColorMask or glVertexAttribDivisor are
+    # scalar void functions but not legal between glBegin/glEnd
+    SCALAR_FAST_PATH_NAMES = re.compile(
+        r'^gl(?:'
+            r'(?:Vertex|Color|SecondaryColor|Index|Normal|TexCoord|MultiTexCoord|'
+            r'FogCoord|EvalCoord|VertexAttrib)[1-4]?(?:b|s|i|f|d|ub|us|ui)v?'
+            r'|EdgeFlag|Material[fi]|EvalPoint[12]|ArrayElement'
+        r')(?:ARB|EXT|NV)?$'
+    )
     
     def install( self, namespace ):
         """Install this platform instance into the platform module"""
@@ -105,10 +169,29 @@ class BasePlatform( object ):
         else:
             return self.DEFAULT_FUNCTION_TYPE
     
+    def isScalarFastPath( self, func, dll ):
+        """Is func a void, all-scalar immediate-mode GL entry point?
+
+        Such functions are installed without an errcheck, their errors
+        remain queued in the GL and are reported by the check on the
+        enclosing glEnd (or the next error-checked call).
+        """
+        if not _configflags.SCALAR_FAST_PATH or dll is not self.GL:
+            return False
+        if func.restype is not None:
+            return False
+        if not self.SCALAR_FAST_PATH_NAMES.match( func.__name__ ):
+            return False
+        for typ in func.argtypes or ():
+            if not (isinstance( typ, type ) and issubclass( typ, ctypes._SimpleCData )) or typ in (
+                ctypes.c_char_p, ctypes.c_wchar_p, ctypes.c_void_p,
+            ):
+                return False
+        return True
     def errorChecking( self, func, dll, error_checker=None ):
         """Add error checking to the function if appropriate"""
         from OpenGL import error
-        if error_checker and _configflags.ERROR_CHECKING:
+        if error_checker and _configflags.ERROR_CHECKING and not self.isScalarFastPath( func, dll ):
             #GLUT spec says error-checking is basically undefined...
             # there *may* be GL errors on GLUT calls that e.g. render 
             # geometry, but that's all basically "maybe" stuff...
@@ -123,6 +206,21 @@ class BasePlatform( object ):
         ) and not func.__name__.startswith( 'glX' ):
             return _CheckContext( func, self.CurrentContextIsValid )
         return func 
+    def wrapContextTracking( self, func ):
+        """Wrap context make-current/destroy functions to notify contextdata"""
+        from OpenGL import contextdata
+        name = func.__name__
+        if name in self.CONTEXT_SWITCH_FUNCTIONS:
+            return _TrackContext( 
+                func, contextdata.contextChanged, 
+                self.CONTEXT_SWITCH_FUNCTIONS[name],
+            )
+        elif name in self.CONTEXT_DESTROY_FUNCTIONS:
+            return _TrackContext( 
+                func, contextdata.contextDestroyed, 
+                self.CONTEXT_DESTROY_FUNCTIONS[name],
+            )
+        return func
     def wrapLogging( self, func ):
         """Wrap function with logging operations if appropriate"""
         return logs.logOnFail( func, logs.getLog( 'OpenGL.errors' ))
@@ -156,7 +254,13 @@ class BasePlatform( object ):
             
         if force_extension or ((not is_core) and (not self.EXTENSIONS_USE_BASE_FUNCTIONS)):
             # what about the VERSION values???
+            from OpenGL import probecache
+            cache = probecache.currentCache()
+            if cache is not None and cache.entryPoint( functionName ) is False:
+                raise AttributeError( """Extension %r available, but no pointer for function %r (cached)"""%(extension,functionName))
             pointer = self.getExtensionProcedure( as_8_bit(functionName) )
+            if cache is not None:
+                cache.setEntryPoint( functionName, pointer )
             if pointer:
                 func = self.functionTypeFor( dll )(
                     resultType,
@@ -182,9 +286,11 @@ class BasePlatform( object ):
         func.extension = extension
         func.deprecated = deprecated
         func = self.wrapLogging( 
-            self.wrapContextCheck(
-                self.errorChecking( func, dll, error_checker=error_checker ),
-                dll,
+            self.wrapContextTracking(
+                self.wrapContextCheck(
+                    self.errorChecking( func, dll, error_checker=error_checker ),
+                    dll,
+                )
             )
         )
         if MODULE_ANNOTATIONS:
@@ -322,16 +428,22 @@ class BasePlatform( object ):
         error_checker = None,
         force_extension = False,
     ):
-        """Construct a "null" function pointer"""
+        """Construct a "null" function pointer
+
+        Null function pointers share a single class (per deprecation
+        state), a per-function sub-class is only created when the
+        pointer is resolved (see _NullFunctionPointer.load) or when
+        MODULE_ANNOTATIONS are requested.
+        """
         if deprecated:
-            base = _DeprecatedFunctionPointer
+            cls = _DeprecatedFunctionPointer
         else:
-            base = _NullFunctionPointer
-        cls = type( functionName, (base,), {
-            '__doc__': doc,
-            'deprecated': deprecated,
-        } )
+            cls = _NullFunctionPointer
         if MODULE_ANNOTATIONS:
+            cls = type( functionName, (cls,), {
+                '__doc__': doc,
+                'deprecated': deprecated,
+            } )
             if not module:
                 module = _find_module( )
             if module:
@@ -359,6 +471,11 @@ class BasePlatform( object ):
 
 class _NullFunctionPointer( object ):
     """Function-pointer-like object for undefined functions"""
+    def __repr__( self ):
+        return '<%s %s>'%( 
+            'resolved function' if self.resolved else 'null function',
+            self.__name__,
+        )
     def __init__( 
         self, name, dll, resultType, argTypes, argNames, 
         extension=None, doc=None, deprecated=False,
@@ -366,6 +483,7 @@ class _NullFunctionPointer( object ):
     ):
         from OpenGL import error
         self.__name__ = name
+        self.__doc__ = doc
         self.DLL = dll
         self.argNames = argNames
         self.argtypes = argTypes
@@ -405,7 +523,14 @@ class _NullFunctionPointer( object ):
         except AttributeError as err:
             return None 
         else:
-            # now short-circuit so that we don't need to check again...
+            # now short-circuit so that we don't need to check again,
+            # special-method lookup is per-class, so specialise the class
+            # of this (shared-class) pointer now that it is resolved...
+            if self.__class__ in (_NullFunctionPointer, _DeprecatedFunctionPointer):
+                self.__class__ = type( self.__name__, (self.__class__,), {
+                    '__doc__': self.doc,
+                    '__module__': self.__class__.__module__,
+                } )
             self.__class__.__call__ = staticmethod( func.__call__ )
             self.resolved = True
             return func
@@ -0,0 +1,186 @@
+"""Persistent on-disk cache of driver probing results
+
+Every process normally re-probes the driver: the GL version and
+extension strings are pulled and parsed, and extension entry points
+are looked up one at a time via the platform's GetProcAddress.  For
+short-lived processes (render workers, headless tools) that probing
+is a measurable part of start-up.
+
+When OpenGL.PROBE_CACHE is True the results are stored on disk, keyed
+on the driver identity (vendor, renderer, version string and GL
+library path, size and modification time).  A later process with the
+same driver reads the extension set and version in one go and skips
+the per-function lookups for entry points already known to be missing.
+A driver update changes the key, so stale results are never used.
+
+The cache directory defaults to $XDG_CACHE_HOME/pyopengl/probes and
+can be set with the PYOPENGL_PROBE_CACHE_DIR environment variable.
+"""
+import os, json, hashlib, logging, atexit, tempfile
+from OpenGL import _configflags
+from OpenGL._bytes import as_8_bit
+_log = logging.getLogger( 'OpenGL.probecache' )
+
+CACHE_FORMAT = 1
+ALL_CACHES = []
+
+def cacheDirectory( name='probes', variable='PYOPENGL_PROBE_CACHE_DIR' ):
+    """Retrieve the directory in which cache files are stored
+
+    name -- sub-directory of $XDG_CACHE_HOME/pyopengl to use
+    variable -- environment variable which overrides the directory
+    """
+    directory = os.environ.get( variable )
+    if not directory:
+        base = os.environ.get( 'XDG_CACHE_HOME' ) or os.path.join(
+            os.path.expanduser( '~' ), '.cache'
+        )
+        directory = os.path.join( base, 'pyopengl', name )
+    return directory
+
+def _text( value ):
+    """Decode a glGetString result for storage"""
+    if isinstance( value, bytes ):
+        return value.decode( 'latin-1' )
+    return value
+
+def driverKey( ):
+    """Produce the identity of the driver behind the current context
+
+    returns a dictionary of vendor, renderer, version and library
+    details, or None if there is no valid context
+    """
+    from OpenGL import platform
+    if not platform.PLATFORM.CurrentContextIsValid():
+        return None
+    from OpenGL.raw.GL.VERSION.GL_1_1 import (
+        glGetString, GL_VENDOR, GL_RENDERER, GL_VERSION,
+    )
+    library = getattr( platform.PLATFORM.GL, '_name', None )
+    key = {
+        'vendor': _text( glGetString( GL_VENDOR )),
+        'renderer': _text( glGetString( GL_RENDERER )),
+        'version': _text( glGetString( GL_VERSION )),
+        'library': library,
+        'platform': platform.PLATFORM.__class__.__name__,
+    }
+    if library and os.path.isfile( library ):
+        stat = os.stat( library )
+        key['library_stat'] = [ stat.st_size, int( stat.st_mtime ) ]
+    return key
+
+class ProbeCache( object ):
+    """On-disk record of probing results for a single driver
+
+    Attributes:
+
+        key -- driver identity (see driverKey)
+        filename -- file in which the results are stored
+        version, version_string -- result of GL version probing
+        extensions -- list of available extension names (bytes)
+        entryPoints -- {functionName: bool} entry point resolution
+    """
+    def __init__( self, key, directory=None ):
+        self.key = key
+        digest = hashlib.sha1(
+            json.dumps( key, sort_keys=True ).encode( 'utf-8' )
+        ).hexdigest()
+        self.filename = os.path.join(
+            directory or cacheDirectory(), '%s.json'%( digest, )
+        )
+        self.version = self.version_string = self.extensions = None
+        self.entryPoints = {}
+        self.dirty = False
+        self.load()
+    def load( self ):
+        """Load previously stored results, discarding stale or corrupt files"""
+        try:
+            with open( self.filename, 'r' ) as handle:
+                stored = json.load( handle )
+        except (IOError, OSError, ValueError):
+            return False
+        if stored.get( 'format' ) != CACHE_FORMAT or stored.get( 'key' ) != self.key:
+            _log.info( 'Discarding stale probe cache %s', self.filename )
+            return False
+        self.version = stored.get( 'version' )
+        version_string = stored.get( 'version_string' )
+        self.version_string = as_8_bit( version_string ) if version_string else None
+        extensions = stored.get( 'extensions' )
+        if extensions is not None:
+            self.extensions = [ as_8_bit( name ) for name in extensions ]
+        self.entryPoints = dict( stored.get( 'entryPoints', {} ))
+        return True
+    def save( self ):
+        """Write results to disk if they have changed (atomically)"""
+        if not self.dirty:
+            return False
+        directory = os.path.dirname( self.filename )
+        try:
+            if not os.path.isdir( directory ):
+                os.makedirs( directory )
+            handle, temporary = tempfile.mkstemp( dir=directory, suffix='.tmp' )
+            with os.fdopen( handle, 'w' ) as output:
+                json.dump( {
+                    'format': CACHE_FORMAT,
+                    'key': self.key,
+                    'version': self.version,
+                    'version_string': _text( self.version_string ),
+                    'extensions': self.extensions and [
+                        _text( name ) for name in self.extensions
+                    ],
+                    'entryPoints': self.entryPoints,
+                }, output, sort_keys=True )
+            os.replace( temporary, self.filename )
+        except (IOError, OSError) as err:
+            _log.warning( 'Unable to write probe cache %s: %s', self.filename, err )
+            return False
+        self.dirty = False
+        return True
+    def setVersion( self, version_string, version ):
+        """Record the result of GL version probing"""
+        if version and (version, version_string) != (self.version, self.version_string):
+            self.version, self.version_string = list( version ), version_string
+            self.dirty = True
+    def setExtensions( self, extensions ):
+        """Record the set of available extensions"""
+        if extensions and extensions != self.extensions:
+            self.extensions = list( extensions )
+            self.dirty = True
+    def entryPoint( self, name ):
+        """Is the named entry point resolvable (None if not yet probed)"""
+        return self.entryPoints.get( name )
+    def setEntryPoint( self, name, available ):
+        """Record the result of resolving the named entry point"""
+        available = bool( available )
+        if self.entryPoints.get( name ) is not available:
+            self.entryPoints[name] = available
+            self.dirty = True
+
+def currentCache( ):
+    """Retrieve the ProbeCache for the current context
+
+    returns None if PROBE_CACHE is disabled or there is no valid context
+    """
+    if not _configflags.PROBE_CACHE:
+        return None
+    from OpenGL import platform, contextdata
+    context = platform.GetCurrentContext()
+    if not context:
+        return None
+    cache = contextdata.getValue( 'probecache', context=context )
+    if cache is None:
+        key = driverKey()
+        if key is None:
+            return None
+        cache = ProbeCache( key )
+        ALL_CACHES.append( cache )
+        contextdata.setValue( 'probecache', cache, context=context, weak=False )
+    return cache
+
+def saveAll( ):
+    """Write all modified caches to disk (registered with atexit)"""
+    for cache in ALL_CACHES:
+        cache.save()
+
+if _configflags.PROBE_CACHE:
+    atexit.register( saveAll )
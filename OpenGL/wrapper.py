@@ -2,9 +2,9 @@
 import ctypes, logging
 from OpenGL import platform, error
 assert platform
-from OpenGL._configflags import STORE_POINTERS, ERROR_ON_COPY, SIZE_1_ARRAY_UNPACK
+from OpenGL._configflags import STORE_POINTERS, ERROR_ON_COPY, SIZE_1_ARRAY_UNPACK, COMPILE_WRAPPERS
 from OpenGL import converters
-from OpenGL.converters import DefaultCConverter
+from OpenGL.converters import DefaultCConverter, getPyArgsName
 from OpenGL.converters import returnCArgument,returnPyArgument
 from OpenGL.latebind import LateBind
 from OpenGL.arrays import arrayhelpers, arraydatatype
@@ -405,6 +405,153 @@ class Wrapper( LateBind ):
             self.setFinalCall( callFunction )
             return callFunction
         #return self
+    def finaliseCallCompiled( self ):
+        """Generate a specialised Python call function for this wrapper
+
+        Pure-Python equivalent of the OpenGL_accelerate wrapper: rather than
+        driving generators over the converter lists on every call, we emit
+        the source for a function which performs each converter step as a
+        straight-line local assignment.  Default cConverters (which just
+        re-read a Python argument) become plain local references and the
+        pyArgs/cArgs/cArguments tuples are only built where something
+        actually consumes them.
+
+        Raises an exception if the function cannot be generated, in which
+        case the caller falls back to the wrapperCall closures.
+        """
+        pyConverters = getattr( self, 'pyConverters', None )
+        cConverters = getattr( self, 'cConverters', None )
+        cResolvers = getattr( self, 'cResolvers', None )
+        storeValues = getattr( self, 'storeValues', None )
+        returnValues = getattr( self, 'returnValues', None )
+        namespace = {
+            'self': self,
+            'wrappedOperation': self.wrappedOperation,
+            'storeValues': storeValues,
+            'returnValues': returnValues,
+            'NULL': NULL,
+            'ctypes': ctypes,
+            'error': error,
+        }
+        lines = [ 'def wrapperCall( *args ):' ]
+        add = lines.append
+        def inlined( converter ):
+            """Is converter a plain read of a known Python argument?"""
+            return (
+                pyConverters and
+                type( converter ) in (DefaultCConverter, getPyArgsName) and
+                isinstance( getattr( converter, 'index', None ), int ) and
+                0 <= converter.index < len( pyConverters )
+            )
+        needPyArgs = bool( storeValues or returnValues ) or any([
+            hasattr( converter, '__call__' ) and not inlined( converter )
+            for converter in (cConverters or ())
+        ])
+        if pyConverters:
+            pyConverters_length = len([p for p in pyConverters if not getattr( p, 'optional', False)])
+            namespace['pyConverterNames'] = self.pyConverterNames
+            add( '    if %d > len(args):'%( pyConverters_length, ))
+            add( '        raise ValueError(' )
+            add( '            """%s requires %r arguments (%s), received %s: %r"""%(' )
+            add( '                wrappedOperation.__name__, %d, ", ".join( pyConverterNames ), len(args), args'%( pyConverters_length, ))
+            add( '            )' )
+            add( '        )' )
+            pyNames = []
+            for index,converter in enumerate( pyConverters ):
+                name = 'py%d'%( index, )
+                pyNames.append( name )
+                if converter is None:
+                    add( '    %s = args[%d]'%( name, index ))
+                else:
+                    namespace[ 'pyConverter%d'%( index, ) ] = converter
+                    add( '    try:' )
+                    add( '        %s = pyConverter%d( args[%d], self, args )'%( name, index, index ))
+                    add( '    except IndexError as err:' )
+                    add( '        %s = NULL'%( name, ))
+                    add( '    except Exception as err:' )
+                    add( "        if hasattr( err, 'args' ):" )
+                    add( '            err.args += ( pyConverter%d, )'%( index, ))
+                    add( '        raise' )
+            pyArgs = '(%s)'%( ''.join( [ '%s,'%( name, ) for name in pyNames ] ), )
+            if needPyArgs:
+                add( '    pyArgs = %s'%( pyArgs, ))
+                pyArgs = 'pyArgs'
+        else:
+            pyNames = None
+            pyArgs = 'args'
+        if cConverters:
+            cNames = []
+            for index,converter in enumerate( cConverters ):
+                name = 'c%d'%( index, )
+                cNames.append( name )
+                if inlined( converter ):
+                    add( '    %s = %s'%( name, pyNames[converter.index] ))
+                elif hasattr( converter, '__call__' ):
+                    namespace[ 'cConverter%d'%( index, ) ] = converter
+                    add( '    try:' )
+                    add( '        %s = cConverter%d( %s, %d, self )'%( name, index, pyArgs, index ))
+                    add( '    except Exception as err:' )
+                    add( "        if hasattr( err, 'args' ):" )
+                    add( '            err.args += (' )
+                    add( '                """Failure in cConverter %%r"""%%( cConverter%d ),'%( index, ))
+                    add( '                %s, %d, self,'%( pyArgs, index ))
+                    add( '            )' )
+                    add( '        raise' )
+                else:
+                    namespace[ 'cConstant%d'%( index, ) ] = converter
+                    add( '    %s = cConstant%d'%( name, index ))
+            cArgs = '(%s)'%( ''.join( [ '%s,'%( name, ) for name in cNames ] ), )
+            if storeValues or returnValues:
+                add( '    cArgs = %s'%( cArgs, ))
+                cArgs = 'cArgs'
+        else:
+            cNames = pyNames
+            cArgs = pyArgs
+        if cResolvers:
+            if cNames is None:
+                # no converters at all, resolve straight from args
+                cNames = [ 'args[%d]'%( i, ) for i in range( len( cResolvers )) ]
+            argNames = []
+            for index,converter in enumerate( cResolvers ):
+                if converter is None:
+                    argNames.append( cNames[index] )
+                else:
+                    name = 'a%d'%( index, )
+                    argNames.append( name )
+                    namespace[ 'cResolver%d'%( index, ) ] = converter
+                    add( '    try:' )
+                    add( '        %s = cResolver%d( %s )'%( name, index, cNames[index] ))
+                    add( '    except Exception as err:' )
+                    add( '        err.args += ( cResolver%d, )'%( index, ))
+                    add( '        raise' )
+            callArgs = ', '.join( argNames )
+            cArguments = '(%s)'%( ''.join( [ '%s,'%( name, ) for name in argNames ] ), )
+        elif cNames is not None:
+            callArgs = ', '.join( cNames )
+            cArguments = cArgs
+        else:
+            callArgs = '*args'
+            cArguments = 'args'
+        add( '    try:' )
+        add( '        result = wrappedOperation( %s )'%( callArgs, ))
+        add( '    except ctypes.ArgumentError as err:' )
+        add( '        err.args = err.args + (%s,)'%( cArguments, ))
+        add( '        raise err' )
+        add( '    except error.GLError as err:' )
+        add( '        err.cArgs = %s'%( cArgs, ))
+        add( '        err.pyArgs = %s'%( pyArgs, ))
+        add( '        raise err' )
+        if storeValues:
+            add( '    storeValues( result, self, %s, %s )'%( pyArgs, cArgs ))
+        if returnValues:
+            add( '    return returnValues( result, self, %s, %s )'%( pyArgs, cArgs ))
+        else:
+            add( '    return result' )
+        source = '\n'.join( lines )
+        exec( compile( source, '<wrapper %s>'%( self.wrappedOperation.__name__, ), 'exec' ), namespace )
+        wrapperCall = namespace['wrapperCall']
+        wrapperCall.__doc__ = """Generated wrapper call for %s"""%( self.wrappedOperation.__name__, )
+        return wrapperCall
     def finaliseCall( self ):
         """Produce specialised versions of call for finalised wrapper object
 
@@ -506,6 +653,14 @@ class Wrapper( LateBind ):
                 storeValues=storeValues,
                 returnValues=returnValues,
             )
+        if COMPILE_WRAPPERS:
+            try:
+                return self.finaliseCallCompiled()
+            except Exception as err:
+                _log.info(
+                    """Unable to generate call function for %s, using generic wrapper: %s""",
+                    self, err,
+                )
         if pyConverters:
             if cConverters:
                 # create a map of index,converter, callable
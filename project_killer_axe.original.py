@@ -1,8 +1,23 @@
+import OpenGL
+# The game only needs the legacy GL 1.1 namespace, skip importing the
+# later GL versions at start-up.
+OpenGL.LAZY_GL_NAMESPACE = True
 from OpenGL.GL import *
 from OpenGL.GLUT import *
 from OpenGL.GLU import *
+import argparse
+import atexit
+import collections
+import contextlib
+import csv
+import functools
+import hashlib
+import json
+import numpy
 import random
 import math
+import os
+import sys
 import time
 
 # Constants
@@ -10,6 +25,19 @@ WIDTH, HEIGHT = 800, 600
 VILLAGER_RADIUS = 15
 STONE_RADIUS = 10
 FPS = 60
+BATCH_CAPACITY = 65536  # Initial number of points the render batch can hold
+SHAPE_CACHE_SIZE = 64  # Rasterized shapes kept before the least recently used is dropped
+TEXT_CACHE_SIZE = 32  # Laid-out strings kept before the least recently used is dropped
+GRID_CELL_SIZE = 64  # Side of a collision grid cell in pixels
+USE_ENTITY_STORE = True  # Keep villagers and stones in NumPy arrays, updated in bulk
+ENTITY_STORE_CAPACITY = 1024  # Initial number of rows of an entity store
+STONE_POOL_LIMIT = 512  # Retired stones kept around for reuse
+MAX_CATCH_UP_STEPS = 5  # Most simulation steps run for one timer callback
+RENDER_FPS = 60  # Redisplay rate, independent of the simulation rate
+TIMER_INTERVAL = 4  # Milliseconds between animate() callbacks
+TIMING_WINDOW = 120  # Frames and ticks kept for timing statistics
+FRAME_TIME_BUCKETS = (4, 8, 12, 16.7, 20, 25, 33.3, 50, 100)  # Histogram edges in milliseconds
+OVERLAY_REFRESH = 15  # Frames between profiler overlay updates
 STONE_THROW_DELAY = 3
 START_DELAY = 5
 VILLAGER_GENERATION_DELAY = 5
@@ -32,88 +60,658 @@ game_over = False
 final_score_message = ""
 paused = False
 
+# Simple point-based letter patterns
+LETTER_PATTERNS = {
+    'A': [(1,4), (0,3), (2,3), (0,2), (1,2), (2,2), (0,1), (2,1), (0,0), (2,0)],
+    'C': [(0,4), (1,4), (2,4), (0,3), (0,2), (0,1), (0,0), (1,0), (2,0)],
+    'E': [(0,4), (1,4), (2,4), (0,3), (0,2), (1,2), (2,2), (0,1), (0,0), (1,0), (2,0)],
+    'F': [(0,4), (1,4), (2,4), (0,3), (0,2), (1,2), (0,1), (0,0)],
+    'I': [(0,4), (1,4), (2,4), (1,3), (1,2), (1,1), (0,0), (1,0), (2,0)],
+    'L': [(0,4), (0,3), (0,2), (0,1), (0,0), (1,0), (2,0)],
+    'N': [(0,4), (0,3), (0,2), (0,1), (0,0), (1,3), (2,2), (2,4), (2,3), (2,2), (2,1), (2,0)],
+    'O': [(0,4), (1,4), (2,4), (0,3), (2,3), (0,2), (2,2), (0,1), (2,1), (0,0), (1,0), (2,0)],
+    'P': [(0,4), (1,4), (2,4), (0,3), (2,3), (0,2), (1,2), (2,2), (0,1), (0,0)],
+    'R': [(0,4), (1,4), (2,4), (0,3), (2,3), (0,2), (1,2), (0,1), (2,1), (0,0), (2,0)],
+    'S': [(0,4), (1,4), (2,4), (0,3), (0,2), (1,2), (2,2), (2,1), (0,0), (1,0), (2,0)],
+    'T': [(0,4), (1,4), (2,4), (1,3), (1,2), (1,1), (1,0)],
+    'U': [(0,4), (2,4), (0,3), (2,3), (0,2), (2,2), (0,1), (2,1), (0,0), (1,0), (2,0)],
+    'Y': [(0,4), (2,4), (0,3), (2,3), (1,2), (1,1), (1,0)],
+    'D': [(0,4), (1,4), (0,3), (2,3), (0,2), (2,2), (0,1), (2,1), (0,0), (1,0)],
+    'W': [(0,4), (2,4), (0,3), (2,3), (0,2), (2,2), (0,1), (1,1), (2,1), (0,0), (2,0)],
+    '.': [(1,0)],
+    ' ': []  # Space character
+}
+
+# Number patterns (flipped Y coordinates)
+NUMBER_PATTERNS = {
+    0: [(0,4), (1,4), (2,4), (0,3), (2,3), (0,2), (2,2), (0,1), (2,1), (0,0), (1,0), (2,0)],
+    1: [(1,4), (1,3), (1,2), (1,1), (1,0)],
+    2: [(0,4), (1,4), (2,4), (2,3), (0,2), (1,2), (2,2), (0,1), (0,0), (1,0), (2,0)],
+    3: [(0,4), (1,4), (2,4), (2,3), (1,2), (2,1), (0,0), (1,0), (2,0)],
+    4: [(0,4), (2,4), (0,3), (2,3), (0,2), (1,2), (2,2), (2,1), (2,0)],
+    5: [(0,4), (1,4), (2,4), (0,3), (0,2), (1,2), (2,2), (2,1), (0,0), (1,0), (2,0)],
+    6: [(0,4), (1,4), (2,4), (0,3), (0,2), (1,2), (2,2), (0,1), (2,1), (0,0), (1,0), (2,0)],
+    7: [(0,4), (1,4), (2,4), (2,3), (2,2), (1,1), (1,0)],
+    8: [(0,4), (1,4), (2,4), (0,3), (2,3), (1,2), (0,1), (2,1), (0,0), (1,0), (2,0)],
+    9: [(0,4), (1,4), (2,4), (0,3), (2,3), (0,2), (1,2), (2,2), (2,1), (0,0), (1,0), (2,0)]
+}
+
+class RenderBatch:
+    """Collects every plotted point of a frame and draws them with one call
+
+    Points and their colors are written into preallocated NumPy buffers
+    instead of going through glVertex2i one pixel at a time, then flushed
+    once per frame with glVertexPointer/glColorPointer/glDrawArrays.
+    """
+    def __init__(self, capacity=BATCH_CAPACITY):
+        self.vertices = numpy.zeros((capacity, 2), dtype=numpy.int32)
+        self.colors = numpy.zeros((capacity, 3), dtype=numpy.float32)
+        self.count = 0
+        self.color = (1.0, 1.0, 1.0)
+
+    def set_color(self, r, g, b):
+        self.color = (r, g, b)
+
+    def reserve(self, extra):
+        # Grow the buffers (doubling) so that `extra` more points fit
+        needed = self.count + extra
+        capacity = len(self.vertices)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        vertices = numpy.zeros((capacity, 2), dtype=numpy.int32)
+        colors = numpy.zeros((capacity, 3), dtype=numpy.float32)
+        vertices[:self.count] = self.vertices[:self.count]
+        colors[:self.count] = self.colors[:self.count]
+        self.vertices = vertices
+        self.colors = colors
+
+    def add_point(self, x, y):
+        if self.count >= len(self.vertices):
+            self.reserve(1)
+        n = self.count
+        self.vertices[n] = (x, y)
+        self.colors[n] = self.color
+        self.count = n + 1
+
+    def add_points(self, points):
+        # points is an (N, 2) integer array of x, y pairs
+        n = len(points)
+        if not n:
+            return
+        self.reserve(n)
+        start = self.count
+        self.vertices[start:start + n] = points
+        self.colors[start:start + n] = self.color
+        self.count = start + n
+
+    def add_sprite(self, sprite, x, y):
+        # Stamp a cached (offsets, colors) shape with its origin at (x, y)
+        offsets, colors = sprite
+        n = len(offsets)
+        self.reserve(n)
+        start = self.count
+        self.vertices[start:start + n] = offsets + (x, y)
+        self.colors[start:start + n] = colors
+        self.count = start + n
+
+    def add_sprite_many(self, sprite, positions):
+        # Stamp the same shape once for every (x, y) row of positions
+        offsets, colors = sprite
+        points = (positions[:, None, :] + offsets[None, :, :]).reshape(-1, 2)
+        n = len(points)
+        self.reserve(n)
+        start = self.count
+        self.vertices[start:start + n] = points
+        self.colors[start:start + n] = numpy.tile(colors, (len(positions), 1))
+        self.count = start + n
+
+    def snapshot(self):
+        # Copy of the collected points and colors, used to build sprites
+        return self.vertices[:self.count].copy(), self.colors[:self.count].copy()
+
+    def flush(self):
+        # Draw everything collected so far and start a new batch
+        if self.count:
+            profiler.count('points', self.count)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(2, GL_INT, 0, self.vertices)
+            glColorPointer(3, GL_FLOAT, 0, self.colors)
+            glDrawArrays(GL_POINTS, 0, self.count)
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+        self.count = 0
+
+class ShapeCache:
+    """LRU cache of rasterized shapes stored as point offsets from their origin
+
+    Shapes are keyed on whatever makes them differ (kind, facing, animation
+    phase), rasterized once into a small RenderBatch and then stamped at the
+    entity position every frame.
+    """
+    def __init__(self, max_entries=SHAPE_CACHE_SIZE):
+        self.entries = collections.OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, rasterize):
+        sprite = self.entries.get(key)
+        if sprite is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return sprite
+        self.misses += 1
+        recorder = RenderBatch(capacity=256)
+        rasterize(recorder)
+        sprite = recorder.snapshot()
+        self.entries[key] = sprite
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return sprite
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+class SpatialGrid:
+    """Uniform grid over the playfield used as a collision broad phase
+
+    Entities are bucketed by the cells their bounding box overlaps, so a
+    query only looks at entities near the queried box instead of all of them.
+    """
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> set of entities
+        self.entity_cells = {}  # entity -> (first column, first row, last column, last row)
+
+    def __len__(self):
+        return len(self.entity_cells)
+
+    def __iter__(self):
+        return iter(list(self.entity_cells))
+
+    def cell_range(self, bounds):
+        min_x, min_y, max_x, max_y = bounds
+        size = self.cell_size
+        return (int(min_x // size), int(min_y // size), int(max_x // size), int(max_y // size))
+
+    def insert(self, entity, bounds):
+        cell_range = self.cell_range(bounds)
+        self.entity_cells[entity] = cell_range
+        first_col, first_row, last_col, last_row = cell_range
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                self.cells.setdefault((col, row), set()).add(entity)
+
+    def remove(self, entity):
+        cell_range = self.entity_cells.pop(entity, None)
+        if cell_range is None:
+            return
+        first_col, first_row, last_col, last_row = cell_range
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                cell = self.cells.get((col, row))
+                if cell is not None:
+                    cell.discard(entity)
+                    if not cell:
+                        del self.cells[(col, row)]
+
+    def move(self, entity, bounds):
+        # Only re-bucket when the entity crossed into different cells
+        if self.entity_cells.get(entity) == self.cell_range(bounds):
+            return
+        self.remove(entity)
+        self.insert(entity, bounds)
+
+    def query(self, bounds):
+        found = set()
+        first_col, first_row, last_col, last_row = self.cell_range(bounds)
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                cell = self.cells.get((col, row))
+                if cell:
+                    found.update(cell)
+        return found
+
+    def clear(self):
+        self.cells.clear()
+        self.entity_cells.clear()
+
+class EntityStore:
+    """Structure-of-arrays storage for many entities of one kind
+
+    Every field lives in its own NumPy array so that moves, timers and
+    collision tests run over whole columns at once; entity objects are thin
+    views that only remember their row.  Rows are kept dense: removing a
+    row moves the last row into its place.
+    """
+    def __init__(self, fields, capacity=ENTITY_STORE_CAPACITY):
+        self.arrays = {name: numpy.zeros(capacity, dtype=dtype) for name, dtype in fields}
+        self.views = []  # Row i is viewed by views[i]
+
+    def __len__(self):
+        return len(self.views)
+
+    def column(self, name):
+        # Writable view of the rows in use
+        return self.arrays[name][:len(self.views)]
+
+    def add(self, view):
+        row = len(self.views)
+        capacity = len(self.arrays[next(iter(self.arrays))])
+        if row >= capacity:
+            for name, array in self.arrays.items():
+                grown = numpy.zeros(capacity * 2, dtype=array.dtype)
+                grown[:row] = array[:row]
+                self.arrays[name] = grown
+        view.index = row
+        self.views.append(view)
+
+    def remove(self, view):
+        row = view.index
+        last = len(self.views) - 1
+        if row != last:
+            for array in self.arrays.values():
+                array[row] = array[last]
+            moved = self.views[last]
+            moved.index = row
+            self.views[row] = moved
+        self.views.pop()
+        view.index = None
+
+    def remove_rows(self, mask):
+        # Highest rows first so the rows still to remove don't move
+        removed = []
+        for row in numpy.flatnonzero(mask)[::-1]:
+            view = self.views[row]
+            self.remove(view)
+            removed.append(view)
+        return removed
+
+    def clear(self):
+        # In place, as the game lists alias self.views
+        for view in self.views:
+            view.index = None
+        self.views.clear()
+
+class StoredField:
+    """Entity attribute kept in a column of the class's EntityStore"""
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return view.store.arrays[self.name].item(view.index)
+
+    def __set__(self, view, value):
+        view.store.arrays[self.name][view.index] = value
+
+class StaticLayer:
+    """Part of the screen kept in a display list until its state changes
+
+    draw() fills the render batch as usual; the batch is compiled into the
+    list the first time and whenever the key passed to render() changes,
+    otherwise the frame just replays the list with one glCallList.
+    """
+    def __init__(self, draw):
+        self.draw = draw
+        self.key = None
+        self.list_id = None
+        self.rebuilds = 0
+
+    def render(self, key):
+        batch.flush()  # Whatever was batched so far goes underneath
+        if self.list_id is None or key != self.key:
+            if self.list_id is None:
+                self.list_id = glGenLists(1)
+            # Client-side arrays are copied into the list when it is compiled
+            glNewList(self.list_id, GL_COMPILE)
+            self.draw()
+            batch.flush()
+            glEndList()
+            self.key = key
+            self.rebuilds += 1
+            profiler.count('layer_rebuilds')
+        glCallList(self.list_id)
+
+    def release(self):
+        if self.list_id is not None:
+            glDeleteLists(self.list_id, 1)
+            self.list_id = None
+            self.key = None
+
+class PhaseTimer:
+    """Context manager adding the time spent inside it to one profiler phase"""
+    __slots__ = ('totals', 'name', 'started')
+
+    def __init__(self, totals, name):
+        self.totals = totals
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.totals[self.name] = self.totals.get(self.name, 0.0) + time.perf_counter() - self.started
+
+class Profiler:
+    """Per-frame phase timings and counters, cheap enough to leave enabled
+
+    Turned on with KILLER_AXE_PROFILE=1, or KILLER_AXE_PROFILE=overlay to
+    also show the numbers on screen; KILLER_AXE_PROFILE_EXPORT=path.json
+    (or .csv) writes the recorded frames out at exit.
+    """
+    def __init__(self, mode=''):
+        self.enabled = mode not in ('', '0')
+        self.overlay = mode == 'overlay'
+        self.frames = collections.deque(maxlen=TIMING_WINDOW)
+        self.totals = {}  # Phase seconds and counters of the frame in progress
+        self.timers = {}
+        self.null_timer = contextlib.nullcontext()
+        self.last_frame_end = None
+        self.overlay_lines = []
+
+    def phase(self, name):
+        if not self.enabled:
+            return self.null_timer
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = PhaseTimer(self.totals, name)
+        return timer
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.totals[name] = self.totals.get(name, 0) + amount
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        frame = dict(self.totals)
+        if self.last_frame_end is not None:
+            frame['frame'] = now - self.last_frame_end
+        self.last_frame_end = now
+        self.frames.append(frame)
+        self.totals.clear()
+        if self.overlay and len(self.frames) % OVERLAY_REFRESH == 0:
+            self.overlay_lines = self.format_overlay()
+
+    def histogram(self):
+        # Frame counts per FRAME_TIME_BUCKETS edge, the last bucket catching the rest
+        counts = [0] * (len(FRAME_TIME_BUCKETS) + 1)
+        for frame in self.frames:
+            if 'frame' in frame:
+                milliseconds = 1000 * frame['frame']
+                bucket = 0
+                while bucket < len(FRAME_TIME_BUCKETS) and milliseconds > FRAME_TIME_BUCKETS[bucket]:
+                    bucket += 1
+                counts[bucket] += 1
+        return counts
+
+    def summary(self):
+        # Average of every phase and counter over the recorded frames
+        averages = {}
+        for frame in self.frames:
+            for name, value in frame.items():
+                averages[name] = averages.get(name, 0) + value
+        for name in averages:
+            averages[name] /= len(self.frames)
+        return {'frames': len(self.frames), 'average': averages, 'histogram': self.histogram(), 'buckets_ms': FRAME_TIME_BUCKETS}
+
+    def format_overlay(self):
+        average = self.summary()['average']
+        frame_time = average.get('frame', 0.0)
+        return [
+            "FPS: %d" % (1.0 / frame_time if frame_time else 0),
+            "UPDATE: %.1f" % (1000 * average.get('update', 0.0)),
+            "DRAW: %.1f" % (1000 * average.get('draw', 0.0)),
+            "POINTS: %d" % average.get('points', 0),
+            "CALLS: %d" % average.get('gl_calls', 0),
+        ]
+
+    def draw_overlay(self):
+        batch.set_color(1.0, 1.0, 0.0)
+        for row, line in enumerate(self.overlay_lines):
+            draw_text(10, 10 + row * 10, line, 1)
+
+    def export(self, path):
+        if path.endswith('.csv'):
+            names = sorted({name for frame in self.frames for name in frame})
+            with open(path, 'w', newline='') as handle:
+                writer = csv.DictWriter(handle, fieldnames=names, restval=0)
+                writer.writeheader()
+                writer.writerows(self.frames)
+        else:
+            with open(path, 'w') as handle:
+                json.dump({'summary': self.summary(), 'frames': list(self.frames)}, handle, indent=2)
+
+class SimulationClock:
+    """Fixed-timestep clock that keeps game speed independent of rendering
+
+    Real elapsed time goes into an accumulator that is drained in steps of
+    exactly dt.  When rendering falls behind, up to max_steps steps run in
+    one go and the rest of the backlog is dropped; what is left over gives
+    the interpolation factor for drawing between two steps.
+    """
+    def __init__(self, dt=1.0 / FPS, max_steps=MAX_CATCH_UP_STEPS, render_fps=RENDER_FPS, timer=time.perf_counter):
+        self.dt = dt
+        self.max_steps = max_steps
+        self.render_interval = 1.0 / render_fps
+        self.timer = timer
+        self.reset()
+
+    def reset(self):
+        self.sim_time = 0.0  # Seconds of simulated game time
+        self.ticks = 0
+        self.accumulator = 0.0
+        self.dropped_time = 0.0
+        self.last_time = None
+        self.last_render = None
+        self.next_render = 0.0
+        self.tick_times = collections.deque(maxlen=TIMING_WINDOW)
+        self.frame_intervals = collections.deque(maxlen=TIMING_WINDOW)
+
+    @property
+    def alpha(self):
+        # How far between the last and the next step we are, for interpolation
+        return min(self.accumulator / self.dt, 1.0)
+
+    def advance(self):
+        # Number of fixed steps due since the previous call
+        now = self.timer()
+        if self.last_time is None:
+            self.last_time = now
+            return 0
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        steps = int(self.accumulator / self.dt)
+        # Only whole steps are dropped: the fraction left over keeps alpha,
+        # so drawing doesn't jump back a step
+        self.accumulator -= steps * self.dt
+        if steps > self.max_steps:
+            self.dropped_time += (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+        return steps
+
+    def hold(self):
+        # While paused, real time passes without building up a backlog; the
+        # accumulator (and so alpha) is kept so paused frames draw where the
+        # last running frame did
+        self.last_time = None
+
+    def step(self, simulate):
+        started = self.timer()
+        simulate()
+        self.tick_times.append(self.timer() - started)
+        self.sim_time += self.dt
+        self.ticks += 1
+
+    def render_due(self):
+        # Frames are scheduled on a fixed grid so timer jitter doesn't lower the rate
+        now = self.timer()
+        if self.last_render is not None:
+            if now < self.next_render:
+                return False
+            self.frame_intervals.append(now - self.last_render)
+            self.next_render += self.render_interval
+            if self.next_render < now:
+                self.next_render = now + self.render_interval  # Fell behind, don't burst
+        else:
+            self.next_render = now + self.render_interval
+        self.last_render = now
+        return True
+
+    def stats(self):
+        tick_times = self.tick_times
+        frame_intervals = self.frame_intervals
+        frame_average = sum(frame_intervals) / len(frame_intervals) if frame_intervals else 0.0
+        return {
+            'ticks': self.ticks,
+            'sim_time': self.sim_time,
+            'dropped_time': self.dropped_time,
+            'tick_ms': 1000 * sum(tick_times) / len(tick_times) if tick_times else 0.0,
+            'max_tick_ms': 1000 * max(tick_times) if tick_times else 0.0,
+            'frame_ms': 1000 * frame_average,
+            'fps': 1.0 / frame_average if frame_average else 0.0,
+        }
+
+def count_gl_calls(namespace, profiler):
+    # Count 'gl_calls' where they happen: every gl*/glu* entry point in
+    # namespace is replaced by a wrapper counting its calls (only when
+    # profiling); glut* window-system calls are not GL calls and are skipped
+    def counted(function):
+        @functools.wraps(function)
+        def call(*args, **named):
+            profiler.count('gl_calls')
+            return function(*args, **named)
+        return call
+    for name, value in list(namespace.items()):
+        if (name.startswith('gl') and not name.startswith('glut')
+                and callable(value) and not isinstance(value, type)):
+            namespace[name] = counted(value)
+
+profiler = Profiler(os.environ.get('KILLER_AXE_PROFILE', ''))
+if profiler.enabled:
+    count_gl_calls(globals(), profiler)
+batch = RenderBatch()
+shape_cache = ShapeCache()
+text_cache = ShapeCache(TEXT_CACHE_SIZE)
+villager_grid = SpatialGrid()  # Live villagers only
+stone_grid = SpatialGrid()
+clock = SimulationClock()
+rng = random.Random()  # All gameplay randomness, seeded for replays
+session_recorder = None  # InputRecorder while a session is being recorded
+villager_store = EntityStore([
+    ('x', numpy.int64), ('y', numpy.int64),
+    ('alive', numpy.bool_), ('last_throw_time', numpy.float64),
+])
+stone_store = EntityStore([
+    ('x', numpy.float64), ('y', numpy.float64),
+    ('dx', numpy.float64), ('dy', numpy.float64),
+])
+
 class Villager:
+    # Body dimensions
+    head_radius = 10
+    body_length = 25
+    limb_length = 15
+    animation_speed = 0.1
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.alive = True
-        self.last_throw_time = time.time()
-        # Body dimensions
-        self.head_radius = 10
-        self.body_length = 25
-        self.limb_length = 15
+        self.last_throw_time = clock.sim_time
         self.animation_offset = 0
-        self.animation_speed = 0.1
 
     def draw(self):
         if self.alive:
             # Animate limbs for walking effect
             self.animation_offset = math.sin(time.time() * self.animation_speed) * 5
 
-            # Draw head with skin color
-            midpoint_circle(self.x, self.y + self.head_radius, self.head_radius, (0.9, 0.7, 0.5))
-            
-            # Draw facial features
-            glColor3f(0.0, 0.0, 0.0)  # Black for features
-            glBegin(GL_POINTS)
-            # Eyes
-            plot_point(self.x - 3, self.y + self.head_radius + 2)
-            plot_point(self.x + 3, self.y + self.head_radius + 2)
-            # Mouth
-            for x in range(-2, 3):
-                plot_point(self.x + x, self.y + self.head_radius - 3)
-            glEnd()
-
-            # Draw body with shirt color
-            glColor3f(0.2, 0.4, 0.8)  # Blue shirt
-            glBegin(GL_POINTS)
-            
-            # Draw body using midpoint line (thicker)
-            body_points = midpoint_line(self.x, self.y, self.x, self.y - self.body_length)
-            for px, py in body_points:
-                plot_point(px, py)
-                plot_point(px + 1, py)  # Make body thicker
-                plot_point(px - 1, py)
-
-            # Draw legs with animation and pants color
-            leg_start_y = self.y - self.body_length
-            glColor3f(0.3, 0.2, 0.1)  # Brown pants
-            # Left leg
-            left_leg_end_x = self.x - self.limb_length * 0.7 + self.animation_offset * 0.3
-            left_leg_end_y = leg_start_y - self.limb_length * 0.7
-            leg_points = midpoint_line(self.x, leg_start_y, int(left_leg_end_x), int(left_leg_end_y))
-            for px, py in leg_points:
-                plot_point(px, py)
-                plot_point(px + 1, py)  # Make legs thicker
-
-            # Right leg
-            right_leg_end_x = self.x + self.limb_length * 0.7 - self.animation_offset * 0.3
-            right_leg_end_y = leg_start_y - self.limb_length * 0.7
-            leg_points = midpoint_line(self.x, leg_start_y, int(right_leg_end_x), int(right_leg_end_y))
-            for px, py in leg_points:
-                plot_point(px, py)
-                plot_point(px - 1, py)  # Make legs thicker
-
-            # Draw arms with animation and skin color
-            arm_start_y = self.y - self.body_length // 3
-            glColor3f(0.9, 0.7, 0.5)  # Skin color for arms
-            # Left arm
-            left_arm_end_x = self.x - self.limb_length * 0.7 - self.animation_offset * 0.2
-            left_arm_end_y = arm_start_y + self.limb_length * 0.3
-            arm_points = midpoint_line(self.x, arm_start_y, int(left_arm_end_x), int(left_arm_end_y))
-            for px, py in arm_points:
-                plot_point(px, py)
-                plot_point(px + 1, py)  # Make arms thicker
-
-            # Right arm
-            right_arm_end_x = self.x + self.limb_length * 0.7 + self.animation_offset * 0.2
-            right_arm_end_y = arm_start_y + self.limb_length * 0.3
-            arm_points = midpoint_line(self.x, arm_start_y, int(right_arm_end_x), int(right_arm_end_y))
-            for px, py in arm_points:
-                plot_point(px, py)
-                plot_point(px - 1, py)  # Make arms thicker
-
-            glEnd()
+            # Limbs only move a few pixels, so whole-pixel phases are enough
+            phase = round(self.animation_offset)
+            sprite = shape_cache.get(('villager', phase), lambda target: self.rasterize(target, phase))
+            batch.add_sprite(sprite, self.x, self.y)
+
+    def rasterize(self, target, animation_offset):
+        # Draw the villager around (0, 0); limb ends are floored so the offsets
+        # match what int() gives at on-screen (positive) coordinates
+
+        # Draw head with skin color
+        midpoint_circle(0, self.head_radius, self.head_radius, (0.9, 0.7, 0.5), target)
+        
+        # Draw facial features
+        target.set_color(0.0, 0.0, 0.0)  # Black for features
+        # Eyes
+        target.add_point(-3, self.head_radius + 2)
+        target.add_point(3, self.head_radius + 2)
+        # Mouth
+        for x in range(-2, 3):
+            target.add_point(x, self.head_radius - 3)
+
+        # Draw body with shirt color
+        target.set_color(0.2, 0.4, 0.8)  # Blue shirt
+        
+        # Draw body using midpoint line (thicker)
+        body_points = midpoint_line(0, 0, 0, -self.body_length)
+        for px, py in body_points:
+            target.add_point(px, py)
+            target.add_point(px + 1, py)  # Make body thicker
+            target.add_point(px - 1, py)
+
+        # Draw legs with animation and pants color
+        leg_start_y = -self.body_length
+        target.set_color(0.3, 0.2, 0.1)  # Brown pants
+        # Left leg
+        left_leg_end_x = -self.limb_length * 0.7 + animation_offset * 0.3
+        left_leg_end_y = leg_start_y - self.limb_length * 0.7
+        leg_points = midpoint_line(0, leg_start_y, math.floor(left_leg_end_x), math.floor(left_leg_end_y))
+        for px, py in leg_points:
+            target.add_point(px, py)
+            target.add_point(px + 1, py)  # Make legs thicker
+
+        # Right leg
+        right_leg_end_x = self.limb_length * 0.7 - animation_offset * 0.3
+        right_leg_end_y = leg_start_y - self.limb_length * 0.7
+        leg_points = midpoint_line(0, leg_start_y, math.floor(right_leg_end_x), math.floor(right_leg_end_y))
+        for px, py in leg_points:
+            target.add_point(px, py)
+            target.add_point(px - 1, py)  # Make legs thicker
+
+        # Draw arms with animation and skin color
+        arm_start_y = -(self.body_length // 3)
+        target.set_color(0.9, 0.7, 0.5)  # Skin color for arms
+        # Left arm
+        left_arm_end_x = -self.limb_length * 0.7 - animation_offset * 0.2
+        left_arm_end_y = arm_start_y + self.limb_length * 0.3
+        arm_points = midpoint_line(0, arm_start_y, math.floor(left_arm_end_x), math.floor(left_arm_end_y))
+        for px, py in arm_points:
+            target.add_point(px, py)
+            target.add_point(px + 1, py)  # Make arms thicker
+
+        # Right arm
+        right_arm_end_x = self.limb_length * 0.7 + animation_offset * 0.2
+        right_arm_end_y = arm_start_y + self.limb_length * 0.3
+        arm_points = midpoint_line(0, arm_start_y, math.floor(right_arm_end_x), math.floor(right_arm_end_y))
+        for px, py in arm_points:
+            target.add_point(px, py)
+            target.add_point(px - 1, py)  # Make arms thicker
 
     def check_collision_with_axe(self, axe):
         # Check head collision
@@ -121,49 +719,54 @@ class Villager:
         if head_dist < self.head_radius + axe.handle_width/2:
             return True
 
-        # Check body collision (vertical line)
-        for dy in range(0, self.body_length):
-            body_point_y = self.y - dy
-            if axe.check_collision(self.x, body_point_y, 2):  # 2 is body thickness
-                return True
+        # Check body, legs and arms as segments against the axe boxes
+        boxes = axe.collision_boxes(2)  # 2 is body thickness
+        for x1, y1, x2, y2 in self.collision_segments():
+            for box in boxes:
+                if segment_intersects_box(x1, y1, x2, y2, box):
+                    return True
 
-        # Check legs collision
-        leg_start_y = self.y - self.body_length
-        # Check both legs
-        for i in range(self.limb_length):
-            # Left leg
-            x_left = int(self.x - i * 0.7)
-            y = int(leg_start_y - i * 0.7)
-            if axe.check_collision(x_left, y, 2):
-                return True
-            # Right leg
-            x_right = int(self.x + i * 0.7)
-            if axe.check_collision(x_right, y, 2):
-                return True
+        return False
 
-        # Check arms collision
+    def collision_segments(self):
+        # Body (vertical line), then both legs and both arms
+        reach = (self.limb_length - 1) * 0.7
+        leg_start_y = self.y - self.body_length
         arm_start_y = self.y - self.body_length // 3
-        # Check both arms
-        for i in range(self.limb_length):
-            # Left arm
-            x_left = int(self.x - i * 0.7)
-            y = int(arm_start_y + i * 0.3)
-            if axe.check_collision(x_left, y, 2):
-                return True
-            # Right arm
-            x_right = int(self.x + i * 0.7)
-            if axe.check_collision(x_right, y, 2):
-                return True
+        arm_rise = (self.limb_length - 1) * 0.3
+        return (
+            (self.x, self.y, self.x, self.y - (self.body_length - 1)),
+            (self.x, leg_start_y, self.x - reach, leg_start_y - reach),
+            (self.x, leg_start_y, self.x + reach, leg_start_y - reach),
+            (self.x, arm_start_y, self.x - reach, arm_start_y + arm_rise),
+            (self.x, arm_start_y, self.x + reach, arm_start_y + arm_rise),
+        )
 
-        return False
+    def bounds(self):
+        return self.bounds_at(self.x, self.y)
+
+    @classmethod
+    def bounds_at(cls, x, y):
+        # Generous box around the head, body and limbs for the broad phase;
+        # x and y may be NumPy arrays
+        pad = cls.limb_length
+        return (
+            x - cls.head_radius - pad,
+            y - cls.body_length - pad,
+            x + cls.head_radius + pad,
+            y + 2 * cls.head_radius + pad,
+        )
 
     def throw_stone(self, target_x, target_y):
-        current_time = time.time()
+        current_time = clock.sim_time
         if self.alive and current_time - self.last_throw_time >= STONE_THROW_DELAY:
             self.last_throw_time = current_time
-            return Stone(self.x, self.y + self.head_radius, target_x, target_y)
+            return self.make_stone(target_x, target_y)
         return None
 
+    def make_stone(self, target_x, target_y):
+        return stone_pool.acquire(self.x, self.y + self.head_radius, target_x, target_y)
+
 class Axe:
     def __init__(self, x, y):
         self.x = x
@@ -179,44 +782,54 @@ class Axe:
         # Store the head position separately
         self.head_x = x
         self.head_y = y + self.handle_height/2  # Head is now on top
+        # Position before the last move, for render interpolation
+        self.prev_x = x
+        self.prev_y = y
 
-    def draw(self):
-        glColor3f(0.7, 0.7, 0.7)  # Gray color for axe
-        glBegin(GL_POINTS)
+    def draw(self, alpha=1.0):
+        # The axe is stamped at whole pixels, so its shape depends on facing alone
+        sprite = shape_cache.get(('axe', self.facing_right), self.rasterize)
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        batch.add_sprite(sprite, int(x), int(y))
+
+    def rasterize(self, target):
+        # Draw the axe with its handle starting at (0, 0)
+        target.set_color(0.7, 0.7, 0.7)  # Gray color for axe
         
         # Draw handle (vertical line)
-        for y in range(int(self.y), int(self.y + self.handle_height)):  # Changed to draw upward
-            plot_point(int(self.x), y)
+        for y in range(0, self.handle_height):  # Changed to draw upward
+            target.add_point(0, y)
         
         # Draw blade
-        blade_center_y = self.y + self.handle_height  # Blade at top of handle
+        blade_center_y = self.handle_height  # Blade at top of handle
         blade_top = blade_center_y + self.blade_height//2
         blade_bottom = blade_center_y - self.blade_height//2
         
         if self.facing_right:
             # Right-facing blade
-            for y in range(int(blade_bottom), int(blade_top)):
-                for x in range(int(self.x), int(self.x + self.blade_width)):
+            for y in range(blade_bottom, blade_top):
+                for x in range(0, self.blade_width):
                     # Add curve to the blade
                     dist_from_center = abs(y - blade_center_y)
-                    max_x = self.x + self.blade_width - (dist_from_center * self.blade_curve / self.blade_height)
+                    max_x = self.blade_width - (dist_from_center * self.blade_curve / self.blade_height)
                     if x <= max_x:
-                        plot_point(x, y)
+                        target.add_point(x, y)
         else:
             # Left-facing blade
-            for y in range(int(blade_bottom), int(blade_top)):
-                for x in range(int(self.x - self.blade_width), int(self.x)):
+            for y in range(blade_bottom, blade_top):
+                for x in range(-self.blade_width, 0):
                     # Add curve to the blade
                     dist_from_center = abs(y - blade_center_y)
-                    min_x = self.x - self.blade_width + (dist_from_center * self.blade_curve / self.blade_height)
+                    min_x = -self.blade_width + (dist_from_center * self.blade_curve / self.blade_height)
                     if x >= min_x:
-                        plot_point(x, y)
-        
-        glEnd()
+                        target.add_point(x, y)
 
     def move(self):
         old_x = self.x
         old_y = self.y
+        self.prev_x = old_x
+        self.prev_y = old_y
         
         if key_state.get(b'w', False) and self.y < HEIGHT - self.handle_height:  # Changed direction for W
             self.y += self.speed  # Move up
@@ -256,8 +869,55 @@ class Axe:
         
         return False
 
+    def check_collision_many(self, xs, ys, radius):
+        # check_collision over NumPy arrays of points, returns a boolean mask
+        hit = (numpy.abs(xs - self.x) < (self.handle_width + radius)) & (self.y <= ys) & (ys <= self.y + self.handle_height)
+
+        blade_center_y = self.y + self.handle_height
+        blade_top = blade_center_y + self.blade_height//2
+        blade_bottom = blade_center_y - self.blade_height//2
+
+        in_blade_rows = (blade_bottom - radius <= ys) & (ys <= blade_top + radius)
+        if self.facing_right:
+            in_blade = (self.x - radius <= xs) & (xs <= self.x + self.blade_width + radius)
+        else:
+            in_blade = (self.x - self.blade_width - radius <= xs) & (xs <= self.x + radius)
+        return hit | (in_blade_rows & in_blade)
+
+    def collision_boxes(self, radius):
+        # Handle and blade as boxes grown by radius, matching check_collision
+        blade_center_y = self.y + self.handle_height
+        blade_top = blade_center_y + self.blade_height//2
+        blade_bottom = blade_center_y - self.blade_height//2
+        handle = (
+            self.x - self.handle_width - radius, self.y,
+            self.x + self.handle_width + radius, self.y + self.handle_height,
+        )
+        if self.facing_right:
+            blade = (
+                self.x - radius, blade_bottom - radius,
+                self.x + self.blade_width + radius, blade_top + radius,
+            )
+        else:
+            blade = (
+                self.x - self.blade_width - radius, blade_bottom - radius,
+                self.x + radius, blade_top + radius,
+            )
+        return (handle, blade)
+
+    def bounds(self, radius=0):
+        # Smallest box holding both collision boxes
+        (hx1, hy1, hx2, hy2), (bx1, by1, bx2, by2) = self.collision_boxes(radius)
+        return (min(hx1, bx1), min(hy1, by1), max(hx2, bx2), max(hy2, by2))
+
 class Stone:
+    __slots__ = ('x', 'y', 'dx', 'dy')
+
     def __init__(self, x, y, target_x, target_y):
+        self.launch(x, y, target_x, target_y)
+
+    def launch(self, x, y, target_x, target_y):
+        # Also used to send a recycled stone off again
         self.x = x
         self.y = y
         angle = math.atan2(target_y - y, target_x - x)
@@ -268,13 +928,104 @@ class Stone:
         self.x += self.dx
         self.y += self.dy
 
-    def draw(self):
-        # Draw stone using midpoint circle algorithm
-        midpoint_circle(int(self.x), int(self.y), STONE_RADIUS, (0, 0, 1))
+    def off_screen(self):
+        # Stones fly in straight lines, so once out of the window they never come back
+        return (
+            self.x < -STONE_RADIUS or self.x > WIDTH + STONE_RADIUS
+            or self.y < -STONE_RADIUS or self.y > HEIGHT + STONE_RADIUS
+        )
+
+    def bounds(self):
+        return (
+            self.x - STONE_RADIUS, self.y - STONE_RADIUS,
+            self.x + STONE_RADIUS, self.y + STONE_RADIUS,
+        )
+
+    def draw(self, alpha=1.0):
+        # Draw stone using midpoint circle algorithm, alpha of the way from
+        # its previous position to the current one
+        sprite = shape_cache.get(('stone',), self.rasterize)
+        batch.add_sprite(sprite, int(self.x - self.dx * (1 - alpha)), int(self.y - self.dy * (1 - alpha)))
+
+    def rasterize(self, target):
+        midpoint_circle(0, 0, STONE_RADIUS, (0, 0, 1), target)
 
-def midpoint_circle(xc, yc, radius, color):
-    glColor3f(*color)
-    glBegin(GL_POINTS)
+class StoredStone(Stone):
+    """Stone whose position and velocity are a row of stone_store"""
+    __slots__ = ('index',)
+    store = stone_store
+    x = StoredField()
+    y = StoredField()
+    dx = StoredField()
+    dy = StoredField()
+
+    def __init__(self, x, y, target_x, target_y):
+        self.index = None
+        super().__init__(x, y, target_x, target_y)
+
+    def launch(self, x, y, target_x, target_y):
+        if self.index is None:
+            self.store.add(self)
+        super().launch(x, y, target_x, target_y)
+
+class StoredVillager(Villager):
+    """Villager whose position, state and throw timer are a row of villager_store"""
+    store = villager_store
+    x = StoredField()
+    y = StoredField()
+    alive = StoredField()
+    last_throw_time = StoredField()
+
+    def __init__(self, x, y):
+        self.store.add(self)
+        super().__init__(x, y)
+
+class ProjectilePool:
+    """Hands out recycled stones and takes back the ones that left the window
+
+    Counts live, pooled (waiting for reuse) and retired stones so that long
+    sessions can be checked for leaks.
+    """
+    def __init__(self, stone_type=Stone, limit=STONE_POOL_LIMIT):
+        self.limit = limit
+        self.reset(stone_type)
+
+    def reset(self, stone_type):
+        self.stone_type = stone_type
+        self.free = []
+        self.live = 0
+        self.retired = 0
+        self.allocated = 0
+
+    def acquire(self, x, y, target_x, target_y):
+        self.live += 1
+        if self.free:
+            stone = self.free.pop()
+            stone.launch(x, y, target_x, target_y)
+            return stone
+        self.allocated += 1
+        return self.stone_type(x, y, target_x, target_y)
+
+    def release(self, stone):
+        self.live -= 1
+        self.retired += 1
+        if len(self.free) < self.limit:
+            self.free.append(stone)
+
+    def stats(self):
+        return {
+            'live': self.live,
+            'pooled': len(self.free),
+            'retired': self.retired,
+            'allocated': self.allocated,
+        }
+
+stone_pool = ProjectilePool()
+
+def midpoint_circle(xc, yc, radius, color, target=None):
+    if target is None:
+        target = batch
+    target.set_color(*color)
     
     x = radius
     y = 0
@@ -282,14 +1033,14 @@ def midpoint_circle(xc, yc, radius, color):
 
     # Plot initial points
     def plot_circle_points(x, y):
-        plot_point(xc + x, yc + y)
-        plot_point(xc - x, yc + y)
-        plot_point(xc + x, yc - y)
-        plot_point(xc - x, yc - y)
-        plot_point(xc + y, yc + x)
-        plot_point(xc - y, yc + x)
-        plot_point(xc + y, yc - x)
-        plot_point(xc - y, yc - x)
+        target.add_point(xc + x, yc + y)
+        target.add_point(xc - x, yc + y)
+        target.add_point(xc + x, yc - y)
+        target.add_point(xc - x, yc - y)
+        target.add_point(xc + y, yc + x)
+        target.add_point(xc - y, yc + x)
+        target.add_point(xc + y, yc - x)
+        target.add_point(xc - y, yc - x)
 
     # Midpoint circle algorithm
     plot_circle_points(x, y)
@@ -301,7 +1052,6 @@ def midpoint_circle(xc, yc, radius, color):
             x -= 1
             p = p + 2 * y - 2 * x + 1
         plot_circle_points(x, y)
-    glEnd()
 
 def midpoint_line(x1, y1, x2, y2):
     # Initialize points
@@ -340,32 +1090,59 @@ def midpoint_line(x1, y1, x2, y2):
     points.append((x2, y2))  # Add the end point
     return points
 
+def boxes_overlap(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+def segment_intersects_box(x1, y1, x2, y2, box):
+    # Liang-Barsky clipping of the segment against the box
+    min_x, min_y, max_x, max_y = box
+    dx = x2 - x1
+    dy = y2 - y1
+    t_enter, t_exit = 0.0, 1.0
+    for p, q in ((-dx, x1 - min_x), (dx, max_x - x1), (-dy, y1 - min_y), (dy, max_y - y1)):
+        if p == 0:
+            if q < 0:
+                return False  # Parallel to this edge and outside it
+        else:
+            t = q / p
+            if p < 0:
+                if t > t_exit:
+                    return False
+                t_enter = max(t_enter, t)
+            else:
+                if t < t_enter:
+                    return False
+                t_exit = min(t_exit, t)
+    return True
+
 def fill_circle(cx, cy, radius, color):
-    glColor3f(*color)
-    glBegin(GL_POINTS)
-    for y in range(-radius, radius + 1):
-        x_max = int(math.sqrt(radius * radius - y * y))
-        for x in range(-x_max, x_max + 1):
-            plot_point(int(cx + x), int(cy + y))
-    glEnd()
+    batch.set_color(*color)
+    # Every point of the bounding square that lies inside the circle
+    ys, xs = numpy.mgrid[-radius:radius + 1, -radius:radius + 1]
+    x_max = numpy.sqrt(radius * radius - ys * ys).astype(numpy.int32)
+    inside = numpy.abs(xs) <= x_max
+    batch.add_points(numpy.column_stack((xs[inside] + int(cx), ys[inside] + int(cy))))
 
 def plot_point(x, y):
-    glVertex2i(int(x), int(y))
+    batch.add_point(int(x), int(y))
+
+def fill_block(x_start, x_stop, y_start, y_stop):
+    # All points of the half-open box [x_start, x_stop) x [y_start, y_stop)
+    ys, xs = numpy.mgrid[int(y_start):int(y_stop), int(x_start):int(x_stop)]
+    batch.add_points(numpy.column_stack((xs.ravel(), ys.ravel())))
 
 def fill_rectangle(x, y, width, height, color):
-    glColor3f(*color)
-    glBegin(GL_POINTS)
+    batch.set_color(*color)
     # Convert dimensions to integers
     half_width = int(width / 2)
     half_height = int(height / 2)
-    for dy in range(-half_height, half_height + 1):
-        for dx in range(-half_width, half_width + 1):
-            plot_point(int(x + dx), int(y + dy))
-    glEnd()
+    fill_block(
+        int(x) - half_width, int(x) + half_width + 1,
+        int(y) - half_height, int(y) + half_height + 1,
+    )
 
 def fill_triangle(x1, y1, x2, y2, x3, y3, color):
-    glColor3f(*color)
-    glBegin(GL_POINTS)
+    batch.set_color(*color)
     
     # Find bounding box
     min_x = min(x1, x2, x3)
@@ -384,7 +1161,6 @@ def fill_triangle(x1, y1, x2, y2, x3, y3, color):
                 c = 1 - a - b
                 if 0 <= a <= 1 and 0 <= b <= 1 and 0 <= c <= 1:
                     plot_point(x, y)
-    glEnd()
 
 def keyboard(key, x, y):
     global key_state
@@ -398,7 +1174,7 @@ def key_released(key, x, y):
     key_state[key] = False
 
 def mouse_func(button, state, x, y):
-    global game_paused, game_over, score, villagers, stones
+    global game_paused
     
     if button == GLUT_LEFT_BUTTON and state == GLUT_DOWN:
         # Convert window coordinates to OpenGL coordinates
@@ -407,12 +1183,9 @@ def mouse_func(button, state, x, y):
         # Check restart button (only works when paused)
         if abs(x - restart_pos[0]) < button_size and abs(y - restart_pos[1]) < button_size:
             if game_paused or game_over:
-                # Reset game state
-                game_over = False
-                score = 0
-                villagers = []
-                stones = []
-                game_paused = False
+                if session_recorder is not None:
+                    session_recorder.restart(clock.ticks)
+                restart_game()
         
         # Check pause button
         elif abs(x - pause_pos[0]) < button_size and abs(y - pause_pos[1]) < button_size:
@@ -422,25 +1195,38 @@ def mouse_func(button, state, x, y):
         elif abs(x - end_pos[0]) < button_size and abs(y - end_pos[1]) < button_size:
             glutLeaveMainLoop()
 
-def init():
-    global villagers, axe, stones, score, last_villager_generation_time
-    
+def init(villager_count=10):
     # Initialize game state
     glClearColor(0.0, 0.0, 0.0, 0.0)
     gluOrtho2D(0, WIDTH, 0, HEIGHT)
     
-    # Initialize game objects
-    villagers = [Villager(random.randint(200, WIDTH - 200), random.randint(100, HEIGHT - 100)) for _ in range(10)]
+    start_game(villager_count)
+
+def start_game(villager_count=10):
+    # Initialize game objects; needs no window, so headless runs use it too
+    global axe, score, last_villager_generation_time, game_over, game_end_time
+    reset_entities()
+    for _ in range(villager_count):
+        generate_villager()
     axe = Axe(WIDTH // 2, HEIGHT // 2)
-    stones = []
     score = 0
-    last_villager_generation_time = time.time()
+    game_over = False
+    game_end_time = None
+    last_villager_generation_time = clock.sim_time
 
-def animate(value):
+def restart_game():
+    # Restart button: clears the entities while the clock and RNG keep running
+    global game_paused, game_over, score
+    game_over = False
+    score = 0
+    reset_entities()
+    game_paused = False
+
+def simulate_step():
+    # One fixed step of game time
     global last_villager_generation_time, game_over, game_end_time
-    
-    if not game_paused and not game_over:
-        current_time = time.time()
+    with profiler.phase('update'):
+        current_time = clock.sim_time
         
         # Update axe position
         axe.move()
@@ -451,149 +1237,167 @@ def animate(value):
             last_villager_generation_time = current_time
         
         # Update villagers and stones
-        update_villagers()
-        update_stones()
+        with profiler.phase('villagers'):
+            update_villagers()
+        with profiler.phase('stones'):
+            update_stones()
         
         # Check if all villagers are killed
-        if all(not villager.alive for villager in villagers):
+        if not villagers_left():
             game_over = True
-            game_end_time = current_time
+            game_end_time = time.time()
+
+def animate(value):
+    if not game_paused and not game_over:
+        # Run as many fixed steps as real time calls for
+        for _ in range(clock.advance()):
+            if session_recorder is not None:
+                session_recorder.capture(clock.ticks, key_state)
+            clock.step(simulate_step)
+            if game_over or game_paused:
+                break
+    else:
+        clock.hold()
     
     # Check if 10 seconds have passed since game over
     if game_over and time.time() - game_end_time > 10:
         glutLeaveMainLoop()
     
-    glutPostRedisplay()
-    glutTimerFunc(16, animate, 0)
+    if clock.render_due():
+        glutPostRedisplay()
+    glutTimerFunc(TIMER_INTERVAL, animate, 0)
 
 def display():
     glClear(GL_COLOR_BUFFER_BIT)
     
-    if not game_over:
-        # Draw game elements
-        axe.draw()
-        for villager in villagers:
-            villager.draw()
-        for stone in stones:
-            stone.draw()
-        
-        # Draw buttons
-        draw_restart_button()
-        draw_pause_button()
-        draw_end_button()
-        
-        # Draw score
-        draw_text(10, HEIGHT - 30, f"Score: {score}", 1)
-    else:
-        # Draw final score message in the center of the screen
-        scale = 2  # Double the size for final score
-        message = "YOUR FINAL SCORE: " + str(score)
-        text_width = len(message) * 8 * scale  # Adjusted width for larger text
-        x = (WIDTH - text_width) // 2
-        y = HEIGHT // 2
-        
-        # Draw larger background rectangle for bigger text
-        glColor3f(0.0, 0.0, 0.0)  # Black background
-        glBegin(GL_POINTS)
-        for i in range(x - 20, x + text_width + 20):
-            for j in range(y - 40, y + 40):
-                plot_point(i, j)
-        glEnd()
-        
-        # Draw text in green with larger scale
-        glColor3f(0.0, 1.0, 0.0)  # Green color
-        draw_text(x, y - 20, message, scale)  # Adjusted Y position for larger text
+    with profiler.phase('draw'):
+        if not game_over:
+            # Draw game elements
+            alpha = clock.alpha
+            axe.draw(alpha)
+            if USE_ENTITY_STORE:
+                draw_stored_entities(alpha)
+            else:
+                for villager in villagers:
+                    villager.draw()
+                for stone in stones:
+                    stone.draw(alpha)
+            
+            # Buttons and score only change with the pause state and the score
+            hud_layer.render((game_paused, score))
+        else:
+            game_over_layer.render(score)
+        if profiler.overlay:
+            profiler.draw_overlay()
     
-    glutSwapBuffers()
+    with profiler.phase('flush'):
+        batch.flush()  # Draw the whole frame in one call
+    with profiler.phase('swap'):
+        glutSwapBuffers()
+    profiler.end_frame()
+
+def draw_hud():
+    # Draw buttons
+    draw_restart_button()
+    draw_pause_button()
+    draw_end_button()
+    
+    # Draw score
+    draw_text(10, HEIGHT - 30, f"Score: {score}", 1)
+
+def draw_game_over_screen():
+    # Draw final score message in the center of the screen
+    scale = 2  # Double the size for final score
+    message = "YOUR FINAL SCORE: " + str(score)
+    text_width = len(message) * 8 * scale  # Adjusted width for larger text
+    x = (WIDTH - text_width) // 2
+    y = HEIGHT // 2
+    
+    # Draw larger background rectangle for bigger text
+    batch.set_color(0.0, 0.0, 0.0)  # Black background
+    fill_block(x - 20, x + text_width + 20, y - 40, y + 40)
+    
+    # Draw text in green with larger scale
+    batch.set_color(0.0, 1.0, 0.0)  # Green color
+    draw_text(x, y - 20, message, scale)  # Adjusted Y position for larger text
+
+def draw_stored_entities(alpha=1.0):
+    # All villagers share one animation phase, so each kind is stamped at once
+    alive = villager_store.column('alive')
+    if alive.any():
+        phase = round(math.sin(time.time() * Villager.animation_speed) * 5)
+        villager = villager_store.views[numpy.flatnonzero(alive)[0]]
+        sprite = shape_cache.get(('villager', phase), lambda target: villager.rasterize(target, phase))
+        positions = numpy.column_stack((villager_store.column('x')[alive], villager_store.column('y')[alive]))
+        batch.add_sprite_many(sprite, positions)
+    if len(stone_store):
+        sprite = shape_cache.get(('stone',), stone_store.views[0].rasterize)
+        xs = stone_store.column('x') - stone_store.column('dx') * (1 - alpha)
+        ys = stone_store.column('y') - stone_store.column('dy') * (1 - alpha)
+        positions = numpy.column_stack((xs, ys)).astype(numpy.int32)
+        batch.add_sprite_many(sprite, positions)
 
 def draw_text(x, y, text, scale=1):  # Added scale parameter with default value
-    glBegin(GL_POINTS)
-    current_x = x
+    # Laid-out strings are cached, so drawing one is a single batch append
+    offsets, _ = text_cache.get((text, scale), lambda target: target.add_points(layout_text(text, scale)))
+    batch.add_points(offsets + (int(x), int(y)))
+
+def layout_text(text, scale):
+    # Point offsets of a whole string from its bottom left corner
+    pieces = []
+    current_x = 0
     for char in text.upper():  # Convert to uppercase
-        if char.isdigit():
-            draw_number(current_x, y, int(char), scale)
-            current_x += 8 * scale  # Adjust spacing based on scale
-        elif char == ':':
-            # Draw colon
-            for i in range(2):
-                plot_point(current_x + 2 * scale, y + i*3 * scale + 1)
-            current_x += 6 * scale  # Adjust spacing based on scale
-        elif char == ' ':
+        if char == ' ':
             current_x += 6 * scale  # Space width adjusted for scale
+            continue
+        pieces.append(glyph_offsets(char, scale) + (current_x, 0))
+        if char == ':':
+            current_x += 6 * scale  # Adjust spacing based on scale
         else:
-            draw_letter(current_x, y, char, scale)
             current_x += 8 * scale  # Adjust spacing based on scale
-    glEnd()
+    if not pieces:
+        return numpy.zeros((0, 2), dtype=numpy.int32)
+    return numpy.concatenate(pieces)
+
+@functools.lru_cache(maxsize=None)
+def glyph_offsets(char, scale):
+    # Glyph atlas: the points of one character at one scale, built once
+    if char.isdigit():
+        pattern = NUMBER_PATTERNS[int(char)]
+    elif char == ':':
+        return numpy.array([(2 * scale, i*3 * scale + 1) for i in range(2)], dtype=numpy.int32)
+    else:
+        pattern = LETTER_PATTERNS.get(char, [])
+    offsets = numpy.array([(px * scale, py * scale) for px, py in pattern], dtype=numpy.int32)
+    return offsets.reshape(-1, 2)
 
 def draw_letter(x, y, letter, scale):
-    # Simple point-based letter patterns
-    patterns = {
-        'A': [(1,4), (0,3), (2,3), (0,2), (1,2), (2,2), (0,1), (2,1), (0,0), (2,0)],
-        'C': [(0,4), (1,4), (2,4), (0,3), (0,2), (0,1), (0,0), (1,0), (2,0)],
-        'E': [(0,4), (1,4), (2,4), (0,3), (0,2), (1,2), (2,2), (0,1), (0,0), (1,0), (2,0)],
-        'F': [(0,4), (1,4), (2,4), (0,3), (0,2), (1,2), (0,1), (0,0)],
-        'I': [(0,4), (1,4), (2,4), (1,3), (1,2), (1,1), (0,0), (1,0), (2,0)],
-        'L': [(0,4), (0,3), (0,2), (0,1), (0,0), (1,0), (2,0)],
-        'N': [(0,4), (0,3), (0,2), (0,1), (0,0), (1,3), (2,2), (2,4), (2,3), (2,2), (2,1), (2,0)],
-        'O': [(0,4), (1,4), (2,4), (0,3), (2,3), (0,2), (2,2), (0,1), (2,1), (0,0), (1,0), (2,0)],
-        'P': [(0,4), (1,4), (2,4), (0,3), (2,3), (0,2), (1,2), (2,2), (0,1), (0,0)],
-        'R': [(0,4), (1,4), (2,4), (0,3), (2,3), (0,2), (1,2), (0,1), (2,1), (0,0), (2,0)],
-        'S': [(0,4), (1,4), (2,4), (0,3), (0,2), (1,2), (2,2), (2,1), (0,0), (1,0), (2,0)],
-        'T': [(0,4), (1,4), (2,4), (1,3), (1,2), (1,1), (1,0)],
-        'U': [(0,4), (2,4), (0,3), (2,3), (0,2), (2,2), (0,1), (2,1), (0,0), (1,0), (2,0)],
-        'Y': [(0,4), (2,4), (0,3), (2,3), (1,2), (1,1), (1,0)],
-        ' ': []  # Space character
-    }
-    if letter in patterns:
-        for px, py in patterns[letter]:
-            plot_point(x + px * scale, y + py * scale)
+    batch.add_points(glyph_offsets(letter, scale) + (int(x), int(y)))
 
 def draw_number(x, y, number, scale):
-    # Number patterns (flipped Y coordinates)
-    patterns = {
-        0: [(0,4), (1,4), (2,4), (0,3), (2,3), (0,2), (2,2), (0,1), (2,1), (0,0), (1,0), (2,0)],
-        1: [(1,4), (1,3), (1,2), (1,1), (1,0)],
-        2: [(0,4), (1,4), (2,4), (2,3), (0,2), (1,2), (2,2), (0,1), (0,0), (1,0), (2,0)],
-        3: [(0,4), (1,4), (2,4), (2,3), (1,2), (2,1), (0,0), (1,0), (2,0)],
-        4: [(0,4), (2,4), (0,3), (2,3), (0,2), (1,2), (2,2), (2,1), (2,0)],
-        5: [(0,4), (1,4), (2,4), (0,3), (0,2), (1,2), (2,2), (2,1), (0,0), (1,0), (2,0)],
-        6: [(0,4), (1,4), (2,4), (0,3), (0,2), (1,2), (2,2), (0,1), (2,1), (0,0), (1,0), (2,0)],
-        7: [(0,4), (1,4), (2,4), (2,3), (2,2), (1,1), (1,0)],
-        8: [(0,4), (1,4), (2,4), (0,3), (2,3), (1,2), (0,1), (2,1), (0,0), (1,0), (2,0)],
-        9: [(0,4), (1,4), (2,4), (0,3), (2,3), (0,2), (1,2), (2,2), (2,1), (0,0), (1,0), (2,0)]
-    }
-    if number in patterns:
-        for px, py in patterns[number]:
-            plot_point(x + px * scale, y + py * scale)
+    if number in NUMBER_PATTERNS:
+        batch.add_points(glyph_offsets(str(number), scale) + (int(x), int(y)))
+
+def draw_colon(x, y, scale):
+    batch.add_points(glyph_offsets(':', scale) + (int(x), int(y)))
 
 def draw_final_score():
     if game_over:
         # Draw black background
-        glColor3f(0, 0, 0)
-        glBegin(GL_POINTS)
-        for y in range(HEIGHT//2 - 80, HEIGHT//2 + 80):
-            for x in range(WIDTH//2 - 200, WIDTH//2 + 200):
-                plot_point(x, y)
-        glEnd()
+        batch.set_color(0, 0, 0)
+        fill_block(WIDTH//2 - 200, WIDTH//2 + 200, HEIGHT//2 - 80, HEIGHT//2 + 80)
 
         # Draw border
-        glColor3f(1, 1, 1)
-        glBegin(GL_POINTS)
-        # Top and bottom borders
-        for x in range(WIDTH//2 - 200, WIDTH//2 + 200):
-            for y in range(-2, 3):  # Thickness of 5 pixels
-                plot_point(x, HEIGHT//2 - 80 + y)  # Top border
-                plot_point(x, HEIGHT//2 + 80 + y)  # Bottom border
+        batch.set_color(1, 1, 1)
+        # Top and bottom borders (thickness of 5 pixels)
+        fill_block(WIDTH//2 - 200, WIDTH//2 + 200, HEIGHT//2 - 82, HEIGHT//2 - 77)
+        fill_block(WIDTH//2 - 200, WIDTH//2 + 200, HEIGHT//2 + 78, HEIGHT//2 + 83)
         # Left and right borders
-        for y in range(HEIGHT//2 - 80, HEIGHT//2 + 80):
-            for x in range(-2, 3):  # Thickness of 5 pixels
-                plot_point(WIDTH//2 - 200 + x, y)  # Left border
-                plot_point(WIDTH//2 + 200 + x, y)  # Right border
-        glEnd()
+        fill_block(WIDTH//2 - 202, WIDTH//2 - 197, HEIGHT//2 - 80, HEIGHT//2 + 80)
+        fill_block(WIDTH//2 + 198, WIDTH//2 + 203, HEIGHT//2 - 80, HEIGHT//2 + 80)
 
         # Draw text
-        glColor3f(1, 1, 1)
-        glBegin(GL_POINTS)
+        batch.set_color(1, 1, 1)
         scale = 3  # Larger scale for better visibility
         
         # Draw "YOUR FINAL SCORE:" text
@@ -621,7 +1425,6 @@ def draw_final_score():
             draw_number(x_pos, y_pos, int(char), scale)
             x_pos += 12 * scale
         
-        glEnd()
 
 def display_final_score():
     global game_end_time, game_over, final_score_message
@@ -629,33 +1432,269 @@ def display_final_score():
     game_over = True
     final_score_message = f"Game Over! Final Score: {score}"
 
+def reset_entities():
+    global villagers, stones
+    villager_grid.clear()
+    stone_grid.clear()
+    villager_store.clear()
+    stone_store.clear()
+    if USE_ENTITY_STORE:
+        # The stores list their views in row order
+        villagers = villager_store.views
+        stones = stone_store.views
+        stone_pool.reset(StoredStone)
+    else:
+        villagers = []
+        stones = []
+        stone_pool.reset(Stone)
+
+def villagers_left():
+    if USE_ENTITY_STORE:
+        return bool(villager_store.column('alive').any())
+    return len(villager_grid) > 0
+
 def generate_villager():
-    villagers.append(Villager(random.randint(200, WIDTH - 200), random.randint(100, HEIGHT - 100)))
+    x, y = rng.randint(200, WIDTH - 200), rng.randint(100, HEIGHT - 100)
+    if USE_ENTITY_STORE:
+        StoredVillager(x, y)  # Listed in villagers by its store
+        return
+    villager = Villager(x, y)
+    villagers.append(villager)
+    villager_grid.insert(villager, villager.bounds())
 
 def update_villagers():
+    global score
+    if USE_ENTITY_STORE:
+        update_stored_villagers()
+        return
     for villager in villagers:
         if villager.alive:
             new_stone = villager.throw_stone(axe.x, axe.y)
             if new_stone:
                 stones.append(new_stone)
-            if villager.check_collision_with_axe(axe):
-                villager.alive = False
-                global score
-                score += 10
+                stone_grid.insert(new_stone, new_stone.bounds())
+    # Only villagers whose box overlaps the axe can be hit
+    axe_bounds = axe.bounds(2)
+    for villager in villager_grid.query(axe_bounds):
+        if boxes_overlap(villager.bounds(), axe_bounds) and villager.check_collision_with_axe(axe):
+            villager.alive = False
+            villager_grid.remove(villager)
+            score += 10
+
+def update_stored_villagers():
+    global score
+    alive = villager_store.column('alive')
+    xs = villager_store.column('x')
+    ys = villager_store.column('y')
+    last_throw_times = villager_store.column('last_throw_time')
+
+    # Throw timers
+    current_time = clock.sim_time
+    ready = numpy.flatnonzero(alive & (current_time - last_throw_times >= STONE_THROW_DELAY))
+    last_throw_times[ready] = current_time
+    for row in ready:
+        villager_store.views[row].make_stone(axe.x, axe.y)
+
+    # Broad phase on the whole column, narrow phase on the few near the axe
+    min_x, min_y, max_x, max_y = axe.bounds(2)
+    left, bottom, right, top = Villager.bounds_at(xs, ys)
+    near = alive & (left <= max_x) & (min_x <= right) & (bottom <= max_y) & (min_y <= top)
+    for row in numpy.flatnonzero(near):
+        if villager_store.views[row].check_collision_with_axe(axe):
+            alive[row] = False
+            score += 10
+
+def update_stored_stones():
+    xs = stone_store.column('x')
+    ys = stone_store.column('y')
+    xs += stone_store.column('dx')
+    ys += stone_store.column('dy')
+
+    # Same test as Stone.off_screen, over the whole column
+    off_screen = (
+        (xs < -STONE_RADIUS) | (xs > WIDTH + STONE_RADIUS)
+        | (ys < -STONE_RADIUS) | (ys > HEIGHT + STONE_RADIUS)
+    )
+    if off_screen.any():
+        for stone in stone_store.remove_rows(off_screen):
+            stone_pool.release(stone)
+        xs = stone_store.column('x')
+        ys = stone_store.column('y')
+
+    if not game_over and axe.check_collision_many(xs, ys, STONE_RADIUS).any():
+        print(f"The villagers hit the axe! Final score: {score}")
+        display_final_score()
 
 def update_stones():
-    for stone in stones[:]:
+    if USE_ENTITY_STORE:
+        update_stored_stones()
+        return
+    on_screen = []
+    for stone in stones:
         stone.move()
-        if axe.check_collision(stone.x, stone.y, STONE_RADIUS):
+        if stone.off_screen():
+            stone_grid.remove(stone)
+            stone_pool.release(stone)
+        else:
+            stone_grid.move(stone, stone.bounds())
+            on_screen.append(stone)
+    stones[:] = on_screen
+    axe_bounds = axe.bounds()
+    for stone in stone_grid.query(axe_bounds):
+        if not game_over and axe.check_collision(stone.x, stone.y, STONE_RADIUS):
             print(f"The villagers hit the axe! Final score: {score}")
             display_final_score()
             return
 
+class InputRecorder:
+    """Key presses and releases keyed on the simulation tick they applied to
+
+    Together with the RNG seed, the starting villager count and the ticks
+    at which the restart button was used, this is enough to replay a
+    session exactly, as the simulation only advances in fixed steps.
+    """
+    def __init__(self):
+        self.events = []  # (tick, key, pressed)
+        self.restarts = []  # ticks before which the game was restarted
+        self.previous = {}
+
+    def restart(self, tick):
+        self.restarts.append(tick)
+
+    def capture(self, tick, keys):
+        for key, pressed in keys.items():
+            if self.previous.get(key, False) != pressed:
+                self.events.append((tick, key, pressed))
+        self.previous = dict(keys)
+
+def scripted_inputs(seed, ticks, hold=30):
+    # Random walk over the movement keys, for headless sessions without a player
+    script_rng = random.Random(seed)
+    events = []
+    for tick in range(0, ticks, hold):
+        for key in (b'w', b'a', b's', b'd'):
+            events.append((tick, key, script_rng.random() < 0.3))
+    return events
+
+def state_digest():
+    # Hash of everything the simulation depends on; stones are sorted as the
+    # entity store does not keep them in throw order
+    state = (
+        score, game_over,
+        (axe.x, axe.y, axe.facing_right),
+        [(villager.x, villager.y, villager.alive, villager.last_throw_time) for villager in villagers],
+        sorted((stone.x, stone.y, stone.dx, stone.dy) for stone in stones),
+    )
+    return hashlib.sha256(repr(state).encode('ascii')).hexdigest()
+
+def run_headless(ticks, seed=0, villager_count=10, events=(), stop_on_game_over=True, recorder=None, restarts=()):
+    # Step the game without a window; returns the number of ticks run
+    rng.seed(seed)
+    clock.reset()
+    key_state.clear()
+    start_game(villager_count)
+    pending = collections.defaultdict(list)
+    for tick, key, pressed in events:
+        pending[tick].append((key, pressed))
+    restarts = sorted(restarts)
+    for tick in range(ticks):
+        while restarts and restarts[0] <= tick:
+            # Applies before the step, as the button is only live between steps
+            restarts.pop(0)
+            if recorder is not None:
+                recorder.restart(tick)
+            restart_game()
+        for key, pressed in pending.get(tick, ()):
+            key_state[key] = pressed
+        if recorder is not None:
+            recorder.capture(tick, key_state)
+        clock.step(simulate_step)
+        profiler.end_frame()  # Each tick counts as a frame when headless
+        if game_over and stop_on_game_over and not restarts:
+            return tick + 1
+    return ticks
+
+def save_session(path, seed, villager_count, ticks, events, restarts=()):
+    session = {
+        'seed': seed,
+        'villagers': villager_count,
+        'ticks': ticks,
+        'events': [[tick, key.decode('latin-1'), pressed] for tick, key, pressed in events],
+        'restarts': list(restarts),
+        'digest': state_digest(),
+    }
+    with open(path, 'w') as handle:
+        json.dump(session, handle)
+
+def load_session(path):
+    with open(path) as handle:
+        session = json.load(handle)
+    session['events'] = [(tick, key.encode('latin-1'), pressed) for tick, key, pressed in session['events']]
+    session.setdefault('restarts', [])  # Older sessions have none
+    return session
+
+def replay_session(path):
+    # Re-run a recorded session and check it ends in the very same state
+    session = load_session(path)
+    run_headless(session['ticks'], session['seed'], session['villagers'], session['events'],
+                 restarts=session['restarts'])
+    digest = state_digest()
+    if digest != session['digest']:
+        print(f"Replay of {path} diverged: {digest} != {session['digest']}")
+        return False
+    print(f"Replay of {path} matches after {session['ticks']} ticks, score {score}")
+    return True
+
+def benchmark(ticks, villager_count, seed=0):
+    # Simulation throughput with a crowd of villagers; keeps going after game over
+    started = time.perf_counter()
+    run_headless(ticks, seed, villager_count, stop_on_game_over=False)
+    elapsed = time.perf_counter() - started
+    stats = clock.stats()
+    stats.update({
+        'villagers': villager_count,
+        'stones': len(stones),
+        'entity_store': USE_ENTITY_STORE,
+        'ticks_per_second': ticks / elapsed if elapsed else 0.0,
+    })
+    return stats
+
+def save_live_session(path, seed, villager_count):
+    # Called at exit, as glutMainLoop may not return
+    save_session(path, seed, villager_count, clock.ticks, session_recorder.events,
+                 session_recorder.restarts)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Killer Axe game")
+    parser.add_argument('--seed', type=int, help="seed the game's random numbers")
+    parser.add_argument('--record', metavar='PATH', help="record the session's inputs for replay")
+    parser.add_argument('--replay', metavar='PATH', help="replay a recorded session headless and verify it")
+    parser.add_argument('--headless', action='store_true', help="run without a window, using scripted input")
+    parser.add_argument('--benchmark', action='store_true', help="measure headless ticks per second")
+    parser.add_argument('--ticks', type=int, default=3600, help="ticks to run headless (default %(default)s)")
+    parser.add_argument('--villagers', type=int, default=10, help="villagers at the start (default %(default)s)")
+    parser.add_argument('--no-entity-store', action='store_true', help="use the per-object update path")
+    return parser.parse_args(argv)
+
+def headless_main(args):
+    seed = 0 if args.seed is None else args.seed
+    if args.replay:
+        return 0 if replay_session(args.replay) else 1
+    if args.benchmark:
+        stats = benchmark(args.ticks, args.villagers, seed)
+        print(json.dumps(stats, indent=2))
+        return 0
+    events = scripted_inputs(seed, args.ticks)
+    ticks = run_headless(args.ticks, seed, args.villagers, events)
+    print(f"Ran {ticks} ticks, score {score}, state {state_digest()}")
+    if args.record:
+        save_session(args.record, seed, args.villagers, ticks, [event for event in events if event[0] < ticks])
+    return 0
+
 def draw_restart_button():
     # Draw restart arrow symbol using points
     color = (0.0, 1.0, 0.0) if game_paused else (0.5, 0.5, 0.5)  # Green if paused, gray if not
-    glColor3f(*color)
-    glBegin(GL_POINTS)
+    batch.set_color(*color)
     # Draw circular arrow
     radius = button_size
     for angle in range(0, 300, 5):  # Draw 300 degrees of circle
@@ -670,13 +1709,11 @@ def draw_restart_button():
     for i in range(5):
         plot_point(int(tip_x + i), int(tip_y + i))
         plot_point(int(tip_x + i), int(tip_y - i))
-    glEnd()
 
 def draw_pause_button():
     # Draw pause/play symbol using points
     color = (1.0, 0.0, 0.0) if game_paused else (0.0, 1.0, 0.0)  # Red if paused, green if not
-    glColor3f(*color)
-    glBegin(GL_POINTS)
+    batch.set_color(*color)
     if game_paused:
         # Draw play triangle
         for i in range(-button_size, button_size + 1):
@@ -690,25 +1727,41 @@ def draw_pause_button():
         for i in range(button_size//2, button_size + 1):
             for j in range(-button_size, button_size + 1):
                 plot_point(pause_pos[0] + i, pause_pos[1] + j)
-    glEnd()
 
 def draw_end_button():
     # Draw X symbol using points
-    glColor3f(1.0, 0.0, 0.0)  # Red color
-    glBegin(GL_POINTS)
+    batch.set_color(1.0, 0.0, 0.0)  # Red color
     for i in range(-button_size, button_size + 1):
         for j in range(-2, 3):  # Thickness of the X
             plot_point(end_pos[0] + i + j, end_pos[1] + i)
             plot_point(end_pos[0] + i + j, end_pos[1] - i)
-    glEnd()
+
+hud_layer = StaticLayer(draw_hud)
+game_over_layer = StaticLayer(draw_game_over_screen)
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.no_entity_store:
+        USE_ENTITY_STORE = False
+    if args.headless or args.replay or args.benchmark:
+        status = headless_main(args)
+        if profiler.enabled and os.environ.get('KILLER_AXE_PROFILE_EXPORT'):
+            profiler.export(os.environ['KILLER_AXE_PROFILE_EXPORT'])
+        sys.exit(status)
+    seed = random.randrange(2**32) if args.seed is None else args.seed
+    rng.seed(seed)
+    if args.record:
+        session_recorder = InputRecorder()
+        atexit.register(save_live_session, args.record, seed, args.villagers)
+    if profiler.enabled and os.environ.get('KILLER_AXE_PROFILE_EXPORT'):
+        atexit.register(profiler.export, os.environ['KILLER_AXE_PROFILE_EXPORT'])
+
     glutInit()
     glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB)
     glutInitWindowSize(WIDTH, HEIGHT)
     glutCreateWindow(b"Killer Axe Game")
     
-    init()  # Initialize game state
+    init(args.villagers)  # Initialize game state
     
     # Register callbacks
     glutDisplayFunc(display)